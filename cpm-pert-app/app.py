@@ -1,8 +1,151 @@
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, g, jsonify, render_template, request
 from services.scheduling import *
+from services.batch import analyze_batch
+from services.cache import ResultCache
+from services.calendars import add_dates
+from services.columnar import FORMATS, MIME_TYPE, encode_binary, to_columnar
+from services.jobs import JobNotFound, JobStore, analysis_job
+from services.importing import read_csv_tasks, read_xlsx_tasks
+from services.incremental import SessionNotFound, SessionStore, SessionVersionConflict
+from services.metrics import MetricsRegistry, phase, start_recording, stop_recording
+from services.offload import (
+    AnalysisCancelled, AnalysisPool, AnalysisTimeout, PoolBusy, WorkerCrashed, client_disconnected,
+)
+from services.projectfile import (
+    MIME_TYPE as PROJECT_FILE_MIME, analyze_project_file, load_project as load_project_file, project_tasks,
+    read_header, write_csv, write_tasks,
+)
+from services.projects import ProjectNotFound, ProjectStore, ProjectVersionConflict
+from services.scenarios import analyze_scenarios
+from services.simulation import DEFAULT_ITERATIONS
+from services.streaming import read_ndjson_tasks, stream_analysis
 from datetime import date
+import io
+import os
+import shutil
+import tempfile
+import threading
 
 app = Flask(__name__)
+app.config["SESSION_CAPACITY"] = 32
+app.config["RESULT_CACHE_CAPACITY"] = 128
+app.config["RESULT_CACHE_MAX_ROWS"] = 1_000_000
+app.config["BATCH_MAX_PROJECTS"] = 1000
+app.config["SCENARIOS_MAX"] = 10_000
+app.config["IMPORT_MAX_ROWS"] = 1_000_000
+# Per-phase timings in a Server-Timing header and aggregated under /api/metrics.
+app.config["METRICS_ENABLED"] = True
+# Analyses at least this large run in a worker process instead of the request thread:
+# OFFLOAD_MIN_TASKS tasks, or OFFLOAD_MIN_SAMPLES tasks x simulation iterations.
+# Batches of OFFLOAD_MIN_TASKS tasks in total are spread over the same workers.
+app.config["OFFLOAD_ENABLED"] = True
+app.config["OFFLOAD_MIN_TASKS"] = 20_000
+app.config["OFFLOAD_MIN_SAMPLES"] = 5_000_000
+app.config["OFFLOAD_WORKERS"] = os.cpu_count() or 1
+app.config["OFFLOAD_QUEUE"] = 8
+app.config["OFFLOAD_TIMEOUT"] = 300
+# Background jobs (/api/jobs) run in the offload workers, within OFFLOAD_WORKERS and
+# OFFLOAD_QUEUE: jobs handed to the pool at once, queued-or-running limit, finished jobs kept.
+app.config["JOBS_WORKERS"] = 2
+app.config["JOBS_MAX_ACTIVE"] = 32
+app.config["JOBS_CAPACITY"] = 64
+# SQLite file for saved projects (/api/projects), by default under the instance folder.
+app.config["PROJECT_DB"] = os.environ.get("CPM_PROJECT_DB") or os.path.join(app.instance_path, "projects.sqlite3")
+
+metrics = MetricsRegistry()
+_services_lock = threading.Lock()
+
+
+def _service(name, create):
+    """
+    The app's shared `name` object, built by `create()` on first use, so it
+    picks up app.config as it is then rather than at import.
+    """
+    store = app.extensions.setdefault("cpm", {})
+    if name not in store:
+        with _services_lock:
+            if name not in store:
+                store[name] = create()
+    return store[name]
+
+
+def _sessions():
+    return _service("sessions", lambda: SessionStore(capacity=app.config["SESSION_CAPACITY"]))
+
+
+def _results():
+    return _service("results", lambda: ResultCache(
+        capacity=app.config["RESULT_CACHE_CAPACITY"],
+        max_rows=app.config["RESULT_CACHE_MAX_ROWS"],
+    ))
+
+
+def _pool():
+    return _service("pool", lambda: AnalysisPool(app.config["OFFLOAD_WORKERS"], app.config["OFFLOAD_QUEUE"]))
+
+
+def _jobs():
+    return _service("jobs", lambda: JobStore(
+        _pool() if app.config["OFFLOAD_ENABLED"] else None,
+        workers=app.config["JOBS_WORKERS"],
+        max_active=app.config["JOBS_MAX_ACTIVE"],
+        capacity=app.config["JOBS_CAPACITY"],
+    ))
+
+
+def _projects():
+    return _service("projects", lambda: ProjectStore(app.config["PROJECT_DB"]))
+
+
+def _analyze(fn, tasks, size=None, **kwargs):
+    """
+    Run `fn(tasks, **kwargs)` here, or in the worker pool when the analysis is
+    large. `size` is the task count when `tasks` is not the task list itself.
+    """
+    if size is None:
+        size = len(tasks) if isinstance(tasks, list) else 0
+    simulation = kwargs.get("simulation")
+    samples = 0
+    if isinstance(simulation, dict):
+        samples = size * int(simulation.get("iterations", DEFAULT_ITERATIONS) or 0)
+    if not app.config["OFFLOAD_ENABLED"] or (
+        size < app.config["OFFLOAD_MIN_TASKS"] and samples < app.config["OFFLOAD_MIN_SAMPLES"]
+    ):
+        return fn(tasks, **kwargs)
+    environ = request.environ
+    with phase("offload"):
+        return _pool().run(
+            fn, (tasks,), kwargs,
+            timeout=app.config["OFFLOAD_TIMEOUT"],
+            cancelled=lambda: client_disconnected(environ),
+        )
+
+
+def _offload_error(e):
+    """Response for a pool failure: backpressure, timeout or a client that went away."""
+    if isinstance(e, (PoolBusy, WorkerCrashed)):
+        status = 429 if isinstance(e, PoolBusy) else 503
+        response = jsonify({"ok": False, "error": str(e), "retry_after": e.retry_after})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, status
+    if isinstance(e, AnalysisTimeout):
+        return jsonify({"ok": False, "error": str(e)}), 504
+    # Nobody is listening any more; 499 only shows up in the access log.
+    return jsonify({"ok": False, "error": "Client closed the request"}), 499
+
+@app.before_request
+def start_phase_timing():
+    if app.config["METRICS_ENABLED"] and request.path.startswith("/api/"):
+        g.phase_recorder = start_recording()
+
+@app.after_request
+def finish_phase_timing(response):
+    recorder = g.pop("phase_recorder", None)
+    if recorder is not None:
+        stop_recording()
+        response.headers["Server-Timing"] = recorder.server_timing()
+        metrics.observe(request.endpoint or "unknown", recorder)
+    return response
 
 @app.get("/")
 def home():
@@ -10,31 +153,522 @@ def home():
 
 @app.get("/api/health")
 def health():
-    return jsonify({"ok": True})
+    return jsonify({
+        "ok": True, "result_cache": _results().stats(), "offload": _pool().stats(), "jobs": _jobs().stats(),
+        "projects": _projects().stats(),
+    })
+
+@app.get("/api/metrics")
+def metrics_text():
+    """Latency histograms and size counters in the Prometheus text format."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+def _analysis_options(data):
+    """(tasks, mode, project_start, simulation, views) of an /api/analyze-style body."""
+    simulation = data.get("simulation")
+    views = data.get("views")
+    if simulation is not None and not isinstance(simulation, dict):
+        raise ValueError("Simulation options must be an object")
+    if views is not None and not isinstance(views, list):
+        raise ValueError("Views must be a list")
+    # `seed` and `workers` may also sit next to `mode`; either one asks for a simulation.
+    for key in ("seed", "workers"):
+        if data.get(key) is not None:
+            simulation = {**(simulation or {}), key: data[key]}
+    project_start = data.get("project_start") or date.today().isoformat()
+    return data.get("tasks", []), data.get("mode", "cpm"), project_start, simulation, views
 
 @app.post("/api/analyze")
 def analyze():
     try:
         data = request.get_json(force=True) or {}
-        tasks = data.get("tasks", [])
-        project_start = data.get("project_start")
-        mode = data.get("mode", "cpm")
+        tasks, mode, project_start, simulation, views = _analysis_options(data)
+        fmt = data.get("format", "rows")
+        if fmt not in FORMATS:
+            raise ValueError(f"Format must be one of: {', '.join(FORMATS)}")
 
-        if not project_start:
-            project_start = date.today().isoformat()
-        if mode == "pert":
-            result = analyze_pert(tasks)
+        aoa = data.get("aoa")
+        if mode == "pert" and simulation is not None and simulation.get("seed") is None:
+            # Unseeded simulations are meant to differ between runs, so never cache them.
+            result = _analyze(analyze_pert, tasks, simulation=simulation, views=views, aoa=aoa)
+        elif mode == "pert":
+            # Seeded results do not depend on the worker count, so it is left out of the key.
+            options = {}
+            if simulation is not None:
+                options["simulation"] = {k: v for k, v in simulation.items() if k != "workers"}
+            if views is not None:
+                options["views"] = views
+            if aoa is not None:
+                options["aoa"] = aoa
+            result = _results().get_or_compute(
+                tasks, "pert",
+                lambda: _analyze(analyze_pert, tasks, simulation=simulation, views=views, aoa=aoa),
+                options=options or None,
+            )
+        elif data.get("session"):
+            result = _sessions().open(tasks, views=views, aoa=aoa)
         else:
-            result = analyze_cpm(tasks)
+            options = {}
+            if views is not None:
+                options["views"] = views
+            if aoa is not None:
+                options["aoa"] = aoa
+            result = _results().get_or_compute(
+                tasks, "cpm",
+                lambda: _analyze(analyze_cpm, tasks, views=views, aoa=aoa),
+                options=options or None,
+            )
 
         result["project_start"] = project_start
-        return jsonify({"ok": True, "result": result})
+        if data.get("calendars") is not None:
+            result = add_dates(result, tasks, project_start, data["calendars"])
+        with phase("serialize"):
+            if fmt == "binary":
+                return Response(encode_binary(to_columnar(result)), mimetype=MIME_TYPE)
+            if fmt == "columnar":
+                result = to_columnar(result)
+            return jsonify({"ok": True, "result": result})
     except ScheduleValidationError as e:
         return jsonify({
             "ok": False, 
             "error": "Validation Failed", 
             "validation_errors": e.errors  
         }), 400
+    except (PoolBusy, WorkerCrashed, AnalysisTimeout, AnalysisCancelled) as e:
+        return _offload_error(e)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.post("/api/analyze/batch")
+def analyze_batch_route():
+    """Analyze many {tasks, mode, project_start, views} projects; each gets its own ok/error entry."""
+    try:
+        data = request.get_json(force=True) or {}
+        projects = data.get("projects")
+        if not isinstance(projects, list):
+            raise ValueError("Projects must be a list")
+        if len(projects) > app.config["BATCH_MAX_PROJECTS"]:
+            raise ValueError(f"At most {app.config['BATCH_MAX_PROJECTS']} projects per batch")
+        environ = request.environ
+        results = analyze_batch(
+            projects, data.get("workers"),
+            pool=_pool() if app.config["OFFLOAD_ENABLED"] else None,
+            timeout=app.config["OFFLOAD_TIMEOUT"],
+            cancelled=lambda: client_disconnected(environ),
+            min_tasks=app.config["OFFLOAD_MIN_TASKS"],
+        )
+        return jsonify({"ok": True, "results": results})
+    except (PoolBusy, WorkerCrashed, AnalysisTimeout, AnalysisCancelled) as e:
+        return _offload_error(e)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.post("/api/analyze/scenarios")
+def analyze_scenarios_route():
+    """
+    What-if sweep: one project plus a list of {name, durations, scale} overrides.
+    Returns each scenario's project duration, critical-path changes and (unless
+    `"slack": false`) per-task slack.
+    """
+    try:
+        data = request.get_json(force=True) or {}
+        scenarios = data.get("scenarios")
+        if isinstance(scenarios, list) and len(scenarios) > app.config["SCENARIOS_MAX"]:
+            raise ValueError(f"At most {app.config['SCENARIOS_MAX']} scenarios per request")
+        result = _analyze(
+            analyze_scenarios, data.get("tasks", []), scenarios=scenarios,
+            mode=data.get("mode", "cpm"), slack=bool(data.get("slack", True)),
+        )
+        with phase("serialize"):
+            return jsonify({"ok": True, "result": result})
+    except ScheduleValidationError as e:
+        return jsonify({
+            "ok": False,
+            "error": "Validation Failed",
+            "validation_errors": e.errors
+        }), 400
+    except (PoolBusy, WorkerCrashed, AnalysisTimeout, AnalysisCancelled) as e:
+        return _offload_error(e)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.post("/api/analyze/stream")
+def analyze_stream():
+    """
+    NDJSON in, NDJSON out: one task per request line (mode and project_start as
+    query parameters), one record per response line. Errors arrive as a normal
+    JSON body, before any record is sent.
+    """
+    try:
+        body = stream_analysis(
+            read_ndjson_tasks(iter(request.stream.readline, b"")),
+            request.args.get("mode", "cpm"),
+            request.args.get("project_start") or date.today().isoformat(),
+        )
+        return Response(body, mimetype="application/x-ndjson")
+    except ScheduleValidationError as e:
+        return jsonify({
+            "ok": False,
+            "error": "Validation Failed",
+            "validation_errors": e.errors
+        }), 400
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+def _read_import():
+    """(tasks, mode) of an /api/import upload: a multipart `file` or the raw request body."""
+    upload = request.files.get("file")
+    name = (upload.filename or "") if upload is not None else ""
+    content_type = upload.mimetype if upload is not None else request.mimetype
+    fmt = request.args.get("format")
+    if fmt is None:
+        fmt = "xlsx" if name.lower().endswith(".xlsx") or content_type == XLSX_MIME else "csv"
+    if fmt not in ("csv", "xlsx"):
+        raise ValueError("Format must be one of: csv, xlsx")
+    max_rows = app.config["IMPORT_MAX_ROWS"]
+
+    if fmt == "csv":
+        stream = upload.stream if upload is not None else request.stream
+        return read_csv_tasks(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""), max_rows)
+    if upload is not None:
+        # Multipart uploads are already spooled to a seekable file.
+        return read_xlsx_tasks(upload.stream, max_rows)
+    # XLSX is a zip archive, read from its end: spool the body to disk first.
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        shutil.copyfileobj(request.stream, spool)
+        spool.seek(0)
+        return read_xlsx_tasks(spool, max_rows)
+
+@app.post("/api/import")
+def import_tasks():
+    """
+    Server-side CSV/XLSX import (ac, pr, du or ac, pr, opt, ml, pess, plus an
+    optional name). Returns the validated tasks, or with `?analyze=1` the
+    /api/analyze result (`project_start` as a query parameter).
+    """
+    try:
+        with phase("parse"):
+            tasks, mode = _read_import()
+        if request.args.get("analyze") not in ("1", "true"):
+            errors = validate_schedule(tasks, mode)
+            if errors:
+                raise ScheduleValidationError(errors)
+            return jsonify({"ok": True, "mode": mode, "result": {"tasks": tasks}})
+
+        result = _analyze(analyze_pert if mode == "pert" else analyze_cpm, tasks)
+        result["project_start"] = request.args.get("project_start") or date.today().isoformat()
+        with phase("serialize"):
+            return jsonify({"ok": True, "mode": mode, "result": result})
+    except ScheduleValidationError as e:
+        return jsonify({
+            "ok": False,
+            "error": "Validation Failed",
+            "validation_errors": e.errors
+        }), 400
+    except (PoolBusy, WorkerCrashed, AnalysisTimeout, AnalysisCancelled) as e:
+        return _offload_error(e)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+def _spooled_project_file():
+    """The request body (a project file) copied to a named temporary file, which can be mapped."""
+    spool = tempfile.NamedTemporaryFile(suffix=".cpmp")
+    try:
+        shutil.copyfileobj(request.stream, spool)
+        spool.flush()
+        spool.seek(0)
+        header = read_header(spool)
+    except BaseException:
+        spool.close()
+        raise
+    return spool, header
+
+@app.post("/api/project-file")
+def export_project_file():
+    """
+    Convert a project to the binary project file: an /api/analyze-style JSON
+    body ({tasks, mode}), or a CSV/XLSX upload as /api/import takes.
+    """
+    try:
+        if request.is_json:
+            data = request.get_json() or {}
+            tasks, mode = data.get("tasks", []), data.get("mode", "cpm")
+        else:
+            with phase("parse"):
+                tasks, mode = _read_import()
+        out = io.BytesIO()
+        with phase("ingest"):
+            write_tasks(out, tasks, mode)
+        return Response(out.getvalue(), mimetype=PROJECT_FILE_MIME, headers={
+            "Content-Disposition": "attachment; filename=project.cpmp",
+        })
+    except ScheduleValidationError as e:
+        return jsonify({
+            "ok": False,
+            "error": "Validation Failed",
+            "validation_errors": e.errors
+        }), 400
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.post("/api/project-file/tasks")
+def project_file_tasks():
+    """Project file in, its tasks out: JSON ({mode, tasks}) or `?format=csv` for the data/*.csv format."""
+    try:
+        fmt = request.args.get("format", "json")
+        if fmt not in ("json", "csv"):
+            raise ValueError("Format must be one of: json, csv")
+        spool, header = _spooled_project_file()
+        with spool:
+            graph, estimates = load_project_file(spool.name)
+        if fmt == "csv":
+            out = io.StringIO()
+            write_csv(out, graph, estimates)
+            return Response(out.getvalue(), mimetype="text/csv")
+        return jsonify({"ok": True, "mode": header["mode"], "tasks": project_tasks(graph, estimates)})
+    except ScheduleValidationError as e:
+        return jsonify({
+            "ok": False,
+            "error": "Validation Failed",
+            "validation_errors": e.errors
+        }), 400
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.post("/api/analyze/project-file")
+def analyze_project_file_route():
+    """
+    Analyze an uploaded project file without building task dicts: the file is
+    memory-mapped and fed to the passes. Query parameters: project_start and
+    views (comma-separated); the result is as from /api/analyze.
+    """
+    try:
+        views = request.args.get("views")
+        views = views.split(",") if views is not None else None
+        spool, header = _spooled_project_file()
+        with spool:
+            result = _analyze(analyze_project_file, spool.name, size=header["tasks"], views=views)
+        result["project_start"] = request.args.get("project_start") or date.today().isoformat()
+        with phase("serialize"):
+            return jsonify({"ok": True, "mode": header["mode"], "result": result})
+    except ScheduleValidationError as e:
+        return jsonify({
+            "ok": False,
+            "error": "Validation Failed",
+            "validation_errors": e.errors
+        }), 400
+    except (PoolBusy, WorkerCrashed, AnalysisTimeout, AnalysisCancelled) as e:
+        return _offload_error(e)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.post("/api/validate")
+def validate():
+    """Validation only, for live table checks: same errors as /api/analyze, no schedule."""
+    try:
+        data = request.get_json(force=True) or {}
+        errors = validate_schedule(data.get("tasks", []), data.get("mode", "cpm"))
+        if errors:
+            return jsonify({
+                "ok": False,
+                "error": "Validation Failed",
+                "validation_errors": errors
+            }), 400
+        return jsonify({"ok": True})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.post("/api/jobs")
+def submit_job():
+    """Start an /api/analyze-style analysis in the background; poll or stream the returned job."""
+    try:
+        data = request.get_json(force=True) or {}
+        tasks, mode, project_start, simulation, views = _analysis_options(data)
+
+        job = _jobs().submit(analysis_job, (tasks, mode, project_start), {
+            "simulation": simulation, "views": views, "aoa": data.get("aoa"), "calendars": data.get("calendars"),
+        })
+        response = jsonify({"ok": True, "job": job})
+        response.headers["Location"] = f"/api/jobs/{job['id']}"
+        return response, 202
+    except PoolBusy as e:
+        return _offload_error(e)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.get("/api/jobs/<job_id>")
+def job_status(job_id):
+    """Job status (stage, percent); the ETag changes with every update."""
+    try:
+        snapshot = _jobs().snapshot(job_id)
+    except JobNotFound:
+        return jsonify({"ok": False, "error": "Unknown or expired job"}), 404
+    response = jsonify({"ok": True, "job": snapshot})
+    response.set_etag(f"{job_id}-{snapshot['version']}")
+    return response.make_conditional(request)
+
+@app.get("/api/jobs/<job_id>/events")
+def job_events(job_id):
+    """Server-Sent Events: `progress` per update, then `done` or `failed`."""
+    try:
+        events = _jobs().events(job_id)
+    except JobNotFound:
+        return jsonify({"ok": False, "error": "Unknown or expired job"}), 404
+    return Response(events, mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/api/jobs/<job_id>/result")
+def job_result(job_id):
+    """The finished job's /api/analyze body, with an ETag for conditional GETs (304)."""
+    try:
+        job = _jobs().get(job_id)
+    except JobNotFound:
+        return jsonify({"ok": False, "error": "Unknown or expired job"}), 404
+    if job.body is None:
+        response = jsonify({"ok": False, "error": "Job has not finished", "job": _jobs().snapshot(job_id)})
+        response.headers["Retry-After"] = "1"
+        return response, 202
+    response = Response(job.body, status=job.code, mimetype="application/json")
+    if job.retry_after is not None:
+        response.headers["Retry-After"] = str(job.retry_after)
+    response.set_etag(job.etag)
+    return response.make_conditional(request)
+
+def _project_snapshot(data):
+    """
+    (tasks, mode, project_start) of a project save body. Input that cannot be
+    analyzed at all is refused here, before anything is written; a table with
+    validation errors is still saved, and reported as `valid: false`.
+    """
+    tasks = data.get("tasks", [])
+    mode = data.get("mode", "cpm")
+    if not isinstance(tasks, list):
+        raise ValueError("Tasks must be a list")
+    if not tasks:
+        raise ValueError("Input must be a non-empty list of task objects")
+    if mode not in ("cpm", "pert"):
+        raise ValueError("Mode must be one of: cpm, pert")
+    if not all(isinstance(task, dict) for task in tasks):
+        raise ValueError("Tasks must be objects")
+    validate_schedule(tasks, mode)
+    return tasks, mode, data.get("project_start") or date.today().isoformat()
+
+def _project_analysis(tasks, mode, project_start):
+    result = _analyze(analyze_pert if mode == "pert" else analyze_cpm, tasks)
+    result["project_start"] = project_start
+    return result
+
+def _saved(project):
+    """Store the new snapshot's analysis right away, so reopening it never recomputes."""
+    _, code, _ = _projects().result(project["id"], project["version"], _project_analysis)
+    return jsonify({"ok": True, "project": project, "valid": code == 200})
+
+def _project_error(e):
+    if isinstance(e, ProjectNotFound):
+        return jsonify({"ok": False, "error": "Unknown project or version"}), 404
+    if isinstance(e, ProjectVersionConflict):
+        return jsonify({"ok": False, "error": str(e), "version": e.expected}), 409
+    if isinstance(e, (PoolBusy, WorkerCrashed, AnalysisTimeout, AnalysisCancelled)):
+        return _offload_error(e)
+    return jsonify({"ok": False, "error": str(e)}), 400
+
+@app.get("/api/projects")
+def list_projects():
+    """Saved projects, most recently saved first (`limit`, `offset`)."""
+    try:
+        limit = min(int(request.args.get("limit", 100)), 1000)
+        offset = int(request.args.get("offset", 0))
+        return jsonify({"ok": True, "projects": _projects().list(limit, offset)})
+    except Exception as e:
+        return _project_error(e)
+
+@app.post("/api/projects")
+def create_project():
+    """Save {name, tasks, mode, project_start} as version 1 of a new project."""
+    try:
+        data = request.get_json(force=True) or {}
+        tasks, mode, project_start = _project_snapshot(data)
+        project = _projects().create(str(data.get("name") or "Untitled project"), tasks, mode, project_start)
+        return _saved(project), 201
+    except Exception as e:
+        return _project_error(e)
+
+@app.get("/api/projects/<project_id>")
+def load_project(project_id):
+    """The project with one snapshot's tasks: the latest, or `?version=N`."""
+    try:
+        version = request.args.get("version", type=int)
+        return jsonify({
+            "ok": True, "project": _projects().info(project_id), "snapshot": _projects().load(project_id, version),
+        })
+    except Exception as e:
+        return _project_error(e)
+
+@app.put("/api/projects/<project_id>")
+def save_project(project_id):
+    """
+    Save a new snapshot. Pass the loaded `version` to get a 409 instead of
+    overwriting someone else's newer save; unchanged content keeps the version.
+    """
+    try:
+        data = request.get_json(force=True) or {}
+        tasks, mode, project_start = _project_snapshot(data)
+        name = data.get("name")
+        project = _projects().save(
+            project_id, tasks, mode, project_start,
+            name=None if name is None else str(name), base_version=data.get("version"),
+        )
+        return _saved(project)
+    except Exception as e:
+        return _project_error(e)
+
+@app.delete("/api/projects/<project_id>")
+def delete_project(project_id):
+    try:
+        _projects().delete(project_id)
+        return jsonify({"ok": True})
+    except Exception as e:
+        return _project_error(e)
+
+@app.get("/api/projects/<project_id>/versions")
+def project_versions(project_id):
+    try:
+        return jsonify({"ok": True, "versions": _projects().versions(project_id)})
+    except Exception as e:
+        return _project_error(e)
+
+@app.get("/api/projects/<project_id>/result")
+def project_result(project_id):
+    """
+    The stored /api/analyze body of a snapshot (latest, or `?version=N`). The
+    ETag is the snapshot's content hash, so unchanged results answer 304.
+    """
+    try:
+        body, code, digest = _projects().result(project_id, request.args.get("version", type=int), _project_analysis)
+    except Exception as e:
+        return _project_error(e)
+    response = Response(body, status=code, mimetype="application/json")
+    response.set_etag(digest)
+    return response.make_conditional(request)
+
+@app.post("/api/analyze/delta")
+def analyze_delta():
+    """Re-propagate a few duration/dependency edits through a schedule opened with `"session": true`."""
+    try:
+        data = request.get_json(force=True) or {}
+        result = _sessions().apply(data.get("session"), data.get("version"), data.get("changes"))
+        return jsonify({"ok": True, "result": result})
+    except SessionNotFound:
+        return jsonify({"ok": False, "error": "Unknown or expired session"}), 404
+    except SessionVersionConflict as e:
+        return jsonify({"ok": False, "error": str(e), "version": e.expected}), 409
+    except ScheduleValidationError as e:
+        return jsonify({
+            "ok": False,
+            "error": "Validation Failed",
+            "validation_errors": e.errors
+        }), 400
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 400
 
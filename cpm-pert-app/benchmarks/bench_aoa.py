@@ -0,0 +1,41 @@
+"""
+AoA construction scaling benchmark.
+
+Builds wide layered projects where almost every task has its own predecessor
+set (the worst case for the old per-task scan over all predecessor sets) and
+times `_build_aoa_view` alone. With linear construction the time per
+task+edge stays flat as the project grows.
+
+Usage: python benchmarks/bench_aoa.py [sizes...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import layered
+from services.graph import TaskGraph
+from services.scheduling import _build_aoa_view, _forward_backward_pass
+
+DEFAULT_SIZES = (10_000, 100_000, 500_000)
+
+
+def main(sizes):
+    print(f"{'tasks':>10} {'edges':>10} {'pred sets':>10} {'aoa s':>8} {'us/(task+edge)':>15}")
+    for n in sizes:
+        graph = TaskGraph.from_tasks(layered(n))
+        es, ef, ls, lf, project_duration, topology = _forward_backward_pass(graph)
+        pred_sets = len({frozenset(graph.preds(i)) for i in range(n)})
+
+        start = time.perf_counter()
+        _build_aoa_view(graph, es, ef, ls, lf, topology, project_duration)
+        elapsed = time.perf_counter() - start
+
+        per_item = elapsed / (n + graph.edge_count) * 1e6
+        print(f"{n:>10} {graph.edge_count:>10} {pred_sets:>10} {elapsed:>8.2f} {per_item:>15.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,148 @@
+"""
+Scaling benchmark for the scheduling core.
+
+For every generator shape and size it times:
+  fb_pass       `_forward_backward_pass` on the interned graph
+  aoa           the AoA build (`_build_aoa_view`)
+  analyze_cpm   the full CPM analysis, validation included
+  analyze_pert  the full PERT analysis, validation included
+  json          `json.dumps` of the CPM result
+
+Each timing is the best of `--repeat` runs. Results are written as JSON with
+one record per (shape, tasks, phase), sorted, so two result files diff
+cleanly. With `--baseline` the run is also compared against an earlier
+result file, and the exit status is 1 if any phase got slower than the
+tolerance allows (timings under `--min-seconds` are not judged).
+
+benchmarks/baseline.json is the committed reference run (sizes up to
+100,000; records missing from a baseline are skipped). Timings depend on
+the machine, so regenerate it on the machine that runs the comparison
+before relying on its ratios.
+
+Usage:
+  python benchmarks/bench_scaling.py --out bench.json
+  python benchmarks/bench_scaling.py --sizes 100 1000 10000 100000 --out benchmarks/baseline.json
+  python benchmarks/bench_scaling.py --sizes 100 10000 --shapes chain fan \\
+      --out new.json --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import SHAPES
+from services.graph import TaskGraph
+from services.scheduling import _build_aoa_view, _forward_backward_pass, analyze_cpm, analyze_pert
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+PHASES = ("fb_pass", "aoa", "analyze_cpm", "analyze_pert", "json")
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_shape(shape, n, repeat):
+    tasks = SHAPES[shape](n)
+    graph = TaskGraph.from_tasks(tasks)
+    times = _forward_backward_pass(graph)
+    es, ef, ls, lf, project_duration, topology = times
+    result = analyze_cpm(tasks)
+
+    timings = {
+        "fb_pass": best_of(repeat, lambda: _forward_backward_pass(graph)),
+        "aoa": best_of(repeat, lambda: _build_aoa_view(graph, es, ef, ls, lf, topology, project_duration)),
+        "analyze_cpm": best_of(repeat, lambda: analyze_cpm(tasks)),
+        "analyze_pert": best_of(repeat, lambda: analyze_pert(tasks)),
+        "json": best_of(repeat, lambda: json.dumps(result)),
+    }
+    edges = graph.edge_count
+    return [
+        {
+            "shape": shape,
+            "tasks": n,
+            "edges": edges,
+            "phase": phase,
+            "seconds": round(timings[phase], 6),
+            "us_per_item": round(timings[phase] / (n + edges) * 1e6, 3),
+        }
+        for phase in PHASES
+    ]
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    """
+    Print new/baseline ratios per record. Returns the records slower than
+    `1 + tolerance`, ignoring timings under `min_seconds` (timer noise).
+    """
+    old = {(r["shape"], r["tasks"], r["phase"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    print(f"{'shape':>10} {'tasks':>9} {'phase':>13} {'base s':>9} {'new s':>9} {'ratio':>7}")
+    for r in results:
+        base = old.get((r["shape"], r["tasks"], r["phase"]))
+        if not base:
+            continue
+        ratio = r["seconds"] / base
+        flag = ""
+        if ratio > 1 + tolerance and r["seconds"] >= min_seconds:
+            regressions.append(r)
+            flag = "  <-- slower"
+        print(f"{r['shape']:>10} {r['tasks']:>9} {r['phase']:>13} {base:>9.4f} {r['seconds']:>9.4f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=list(SHAPES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="bench_scaling.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-seconds", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    results = []
+    for shape in args.shapes:
+        for n in args.sizes:
+            records = bench_shape(shape, n, args.repeat)
+            for r in records:
+                print(f"{shape:>10} {n:>9} {r['phase']:>13} {r['seconds']:>9.4f}s {r['us_per_item']:>8.2f} us/item")
+            results.extend(records)
+
+    results.sort(key=lambda r: (r["shape"], r["tasks"], PHASES.index(r["phase"])))
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+        f.write("\n")
+    print(f"wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance, args.min_seconds):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
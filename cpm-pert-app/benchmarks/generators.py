@@ -0,0 +1,75 @@
+"""
+Synthetic project generators for the benchmarks.
+
+Every generator is deterministic for a given (n, seed) and returns tasks that
+are valid in both CPM and PERT mode (duration plus a three-point estimate).
+"""
+import random
+
+
+def _task(i, deps, rnd):
+    o = rnd.randint(1, 5)
+    m = o + rnd.randint(0, 4)
+    p = m + rnd.randint(0, 6)
+    return {
+        "id": f"T{i}",
+        "name": f"Task {i}",
+        "duration": m,
+        "optimistic": o,
+        "most_likely": m,
+        "pessimistic": p,
+        "dependencies": deps,
+    }
+
+
+def chain(n, seed=1):
+    """A single path T0 -> T1 -> ... -> Tn-1: maximal depth, one task per level."""
+    rnd = random.Random(seed)
+    return [_task(i, [f"T{i - 1}"] if i else [], rnd) for i in range(n)]
+
+
+def fan(n, seed=1):
+    """One root fanning out to n-2 parallel tasks that all feed one sink."""
+    rnd = random.Random(seed)
+    if n < 3:
+        return chain(n, seed)
+    tasks = [_task(0, [], rnd)]
+    tasks += [_task(i, ["T0"], rnd) for i in range(1, n - 1)]
+    tasks.append(_task(n - 1, [f"T{i}" for i in range(1, n - 1)], rnd))
+    return tasks
+
+
+def layered(n, seed=1, width=1000, fan_in=3):
+    """Layers of `width` tasks; each task depends on `fan_in` random tasks of the previous layer."""
+    rnd = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        layer_start = (i // width) * width
+        prev = range(max(0, layer_start - width), layer_start)
+        deps = [f"T{j}" for j in rnd.sample(prev, min(fan_in, len(prev)))]
+        tasks.append(_task(i, deps, rnd))
+    return tasks
+
+
+def pred_sets(n, seed=1, window=64, max_preds=4):
+    """
+    Each task depends on 1..`max_preds` random tasks among the `window` before
+    it, so nearly every task has its own, overlapping predecessor set (the
+    most dummies and event nodes per task in the AoA view).
+    """
+    rnd = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        lo = max(0, i - window)
+        k = min(i - lo, rnd.randint(1, max_preds))
+        deps = [f"T{j}" for j in sorted(rnd.sample(range(lo, i), k))]
+        tasks.append(_task(i, deps, rnd))
+    return tasks
+
+
+SHAPES = {
+    "chain": chain,
+    "fan": fan,
+    "layered": layered,
+    "pred_sets": pred_sets,
+}
@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from services.metrics import phase
+from services.offload import AnalysisPool
+from services.scheduling import ScheduleValidationError, analyze_cpm, analyze_pert
+
+
+# Below this many tasks in total, a worker round trip costs more than the analysis.
+PARALLEL_MIN_TASKS = 20_000
+
+
+# ── Batch Analysis ────────────────────────────────────────────────────────────
+
+def analyze_project(project: Any) -> Dict[str, Any]:
+    """
+    Analyze one batch entry ({tasks, mode, project_start, views}) and return the body
+    `/api/analyze` would have sent for it, so a failure stays local to its project.
+    """
+    try:
+        if not isinstance(project, dict):
+            raise ValueError("Project must be an object")
+        tasks = project.get("tasks", [])
+        mode = project.get("mode", "cpm")
+        views = project.get("views")
+        if mode == "pert":
+            result = analyze_pert(tasks, views=views)
+        else:
+            result = analyze_cpm(tasks, views=views)
+        result["project_start"] = project.get("project_start") or date.today().isoformat()
+        return {"ok": True, "result": result}
+    except ScheduleValidationError as e:
+        return {"ok": False, "error": "Validation Failed", "validation_errors": e.errors}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def analyze_projects(projects: List[Any]) -> List[Dict[str, Any]]:
+    """Analyze a group of batch entries in order; the unit of work sent to a pool worker."""
+    return [analyze_project(p) for p in projects]
+
+
+def analyze_batch(
+    projects: List[Any],
+    workers: Optional[int] = None,
+    pool: Optional[AnalysisPool] = None,
+    timeout: Optional[float] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+    min_tasks: int = PARALLEL_MIN_TASKS,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze many projects. Outcomes come back in input order. Small batches,
+    and any batch without a `pool`, run in process.
+
+    Batches of at least `min_tasks` tasks in total are split into up to
+    `workers` contiguous groups (default: one per pool worker) run through the
+    shared `pool`, so they queue behind other offloaded analyses and are
+    refused the same way. The first PoolBusy, WorkerCrashed, AnalysisTimeout
+    or AnalysisCancelled raised by a group stops the remaining groups and is
+    raised for the whole batch.
+    """
+    if not isinstance(projects, list):
+        raise ValueError("Projects must be a list")
+    total_tasks = sum(
+        len(p["tasks"]) for p in projects if isinstance(p, dict) and isinstance(p.get("tasks"), list)
+    )
+    if pool is None or total_tasks < min_tasks:
+        return analyze_projects(projects)
+
+    groups = max(1, min(int(workers or pool.workers), pool.workers, len(projects)))
+    size = -(-len(projects) // groups)
+    runs = [projects[k:k + size] for k in range(0, len(projects), size)]
+    failures = []
+    failed = threading.Event()
+
+    def stop():
+        return failed.is_set() or (cancelled is not None and cancelled())
+
+    def run(group):
+        try:
+            return pool.run(analyze_projects, (group,), timeout=timeout, cancelled=stop)
+        except Exception as e:
+            # Recorded before the flag is set, so the first failure is the one that stopped the rest.
+            failures.append(e)
+            failed.set()
+            raise
+
+    with phase("offload"), ThreadPoolExecutor(max_workers=len(runs)) as executor:
+        futures = [executor.submit(run, group) for group in runs]
+    if failures:
+        raise failures[0]
+    return [outcome for future in futures for outcome in future.result()]
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from services.scheduling import ScheduleValidationError
+
+
+# ── Result Cache ──────────────────────────────────────────────────────────────
+
+def payload_key(tasks: List[Dict[str, Any]], mode: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Content hash of an analysis request: canonical JSON of (tasks, mode, options), key order ignored."""
+    canonical = json.dumps(
+        {"tasks": tasks, "mode": mode, "options": options},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of analysis outcomes keyed by `payload_key`.
+
+    Both successful results and validation failures are cached, so repeated
+    live-validation requests for the same broken table are answered too.
+    Memory is bounded by entry count and by the total number of task rows held
+    (`max_rows`), whichever is hit first.
+    """
+
+    def __init__(self, capacity: int = 128, max_rows: int = 1_000_000):
+        self.capacity = capacity
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._rows = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        tasks: List[Dict[str, Any]],
+        mode: str,
+        compute: Callable[[], Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Return a shallow copy of the cached result for (tasks, mode, options), computing it on a miss.
+        A cached validation failure is re-raised as ScheduleValidationError.
+        """
+        if self.capacity <= 0:
+            return compute()
+
+        key = payload_key(tasks, mode, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            try:
+                result = compute()
+            except ScheduleValidationError as e:
+                entry = ("error", e.errors, 1)
+            else:
+                entry = ("ok", result, len(result.get("tasks", ())) + 1)
+            self._store(key, entry)
+
+        kind, value, _ = entry
+        if kind == "error":
+            raise ScheduleValidationError(value)
+        return dict(value)
+
+    def _store(self, key: str, entry: tuple):
+        rows = entry[2]
+        if rows > self.max_rows:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._rows -= previous[2]
+            self._entries[key] = entry
+            self._rows += rows
+            while len(self._entries) > self.capacity or self._rows > self.max_rows:
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= evicted[2]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "capacity": self.capacity,
+                "max_rows": self.max_rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,245 @@
+import math
+from array import array
+from datetime import date
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from services.graph import TaskGraph
+from services.scheduling import ScheduleValidationError
+
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DEFAULT_WORKDAYS = WEEKDAYS[:5]
+DEFAULT_CALENDAR = "default"
+# Furthest a schedule may reach past project_start, in calendar days (~200 years).
+MAX_CALENDAR_DAYS = 73_000
+
+
+# ── Working-Day Index ─────────────────────────────────────────────────────────
+
+class WorkCalendar:
+    """
+    Working weekdays and holidays, indexed from a start date (day 0).
+
+    Two arrays over the calendar days from the start, built vectorized and
+    grown on demand: `days[k]` is the day number of working day ``k``, and
+    `before[d]` the number of working days before day ``d``. Working-day
+    offset -> date and date -> offset are both a single lookup.
+
+    Times are days from the start and may be fractional: working time `w`
+    starts at ``start_of(w)``, and work that ends at working time `w` is done
+    at ``end_of(w)`` (exclusive); the two differ across non-working days.
+    """
+
+    def __init__(self, start: date, workdays: Iterable[str] = DEFAULT_WORKDAYS, holidays: Iterable[date] = ()):
+        self.start = start
+        workdays = set(workdays)
+        self.weekdays = np.array([day in workdays for day in WEEKDAYS])
+        if not self.weekdays.any():
+            raise ValueError("A calendar needs at least one working weekday")
+        first = start.toordinal()
+        self.holidays = np.array(sorted({d.toordinal() - first for d in holidays}), dtype=np.int64)
+        self.days = np.empty(0, dtype=np.int64)
+        self.before = np.zeros(1, dtype=np.int64)
+        # List copies for the scalar lookups of the calendar pass.
+        self._days: List[int] = []
+        self._before: List[int] = [0]
+
+    def _cover(self, count: int = 0, span: int = 0):
+        """Extend the index to at least `count` working days and `span` calendar days."""
+        while len(self.days) < count or len(self.before) <= span:
+            covered = len(self.before) - 1
+            if covered >= MAX_CALENDAR_DAYS:
+                raise ValueError("Schedule extends past the calendar range")
+            # Enough calendar days for `count` working days, holidays aside; doubled on a shortfall.
+            need = max(math.ceil(count * 7 / self.weekdays.sum()) + 7 + len(self.holidays), span + 1)
+            total = min(MAX_CALENDAR_DAYS, max(need, 2 * covered))
+            day = np.arange(total, dtype=np.int64)
+            working = self.weekdays[(day + self.start.weekday()) % 7]
+            if len(self.holidays):
+                working &= ~np.isin(day, self.holidays)
+            self.days = day[working]
+            self.before = np.concatenate(([0], np.cumsum(working)))
+            self._days = self.days.tolist()
+            self._before = self.before.tolist()
+
+    def dates(self, offsets: np.ndarray) -> np.ndarray:
+        """Date (datetime64[D]) of each working-day offset."""
+        index = offsets.astype(np.int64)
+        self._cover(count=int(index.max(initial=-1)) + 1)
+        return self.days[index] + np.datetime64(self.start, "D")
+
+    def offset(self, day: date) -> int:
+        """Working-day offset of `day`, or of the next working day when `day` is not one."""
+        d = max(0, (day - self.start).days)
+        self._cover(span=d)
+        return self._before[d]
+
+    def working_time(self, t: float) -> float:
+        """Working days elapsed between the start and time `t`."""
+        d = math.floor(t)
+        if d + 1 >= len(self._before):
+            self._cover(span=d + 1)
+        before = self._before
+        return before[d] + (t - d) * (before[d + 1] - before[d])
+
+    def start_of(self, w: float) -> float:
+        k = math.floor(w)
+        if k >= len(self._days):
+            self._cover(count=k + 1)
+        return self._days[k] + (w - k)
+
+    def end_of(self, w: float) -> float:
+        k = max(math.ceil(w) - 1, 0)
+        if k >= len(self._days):
+            self._cover(count=k + 1)
+        return self._days[k] + (w - k)
+
+
+def parse_calendars(spec: Any, project_start: str) -> Dict[str, WorkCalendar]:
+    """
+    Calendars of an /api/analyze body: ``{id: {"workdays": [...], "holidays": [...]}}``
+    with weekday names ("mon".."sun") and ISO holiday dates. Workdays default
+    to Monday-Friday; the `default` calendar (Monday-Friday unless given) is
+    used by tasks without a `calendar` ID.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Calendars must be an object of {id: {workdays, holidays}}")
+    try:
+        start = date.fromisoformat(project_start)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid project_start: {project_start}")
+    calendars = {}
+    for calendar_id, entry in {DEFAULT_CALENDAR: {}, **spec}.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"Calendar {calendar_id}: expected an object")
+        workdays = entry.get("workdays", list(DEFAULT_WORKDAYS))
+        holidays = entry.get("holidays", [])
+        if not isinstance(workdays, list) or any(not isinstance(d, str) or d.lower()[:3] not in WEEKDAYS for d in workdays):
+            raise ValueError(f"Calendar {calendar_id}: workdays must be weekday names ({', '.join(WEEKDAYS)})")
+        try:
+            holidays = [date.fromisoformat(d) for d in holidays]
+        except (TypeError, ValueError):
+            raise ValueError(f"Calendar {calendar_id}: holidays must be a list of YYYY-MM-DD dates")
+        calendars[calendar_id] = WorkCalendar(start, [d.lower()[:3] for d in workdays], holidays)
+    return calendars
+
+
+# ── Schedule Dates ────────────────────────────────────────────────────────────
+
+def add_dates(
+    result: Dict[str, Any],
+    tasks: List[Dict[str, Any]],
+    project_start: str,
+    spec: Any,
+) -> Dict[str, Any]:
+    """
+    `result` with `es_date`, `ef_date`, `ls_date` and `lf_date` on every
+    activity row and the project's `finish_date`. Durations count working days
+    of the task's calendar (its `calendar` ID, else `default`); start dates
+    are the first working day, finish dates the last one (inclusive).
+
+    When every task shares a calendar the offsets are its working days and
+    map straight to dates. Mixed calendars get a pass of their own over
+    calendar time (`_calendar_pass`), and the rows' es/ef/ls/lf, slack and
+    critical are recomputed from it, as working days of each task's own
+    calendar, so they agree with the dates (AoN nodes alike). The AoA event
+    times and dummies stay calendar-free. New rows are built, so a cached
+    `result` stays as is.
+    """
+    calendars = parse_calendars(spec, project_start)
+    assigned: Dict[str, str] = {}
+    errors = []
+    for task in tasks:
+        calendar_id = task.get("calendar") if isinstance(task, dict) else None
+        if calendar_id is not None:
+            if calendar_id not in calendars:
+                errors.append({"id": task.get("id"), "msg": f"Unknown calendar: {calendar_id}"})
+            assigned[task.get("id")] = calendar_id
+    if errors:
+        raise ScheduleValidationError(errors)
+
+    result = dict(result)
+    if "tasks" in result:
+        rows = result["tasks"] = list(result["tasks"])
+    elif "aon" in result:
+        result["aon"] = dict(result["aon"])
+        rows = result["aon"]["nodes"] = list(result["aon"]["nodes"])
+    else:
+        return result
+    # Activity rows come in topological order (AoA dummies last).
+    members = [k for k, row in enumerate(rows) if not row.get("is_dummy")]
+    used = [calendars[assigned.get(rows[k]["id"], DEFAULT_CALENDAR)] for k in members]
+
+    if len(set(map(id, used))) <= 1:
+        calendar = used[0] if used else calendars[DEFAULT_CALENDAR]
+        times = [np.array([rows[k][field] for k in members], dtype=np.float64) for field in ("es", "ef", "ls", "lf")]
+        columns = [_date_strings(calendar.dates(days)) for days in _day_numbers(*times)]
+    else:
+        if any("relations" in rows[k] for k in members):
+            raise ValueError("Per-task calendars support finish-to-start dependencies only")
+        times = _calendar_pass(TaskGraph.from_tasks([rows[k] for k in members]), used)
+        start = np.datetime64(calendars[DEFAULT_CALENDAR].start, "D")
+        columns = [_date_strings(start + days.astype(np.int64)) for days in _day_numbers(*times)]
+        schedule = _working_schedule(times, used)
+        for k, entry in zip(members, schedule):
+            rows[k] = {**rows[k], **entry}
+        if "tasks" in result and "aon" in result:
+            by_id = {rows[k]["id"]: entry for k, entry in zip(members, schedule)}
+            result["aon"] = dict(result["aon"])
+            result["aon"]["nodes"] = [{**node, **by_id[node["id"]]} for node in result["aon"]["nodes"]]
+
+    for k, es_date, ef_date, ls_date, lf_date in zip(members, *columns):
+        row = rows[k] = dict(rows[k])
+        row["es_date"], row["ef_date"], row["ls_date"], row["lf_date"] = es_date, ef_date, ls_date, lf_date
+    # ISO dates order like strings.
+    result["finish_date"] = max(columns[1], default=project_start)
+    return result
+
+
+def _day_numbers(es, ef, ls, lf):
+    """Day of each start and, finish times being exclusive, of each task's last day."""
+    return (
+        np.floor(es), np.maximum(np.ceil(ef) - 1, np.floor(es)),
+        np.floor(ls), np.maximum(np.ceil(lf) - 1, np.floor(ls)),
+    )
+
+
+def _date_strings(days: np.ndarray) -> List[str]:
+    return np.datetime_as_string(days.astype("datetime64[D]")).tolist()
+
+
+def _working_schedule(times, calendars: List[WorkCalendar]) -> List[Dict[str, Any]]:
+    """Calendar-pass times as working days of each task's calendar, with the slack and criticality they imply."""
+    out = []
+    for calendar, *values in zip(calendars, *(column.tolist() for column in times)):
+        es, ef, ls, lf = map(calendar.working_time, values)
+        slack = ls - es
+        out.append({"es": es, "ef": ef, "ls": ls, "lf": lf, "slack": slack, "critical": abs(slack) < 1e-6})
+    return out
+
+
+def _calendar_pass(graph: TaskGraph, calendars: List[WorkCalendar]):
+    """
+    Forward/backward pass in calendar time (days from the start) for tasks on
+    different calendars, given in topological order: a task starts at the
+    first working moment of its calendar after its predecessors finish and
+    runs for its duration in working days of that calendar. Every conversion
+    is an index lookup, so this stays linear.
+    """
+    n = len(graph)
+    dur = graph.dur
+    es, ef, ls, lf = (array("d", bytes(8 * n)) for _ in range(4))
+    for i in range(n):
+        calendar = calendars[i]
+        w = calendar.working_time(max(map(ef.__getitem__, graph.preds(i)), default=0.0))
+        es[i] = calendar.start_of(w)
+        ef[i] = calendar.end_of(w + dur[i])
+    finish = max(ef, default=0.0)
+    for i in reversed(range(n)):
+        calendar = calendars[i]
+        w = calendar.working_time(min(map(ls.__getitem__, graph.succs(i)), default=finish))
+        lf[i] = calendar.end_of(w)
+        ls[i] = calendar.start_of(w - dur[i])
+    return tuple(np.frombuffer(column, dtype=np.float64) for column in (es, ef, ls, lf))
@@ -0,0 +1,267 @@
+import json
+import math
+import struct
+import sys
+from array import array
+from operator import itemgetter
+from typing import Any, Dict, List, Optional
+
+FORMAT_VERSION = 1
+MAGIC = b"CPMC"
+MIME_TYPE = "application/vnd.cpm.columnar"
+FORMATS = ("rows", "columnar", "binary")
+
+FLOAT_FIELDS = {
+    "duration", "es", "ef", "ls", "lf", "slack", "earliest", "latest",
+    "optimistic", "most_likely", "pessimistic", "expected", "variance", "std_dev",
+}
+BOOL_FIELDS = {"critical", "is_dummy"}
+# Row fields that repeat another column and are rebuilt on decode.
+DERIVED_FIELDS = {"label": "id"}
+_TYPECODES = {"f8": "d", "u1": "B", "i4": "i"}
+
+
+# ── Columnar Encoding ─────────────────────────────────────────────────────────
+
+def to_columnar(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Columnar form of an analysis result: one array per field instead of one dict per row.
+
+    `ids` is the activity ID table (task rows, dummies included); task rows are
+    implicitly ``ids[i]``. Dependencies and node members become offset/index
+    arrays into `ids`, tail/head nodes become indexes into the node table, and
+    AoN nodes are not repeated when the task rows already carry them. Scalar
+    entries (project_duration, pert_stats, session, ...) are copied as they are.
+    """
+    columnar: Dict[str, Any] = {"format": "columnar", "version": FORMAT_VERSION}
+    for key, value in result.items():
+        if key not in ("tasks", "nodes", "aon"):
+            columnar[key] = value
+
+    tasks = result.get("tasks")
+    nodes = result.get("nodes")
+    aon = result.get("aon")
+    rows = tasks if tasks is not None else (aon["nodes"] if aon is not None else [])
+    ids = [row["id"] for row in rows]
+    refs = {"ids": {tid: i for i, tid in enumerate(ids)}}
+    columnar["ids"] = ids
+
+    if nodes is not None:
+        columnar["nodes"] = _table(nodes, refs, implicit_id=False)
+        refs["nodes"] = {node["id"]: i for i, node in enumerate(nodes)}
+    if tasks is not None:
+        columnar["tasks"] = _table(tasks, refs, implicit_id=True)
+    if aon is not None:
+        index = refs["ids"]
+        edges = aon["edges"]
+        columns = {
+            "source": {"type": "i4", "ref": "ids", "values": [index[e["source"]] for e in edges]},
+            "target": {"type": "i4", "ref": "ids", "values": [index[e["target"]] for e in edges]},
+        }
+        # Typed dependencies: each edge's [{type, lag}] list, kept as is.
+        if edges and "relations" in edges[0]:
+            columns["relations"] = {"type": "str", "values": [e["relations"] for e in edges]}
+        columnar["aon"] = {
+            "project_duration": aon["project_duration"],
+            # AoN nodes are the non-dummy task rows, in the same order.
+            "nodes": "tasks" if tasks is not None else _table(aon["nodes"], refs, implicit_id=True),
+            "edges": {"count": len(edges), "fields": list(columns), "columns": columns},
+        }
+    return columnar
+
+
+def _table(rows: List[Dict[str, Any]], refs: Dict[str, Dict[str, int]], implicit_id: bool) -> Dict[str, Any]:
+    # Rows come in a handful of key layouts (tasks, dummies); union them in first-seen order.
+    shapes = list(dict.fromkeys(map(tuple, rows)))
+    fields: Dict[str, None] = {}
+    for shape in shapes:
+        fields.update(dict.fromkeys(shape))
+
+    columns: Dict[str, Any] = {}
+    for field in fields:
+        if field in DERIVED_FIELDS or (field == "id" and implicit_id):
+            continue
+        if all(field in shape for shape in shapes):
+            values = list(map(itemgetter(field), rows))
+        else:
+            values = [row.get(field) for row in rows]
+        if field in FLOAT_FIELDS:
+            columns[field] = {"type": "f8", "values": values}
+        elif field in BOOL_FIELDS:
+            columns[field] = {"type": "u1", "values": list(map(int, values))}
+        elif field in ("tail_node", "head_node") and "nodes" in refs:
+            index = refs["nodes"]
+            columns[field] = {"type": "i4", "ref": "nodes", "values": list(map(index.__getitem__, values))}
+        elif field in ("dependencies", "members"):
+            index = refs["ids"]
+            offsets = [0]
+            flat: List[int] = []
+            lookup = index.__getitem__
+            for v in values:
+                if v:
+                    flat.extend(map(lookup, v))
+                offsets.append(len(flat))
+            columns[field] = {"type": "list", "ref": "ids", "offsets": offsets, "values": flat}
+        else:
+            columns[field] = {"type": "str", "values": values}
+    return {"count": len(rows), "fields": list(fields), "columns": columns}
+
+
+# ── Columnar Decoding ─────────────────────────────────────────────────────────
+
+def from_columnar(columnar: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the row-per-dict result `to_columnar` started from."""
+    result = {k: v for k, v in columnar.items() if k not in ("format", "version", "ids", "tasks", "nodes", "aon")}
+    ids = columnar["ids"]
+    nodes = _rows(columnar["nodes"], ids, None) if "nodes" in columnar else None
+    node_ids = [n["id"] for n in nodes] if nodes is not None else None
+
+    if "tasks" in columnar:
+        result["tasks"] = _rows(columnar["tasks"], ids, node_ids)
+    if nodes is not None:
+        result["nodes"] = nodes
+    if "aon" in columnar:
+        aon = columnar["aon"]
+        if aon["nodes"] == "tasks":
+            keep = ("id", "label", "duration", "es", "ef", "ls", "lf", "slack", "critical", "dependencies")
+            aon_nodes = [
+                {k: t[k] if k != "label" else t["id"] for k in keep}
+                for t in result["tasks"] if not t["is_dummy"]
+            ]
+        else:
+            aon_nodes = _rows(aon["nodes"], ids, node_ids)
+        edges = aon["edges"]["columns"]
+        aon_edges = [
+            {"id": f"{ids[s]}->{ids[t]}", "source": ids[s], "target": ids[t]}
+            for s, t in zip(edges["source"]["values"], edges["target"]["values"])
+        ]
+        if "relations" in edges:
+            for edge, relations in zip(aon_edges, edges["relations"]["values"]):
+                edge["relations"] = relations
+        result["aon"] = {
+            "project_duration": aon["project_duration"],
+            "nodes": aon_nodes,
+            "edges": aon_edges,
+        }
+    return result
+
+
+def _rows(table: Dict[str, Any], ids: List[str], node_ids: Optional[List[str]]) -> List[Dict[str, Any]]:
+    columns = table["columns"]
+    rows = []
+    for i in range(table["count"]):
+        row = {}
+        for field in table["fields"]:
+            if field in DERIVED_FIELDS:
+                row[field] = row[DERIVED_FIELDS[field]]
+                continue
+            if field == "id" and field not in columns:
+                row["id"] = ids[i]
+                continue
+            column = columns[field]
+            kind = column["type"]
+            if kind == "list":
+                offsets = column["offsets"]
+                row[field] = [ids[k] for k in column["values"][offsets[i]:offsets[i + 1]]]
+                continue
+            value = column["values"][i]
+            if kind == "f8":
+                if value is None or value != value:
+                    continue  # field absent on this row (e.g. PERT estimates on dummies)
+                row[field] = value
+            elif kind == "u1":
+                row[field] = bool(value)
+            elif column.get("ref") == "nodes":
+                row[field] = node_ids[value]
+            else:
+                row[field] = value
+        rows.append(row)
+    return rows
+
+
+# ── Binary Encoding ───────────────────────────────────────────────────────────
+#
+# MAGIC | u8 version | 3 pad bytes | u32 header length | header JSON | buffers
+#
+# The header is the columnar JSON with every numeric array replaced by
+# {"buffer": [byte offset, length]}; offsets count from the start of the
+# buffer section, and every buffer is 8-byte aligned and little-endian.
+
+def encode_binary(columnar: Dict[str, Any]) -> bytes:
+    buffers: List[bytes] = []
+    position = 0
+
+    def pack(values, kind):
+        nonlocal position
+        data = array(_TYPECODES[kind], (math.nan if v is None else v for v in values))
+        if sys.byteorder == "big":
+            data.byteswap()
+        raw = data.tobytes()
+        raw += b"\0" * (-len(raw) % 8)
+        ref = {"buffer": [position, len(values)]}
+        buffers.append(raw)
+        position += len(raw)
+        return ref
+
+    def walk_table(table):
+        columns = {}
+        for name, column in table["columns"].items():
+            column = dict(column)
+            if column["type"] == "list":
+                column["offsets"] = pack(column["offsets"], "i4")
+                column["values"] = pack(column["values"], "i4")
+            elif column["type"] in _TYPECODES:
+                column["values"] = pack(column["values"], column["type"])
+            columns[name] = column
+        return {**table, "columns": columns}
+
+    header = dict(columnar)
+    for key in ("tasks", "nodes"):
+        if key in header:
+            header[key] = walk_table(header[key])
+    if "aon" in header:
+        aon = dict(header["aon"])
+        if aon["nodes"] != "tasks":
+            aon["nodes"] = walk_table(aon["nodes"])
+        aon["edges"] = walk_table(aon["edges"])
+        header["aon"] = aon
+
+    head = json.dumps(header, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    head += b" " * (-(len(head) + 12) % 8)
+    return b"".join([MAGIC, struct.pack("<B3xI", FORMAT_VERSION, len(head)), head, *buffers])
+
+
+def decode_binary(data: bytes) -> Dict[str, Any]:
+    """Inverse of `encode_binary`: the columnar JSON with plain lists restored."""
+    if data[:4] != MAGIC:
+        raise ValueError("Not a columnar result")
+    version, head_len = struct.unpack_from("<B3xI", data, 4)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar version: {version}")
+    columnar = json.loads(data[12:12 + head_len])
+    base = 12 + head_len
+
+    def unpack(ref, kind):
+        offset, length = ref["buffer"]
+        values = array(_TYPECODES[kind])
+        values.frombytes(data[base + offset:base + offset + length * values.itemsize])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+
+    def walk_table(table):
+        for column in table["columns"].values():
+            if column["type"] == "list":
+                column["offsets"] = unpack(column["offsets"], "i4")
+                column["values"] = unpack(column["values"], "i4")
+            elif column["type"] in _TYPECODES:
+                column["values"] = unpack(column["values"], column["type"])
+
+    for key in ("tasks", "nodes"):
+        if key in columnar:
+            walk_table(columnar[key])
+    if "aon" in columnar:
+        if columnar["aon"]["nodes"] != "tasks":
+            walk_table(columnar["aon"]["nodes"])
+        walk_table(columnar["aon"]["edges"])
+    return columnar
@@ -0,0 +1,168 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Dependency types by code. Bit 0 set: the predecessor's start is the reference
+# point (else its finish); bit 1 set: the constraint is on the dependent's
+# finish (else its start). FS with lag 0 is the plain dependency.
+RELATION_TYPES = ("FS", "SS", "FF", "SF")
+FROM_START = 1
+TO_FINISH = 2
+
+# ── Compact Task Graph ────────────────────────────────────────────────────────
+
+class TaskGraph:
+    """
+    Integer-indexed precedence graph used by the scheduling core.
+
+    Task IDs are interned once: task ``i`` is ``ids[i]`` and ``index[tid] == i``.
+    Edges are stored CSR-style, so the predecessors of task ``i`` are
+    ``pred_idx[pred_off[i]:pred_off[i + 1]]`` (same layout for successors).
+    Durations live in a flat float array aligned with the task indices.
+
+    Graphs with typed dependencies (SS/FF/SF, or any lag) also carry a
+    relation code (see `RELATION_TYPES`) and a lag per edge, aligned with
+    ``pred_idx`` and ``succ_idx``; for plain finish-to-start graphs these are
+    None and every edge is FS with lag 0.
+    """
+
+    __slots__ = (
+        "ids", "index", "names", "dur", "pred_off", "pred_idx", "succ_off", "succ_idx",
+        "pred_type", "pred_lag", "succ_type", "succ_lag",
+    )
+
+    def __init__(
+        self,
+        ids: List[str],
+        names: List[str],
+        dur: array,
+        pred_off: array,
+        pred_idx: array,
+        index: Optional[Dict[str, int]] = None,
+        succ: Optional[Tuple[Sequence[int], Sequence[int]]] = None,
+        relations: Optional[Tuple[array, array]] = None,
+    ):
+        self.ids = ids
+        self.index: Dict[str, int] = index if index is not None else {tid: i for i, tid in enumerate(ids)}
+        self.names = names
+        self.dur = dur
+        self.pred_off = pred_off
+        self.pred_idx = pred_idx
+        # `succ` (off, idx) skips the transpose when the caller already has it.
+        self.succ_off, self.succ_idx = succ if succ is not None else _transpose(len(ids), pred_off, pred_idx)
+        # `relations` is (type codes, lags) aligned with pred_idx.
+        self.pred_type, self.pred_lag = relations if relations is not None else (None, None)
+        self.succ_type = self.succ_lag = None
+        if relations is not None:
+            self.succ_type, self.succ_lag = _transpose_values(len(ids), pred_off, pred_idx, self.succ_off, relations)
+
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict[str, Any]], durations: Optional[Iterable[float]] = None) -> "TaskGraph":
+        """
+        Intern the task list. Expects tasks that already passed validation.
+        Duplicate dependencies are collapsed; ``durations`` overrides ``task["duration"]``.
+        """
+        ids = [t["id"] for t in tasks]
+        index = {tid: i for i, tid in enumerate(ids)}
+        names = [t.get("name") or t["id"] for t in tasks]
+        if durations is None:
+            durations = (float(t.get("duration", 0.0)) for t in tasks)
+        dur = array("d", durations)
+
+        pred_off = array("q", [0])
+        pred_idx = array("q")
+        for t in tasks:
+            deps = t.get("dependencies") or []
+            if len(deps) > 1:
+                deps = dict.fromkeys(deps)
+            pred_idx.extend(map(index.__getitem__, deps))
+            pred_off.append(len(pred_idx))
+        return cls(ids, names, dur, pred_off, pred_idx, index)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.pred_idx)
+
+    @property
+    def typed(self) -> bool:
+        """True when some dependency is not a plain finish-to-start one."""
+        return self.pred_type is not None
+
+    def preds(self, i: int) -> array:
+        return self.pred_idx[self.pred_off[i]:self.pred_off[i + 1]]
+
+    def succs(self, i: int) -> array:
+        return self.succ_idx[self.succ_off[i]:self.succ_off[i + 1]]
+
+    def topological_order(self) -> array:
+        """
+        Kahn's algorithm over the CSR arrays. Sources are seeded in ID order.
+        If the graph has a cycle the returned order is shorter than the graph.
+        """
+        return self.topological_levels()[0]
+
+    def topological_levels(self):
+        """
+        `topological_order` plus where each level starts in it.
+
+        The queue is first-in first-out, so the order comes out level by level:
+        the sources first, then every task one level above its deepest
+        predecessor. Returns ``(order, bounds)`` where level ``k`` is
+        ``order[bounds[k]:bounds[k + 1]]``.
+        """
+        n = len(self.ids)
+        pred_off, succ_off, succ_idx = self.pred_off, self.succ_off, self.succ_idx
+        in_degree = array("q", (pred_off[i + 1] - pred_off[i] for i in range(n)))
+        ids = self.ids
+        # `order` doubles as the queue: tasks in order[head:] are ready but not yet expanded.
+        order = array("q", sorted((i for i in range(n) if in_degree[i] == 0), key=ids.__getitem__))
+        bounds = array("q", [0])
+        level_end = len(order)
+
+        head = 0
+        while head < len(order):
+            if head == level_end:
+                bounds.append(head)
+                level_end = len(order)
+            current = order[head]
+            head += 1
+            for k in range(succ_off[current], succ_off[current + 1]):
+                dependent = succ_idx[k]
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    order.append(dependent)
+        bounds.append(len(order))
+        return order, bounds
+
+
+def _transpose(n: int, off: array, idx: array):
+    """Build the reverse CSR adjacency (successors from predecessors) by counting sort."""
+    counts = array("q", bytes(8 * (n + 1)))
+    for j in idx:
+        counts[j + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    rev_off = array("q", counts)
+    rev_idx = array("q", bytes(8 * len(idx)))
+    cursor = counts
+    for i in range(n):
+        for k in range(off[i], off[i + 1]):
+            j = idx[k]
+            rev_idx[cursor[j]] = i
+            cursor[j] += 1
+    return rev_off, rev_idx
+
+
+def _transpose_values(n: int, off: array, idx: array, rev_off: array, values: Iterable[array]):
+    """Per-edge `values` (aligned with `idx`) reordered to match `_transpose`'s reverse arrays."""
+    cursor = array("q", rev_off)
+    position = array("q", bytes(8 * len(idx)))
+    for i in range(n):
+        for k in range(off[i], off[i + 1]):
+            j = idx[k]
+            position[cursor[j]] = k
+            cursor[j] += 1
+    return tuple(array(column.typecode, map(column.__getitem__, position)) for column in values)
@@ -0,0 +1,134 @@
+import csv
+import re
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import openpyxl
+
+
+# Column sets of the spreadsheet format (see data/*.csv); "name" is optional in both.
+CPM_COLUMNS = ("ac", "pr", "du")
+PERT_COLUMNS = ("ac", "pr", "opt", "ml", "pess")
+# Older sheets label the three-point estimates a / m / b.
+PERT_ALIASES = {"a": "opt", "m": "ml", "b": "pess"}
+
+_SEPARATOR = re.compile(r"[,\s;]+")
+
+
+# ── Rows -> Tasks ─────────────────────────────────────────────────────────────
+
+def _header(cells: Sequence[str]) -> Tuple[str, Dict[str, int]]:
+    """(mode, column -> position) of a header row; any other column is an error."""
+    columns = [c.lower() for c in cells]
+    while columns and not columns[-1]:
+        columns.pop()
+    position = {PERT_ALIASES.get(c, c): k for k, c in enumerate(columns)}
+    for mode, required in (("cpm", CPM_COLUMNS), ("pert", PERT_COLUMNS)):
+        if set(position) - {"name"} == set(required) and len(position) == len(columns):
+            return mode, position
+    raise ValueError(
+        f"Unrecognised column format: got [{', '.join(columns)}]. "
+        f"Expected CPM (ac, pr, du) or PERT (ac, pr, opt, ml, pess), "
+        f'with an optional "name" column.'
+    )
+
+
+def parse_predecessors(cell: str) -> List[str]:
+    """
+    The `pr` column: "-" or empty for none, IDs separated by commas, semicolons
+    or spaces, or single-letter IDs run together ("IJKM" -> I, J, K, M).
+    """
+    cell = cell.strip()
+    if not cell or cell == "-":
+        return []
+    if _SEPARATOR.search(cell):
+        return [p for p in _SEPARATOR.split(cell) if p]
+    if cell.isalpha() and cell.isascii():
+        return list(cell)
+    return [cell]
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheet numbers: ID 3 and duration 7 are stored as 3.0 and 7.0.
+        return str(int(value))
+    return str(value)
+
+
+def _number(text: str):
+    """The cell as a float, or as given so validation can report it."""
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def read_rows(rows: Iterable[Sequence[str]], max_rows: Optional[int] = None) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Turn rows of text cells (header first) into (tasks, mode). Blank rows are
+    skipped and rows are read one at a time, so only the tasks are kept.
+    Values are not validated here; `ingest_tasks` does that.
+    """
+    rows = iter(rows)
+    mode = position = None
+    for cells in rows:
+        cells = [c.strip() for c in cells]
+        if any(cells):
+            mode, position = _header(cells)
+            break
+    if position is None:
+        raise ValueError("File must contain a header and at least one data row.")
+
+    fields = ("duration",) if mode == "cpm" else ("optimistic", "most_likely", "pessimistic")
+    columns = CPM_COLUMNS[2:] if mode == "cpm" else PERT_COLUMNS[2:]
+    slots = [(field, position[column]) for field, column in zip(fields, columns)]
+    id_at, pr_at, name_at = position["ac"], position["pr"], position.get("name")
+
+    tasks = []
+    for cells in rows:
+        cells = [c.strip() for c in cells]
+        if not any(cells):
+            continue
+        if max_rows is not None and len(tasks) >= max_rows:
+            raise ValueError(f"At most {max_rows} rows per import")
+        cells += [""] * (len(position) - len(cells))
+        tid = cells[id_at]
+        task = {
+            "id": tid,
+            "name": (cells[name_at] if name_at is not None else "") or tid,
+            "dependencies": parse_predecessors(cells[pr_at]),
+        }
+        for field, at in slots:
+            task[field] = _number(cells[at])
+        tasks.append(task)
+
+    if not tasks:
+        raise ValueError("File must contain a header and at least one data row.")
+    return tasks, mode
+
+
+# ── CSV / XLSX ────────────────────────────────────────────────────────────────
+
+def read_csv_tasks(lines: Iterable[str], max_rows: Optional[int] = None) -> Tuple[List[Dict[str, Any]], str]:
+    """(tasks, mode) from CSV text lines, e.g. a text-mode upload stream."""
+    return read_rows(csv.reader(lines, skipinitialspace=True), max_rows)
+
+
+def read_xlsx_tasks(file: IO[bytes], max_rows: Optional[int] = None) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    (tasks, mode) from the first sheet of an XLSX workbook. The workbook is
+    opened read-only, so openpyxl streams rows from the archive instead of
+    loading the sheet; `file` must be seekable.
+    """
+    try:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        raise ValueError("Not a valid XLSX workbook")
+    try:
+        if not workbook.worksheets:
+            raise ValueError("Excel file contains no sheets.")
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        return read_rows(([_cell_text(c) for c in row] for row in rows), max_rows)
+    finally:
+        workbook.close()
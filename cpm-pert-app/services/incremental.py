@@ -0,0 +1,270 @@
+import heapq
+import threading
+import uuid
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from services.graph import TaskGraph
+from services.scheduling import (
+    ScheduleValidationError,
+    _cycle_error,
+    _resolve_aoa,
+    _resolve_views,
+    _schedule_from_graph,
+    ingest_tasks,
+)
+
+
+class SessionNotFound(Exception):
+    pass
+
+
+class SessionVersionConflict(Exception):
+    def __init__(self, expected: int, got: Any):
+        self.expected = expected
+        super().__init__(f"Session is at version {expected}, got {got}")
+
+
+# ── Schedule Session ──────────────────────────────────────────────────────────
+
+class ScheduleSession:
+    """
+    A CPM schedule kept between requests so small edits can be re-propagated.
+
+    Holds the interned graph, the ES/EF/LS/LF arrays and each task's rank in the
+    topological order. `apply` re-runs the forward pass only over descendants of
+    the edited tasks and the backward pass only over their ancestors, stopping
+    wherever a value does not change.
+    """
+
+    def __init__(self, graph: TaskGraph, es: array, ef: array, ls: array, lf: array,
+                 project_duration: float, topology: array):
+        self.graph = graph
+        self.es, self.ef, self.ls, self.lf = es, ef, ls, lf
+        self.project_duration = project_duration
+        self.version = 1
+        self.lock = threading.Lock()
+        self._set_rank(topology)
+
+    def _set_rank(self, topology: array):
+        rank = array("q", bytes(8 * len(topology)))
+        for position, i in enumerate(topology):
+            rank[i] = position
+        self.rank = rank
+
+    def apply(self, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply duration/dependency edits and return the rows whose values changed.
+        Raises ScheduleValidationError without touching the session if any edit is invalid.
+        """
+        durations, dependencies = self._validate_changes(changes)
+        graph = self.graph
+
+        new_graph = None
+        if dependencies:
+            new_graph = self._rewire(dependencies)
+            if any(self.rank[p] >= self.rank[i]
+                   for i, preds in dependencies.items() for p in preds):
+                topology = new_graph.topological_order()
+                if len(topology) != len(new_graph.ids):
+                    raise _cycle_error(new_graph, topology)
+                self._set_rank(topology)
+
+        # Everything below only mutates state; validation is done.
+        forward_seeds = set(durations) | set(dependencies)
+        backward_seeds = set(durations)
+        for i, preds in dependencies.items():
+            backward_seeds.update(graph.preds(i))
+            backward_seeds.update(preds)
+        if new_graph is not None:
+            self.graph = graph = new_graph
+        for i, d in durations.items():
+            graph.dur[i] = d
+
+        old_ef: Dict[int, float] = {}
+        touched = set(durations) | set(dependencies)
+        touched |= self._propagate_forward(forward_seeds, old_ef)
+        old_duration = self.project_duration
+        self._update_project_duration(old_ef)
+        if self.project_duration != old_duration:
+            touched |= self._propagate_backward(range(len(graph.ids)))
+        else:
+            touched |= self._propagate_backward(backward_seeds)
+
+        self.version += 1
+        return [self._row(i) for i in sorted(touched, key=self.rank.__getitem__)]
+
+    def _validate_changes(self, changes):
+        if not isinstance(changes, list) or not changes:
+            raise ValueError("Changes must be a non-empty list")
+
+        index = self.graph.index
+        errors = []
+        durations: Dict[int, float] = {}
+        dependencies: Dict[int, List[int]] = {}
+        for change in changes:
+            tid = change.get("id") if isinstance(change, dict) else None
+            if tid not in index:
+                errors.append({"id": tid, "msg": f"Unknown task: {tid}"})
+                continue
+            i = index[tid]
+            if "duration" in change:
+                try:
+                    d = float(change["duration"])
+                    if d <= 0:
+                        errors.append({"id": tid, "msg": "Duration must be greater than zero"})
+                    else:
+                        durations[i] = d
+                except (TypeError, ValueError):
+                    errors.append({"id": tid, "msg": "Duration must be a number"})
+            if "dependencies" in change:
+                deps = change["dependencies"]
+                if not isinstance(deps, list):
+                    errors.append({"id": tid, "msg": "Dependencies must be a list"})
+                    continue
+                preds = []
+                for dep in dict.fromkeys(deps):
+                    if dep == tid:
+                        errors.append({"id": tid, "msg": "Self-dependency"})
+                    elif dep not in index:
+                        errors.append({"id": tid, "msg": f"Missing dependency: {dep}"})
+                    else:
+                        preds.append(index[dep])
+                dependencies[i] = preds
+        if errors:
+            raise ScheduleValidationError(errors)
+        return durations, dependencies
+
+    def _rewire(self, dependencies: Dict[int, List[int]]) -> TaskGraph:
+        """Copy the graph with the predecessor lists of the edited tasks replaced."""
+        graph = self.graph
+        pred_off = array("q", [0])
+        pred_idx = array("q")
+        for i in range(len(graph.ids)):
+            if i in dependencies:
+                pred_idx.extend(dependencies[i])
+            else:
+                pred_idx.extend(graph.preds(i))
+            pred_off.append(len(pred_idx))
+        return TaskGraph(graph.ids, graph.names, array("d", graph.dur), pred_off, pred_idx, graph.index)
+
+    def _propagate_forward(self, seeds, old_ef: Dict[int, float]) -> set:
+        graph, es, ef, rank = self.graph, self.es, self.ef, self.rank
+        heap = [(rank[i], i) for i in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        changed = set()
+        while heap:
+            _, i = heapq.heappop(heap)
+            new_es = max(map(ef.__getitem__, graph.preds(i)), default=0.0)
+            new_ef = new_es + graph.dur[i]
+            if new_es == es[i] and new_ef == ef[i]:
+                continue
+            old_ef[i] = ef[i]
+            es[i], ef[i] = new_es, new_ef
+            changed.add(i)
+            for j in graph.succs(i):
+                if j not in queued:
+                    queued.add(j)
+                    heapq.heappush(heap, (rank[j], j))
+        return changed
+
+    def _update_project_duration(self, old_ef: Dict[int, float]):
+        ef = self.ef
+        current = self.project_duration
+        if any(old == current and ef[i] < current for i, old in old_ef.items()):
+            # A task that defined the finish got earlier; only a full scan can tell the new maximum.
+            self.project_duration = max(ef, default=0.0)
+        else:
+            self.project_duration = max(current, max(map(ef.__getitem__, old_ef), default=current))
+
+    def _propagate_backward(self, seeds) -> set:
+        graph, ls, lf, rank = self.graph, self.ls, self.lf, self.rank
+        project_duration = self.project_duration
+        heap = [(-rank[i], i) for i in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        changed = set()
+        while heap:
+            _, i = heapq.heappop(heap)
+            new_lf = min(map(ls.__getitem__, graph.succs(i)), default=project_duration)
+            new_ls = new_lf - graph.dur[i]
+            if new_lf == lf[i] and new_ls == ls[i]:
+                continue
+            lf[i], ls[i] = new_lf, new_ls
+            changed.add(i)
+            for j in graph.preds(i):
+                if j not in queued:
+                    queued.add(j)
+                    heapq.heappush(heap, (-rank[j], j))
+        return changed
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        graph = self.graph
+        slack = self.ls[i] - self.es[i]
+        return {
+            "id": graph.ids[i],
+            "duration": graph.dur[i],
+            "es": self.es[i], "ef": self.ef[i],
+            "ls": self.ls[i], "lf": self.lf[i],
+            "slack": slack,
+            "critical": abs(slack) < 1e-6,
+            "dependencies": [graph.ids[p] for p in graph.preds(i)],
+        }
+
+
+# ── Session Store ─────────────────────────────────────────────────────────────
+
+class SessionStore:
+    """In-process, LRU-bounded map of session ID -> ScheduleSession."""
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._sessions: "OrderedDict[str, ScheduleSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(
+        self,
+        tasks: List[Dict[str, Any]],
+        views: Optional[List[str]] = None,
+        aoa: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Full CPM analysis that also keeps the schedule for later deltas."""
+        views = _resolve_views(views)
+        aoa = _resolve_aoa(aoa)
+        graph, _ = ingest_tasks(tasks, "cpm")
+        if graph.typed:
+            raise ValueError("Sessions support finish-to-start dependencies only")
+        result, times = _schedule_from_graph(graph, views, aoa)
+        session_id = self._put(ScheduleSession(graph, *times))
+        result["session"] = {"id": session_id, "version": 1}
+        return result
+
+    def get(self, session_id: str) -> ScheduleSession:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise SessionNotFound(session_id)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def _put(self, session: ScheduleSession) -> str:
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.capacity:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def apply(self, session_id: str, version: Any, changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        session = self.get(session_id)
+        with session.lock:
+            if version != session.version:
+                raise SessionVersionConflict(session.version, version)
+            rows = session.apply(changes)
+            return {
+                "session": {"id": session_id, "version": session.version},
+                "project_duration": session.project_duration,
+                "tasks": rows,
+            }
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from services.calendars import add_dates
+from services.metrics import PhaseRecorder, start_recording, stop_recording
+from services.offload import AnalysisPool, PoolBusy, WorkerCrashed
+from services.scheduling import ScheduleValidationError, analyze_cpm, analyze_pert
+
+
+# Phase (see services.metrics) -> (reported stage, percent complete when it starts).
+STAGES = {
+    "ingest": ("validate", 0),
+    "topo_sort": ("topo", 10),
+    "fb_pass": ("pass", 20),
+    "aoa": ("aoa", 35),
+    "activities": ("activities", 35),
+    "aon": ("aon", 65),
+    "simulation": ("simulation", 75),
+}
+# Percent at which a phase that reports its own progress (the simulation) ends.
+STAGE_END = 99
+
+
+class JobNotFound(Exception):
+    pass
+
+
+# ── Jobs ──────────────────────────────────────────────────────────────────────
+
+class Job:
+    """
+    One submitted analysis. `version` goes up on every visible change so
+    pollers and event streams can tell whether anything happened.
+    """
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = "queued"
+        self.stage: Optional[str] = None
+        self.percent = 0
+        self.version = 0
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        # Final response body (JSON bytes) and its status code, set once the job ends.
+        self.body: Optional[bytes] = None
+        self.code: Optional[int] = None
+        self.etag: Optional[str] = None
+        # Seconds to wait before resubmitting, when the offload pool turned the job away.
+        self.retry_after: Optional[int] = None
+        self._span = (0, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "percent": self.percent,
+            "version": self.version,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+class _JobRecorder(PhaseRecorder):
+    """Phase recorder that turns the analysis phases into job stage/percent updates."""
+
+    def __init__(self, store: "JobStore", job: Job):
+        super().__init__()
+        self.store = store
+        self.job = job
+
+    def begin(self, name: str):
+        stage = STAGES.get(name)
+        if stage is not None:
+            label, start = stage
+            later = [s for _, s in STAGES.values() if s > start]
+            # A job waiting for an offload worker stays queued until its first phase.
+            self.store._update(
+                self.job, status="running", stage=label, percent=start, span=(start, min(later, default=STAGE_END)),
+            )
+
+    def progress(self, fraction: float):
+        low, high = self.job._span
+        self.store._update(self.job, percent=low + int((high - low) * min(max(fraction, 0.0), 1.0)))
+
+
+def analysis_job(
+    tasks: List[Dict[str, Any]],
+    mode: str,
+    project_start: str,
+    simulation: Optional[Dict[str, Any]] = None,
+    views: Optional[List[str]] = None,
+    aoa: Optional[str] = None,
+    calendars: Any = None,
+) -> Dict[str, Any]:
+    """The /api/analyze result of a job; module-level so it can run in an offload worker."""
+    if mode == "pert":
+        result = analyze_pert(tasks, simulation=simulation, views=views, aoa=aoa)
+    else:
+        result = analyze_cpm(tasks, views=views, aoa=aoa)
+    result["project_start"] = project_start
+    if calendars is not None:
+        result = add_dates(result, tasks, project_start, calendars)
+    return result
+
+
+# ── Job Store ─────────────────────────────────────────────────────────────────
+
+class JobStore:
+    """
+    In-process job registry. Jobs are handed to the offload `pool`, so they
+    share its worker limit and queue with /api/analyze; without a pool they
+    run in this process. Up to `workers` jobs are handed over at a time, at
+    most `max_active` may be queued or running (more raise PoolBusy), and the
+    `capacity` most recently finished jobs are kept for their results.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[AnalysisPool] = None,
+        workers: int = 2,
+        max_active: int = 32,
+        capacity: int = 64,
+    ):
+        self.pool = pool
+        self.max_active = max_active
+        self.capacity = capacity
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active = 0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpm-job")
+
+    def submit(self, fn: Callable[..., Dict[str, Any]], args: tuple = (), kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue module-level `fn(*args, **kwargs)` (returning the result dict) and return the new job's snapshot."""
+        with self._cond:
+            if self._active >= self.max_active:
+                raise PoolBusy(retry_after=5)
+            self._active += 1
+            job = Job(uuid.uuid4().hex)
+            self._jobs[job.id] = job
+            snapshot = job.snapshot()
+        self._executor.submit(self._run, job, fn, args, kwargs or {})
+        return snapshot
+
+    def _run(self, job: Job, fn: Callable[..., Dict[str, Any]], args: tuple, kwargs: Dict[str, Any]):
+        recorder = _JobRecorder(self, job)
+        try:
+            if self.pool is not None:
+                result = self.pool.run(fn, args, kwargs, recorder=recorder)
+            else:
+                start_recording(recorder)
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    stop_recording()
+            body, code = {"ok": True, "result": result}, 200
+        except ScheduleValidationError as e:
+            body, code = {"ok": False, "error": "Validation Failed", "validation_errors": e.errors}, 400
+        except (PoolBusy, WorkerCrashed) as e:
+            # The pool's backpressure, as /api/analyze reports it.
+            job.retry_after = e.retry_after
+            body, code = {"ok": False, "error": str(e), "retry_after": e.retry_after}, 429 if isinstance(e, PoolBusy) else 503
+        except Exception as e:
+            body, code = {"ok": False, "error": str(e)}, 400
+
+        data = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with self._cond:
+            job.body, job.code = data, code
+            job.etag = hashlib.sha256(data).hexdigest()[:32]
+            job.finished = time.time()
+            self._active -= 1
+            self._evict()
+        self._update(job, status="done" if code == 200 else "failed", percent=100)
+
+    def _update(self, job: Job, status=None, stage=None, percent=None, span=None):
+        with self._cond:
+            changed = False
+            if status is not None and status != job.status:
+                job.status, changed = status, True
+            if stage is not None and stage != job.stage:
+                job.stage, changed = stage, True
+            if span is not None:
+                job._span = span
+            # Percent never goes back, even if a stage repeats.
+            if percent is not None and percent > job.percent:
+                job.percent, changed = percent, True
+            if changed:
+                job.version += 1
+                self._cond.notify_all()
+
+    def _evict(self):
+        finished = [j for j in self._jobs.values() if j.finished is not None]
+        for job in finished[:max(0, len(finished) - self.capacity)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Job:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise JobNotFound(job_id)
+            return job
+
+    def snapshot(self, job_id: str) -> Dict[str, Any]:
+        with self._cond:
+            return self.get(job_id).snapshot()
+
+    def events(self, job_id: str, keepalive: float = 15.0) -> Iterator[str]:
+        """
+        Server-Sent Events for one job: a `progress` event per change, then a
+        final `done` or `failed` event. Comments keep idle connections open.
+        """
+        # Looked up now, so an unknown ID raises here rather than mid-response.
+        return self._stream(self.get(job_id), keepalive)
+
+    def _stream(self, job: Job, keepalive: float) -> Iterator[str]:
+        seen = -1
+        while True:
+            with self._cond:
+                if job.version == seen:
+                    self._cond.wait_for(lambda: job.version != seen, timeout=keepalive)
+                if job.version == seen:
+                    snapshot = None
+                else:
+                    snapshot = job.snapshot()
+                    seen = job.version
+            if snapshot is None:
+                yield ": keepalive\n\n"
+                continue
+            kind = snapshot["status"] if snapshot["status"] in ("done", "failed") else "progress"
+            yield f"id: {snapshot['version']}\nevent: {kind}\ndata: {json.dumps(snapshot)}\n\n"
+            if kind != "progress":
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"jobs": len(self._jobs), "active": self._active, "max_active": self.max_active}
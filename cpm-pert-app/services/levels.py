@@ -0,0 +1,166 @@
+from array import array
+from typing import List
+
+import numpy as np
+
+from services.graph import FROM_START, TO_FINISH, TaskGraph
+
+
+# Below this many tasks per level on average, the per-level NumPy calls cost
+# more than the pure-Python loops save and `level_pass` declines.
+MIN_LEVEL_WIDTH = 16
+
+
+# ── Level Plan ────────────────────────────────────────────────────────────────
+
+class LevelPlan:
+    """
+    Topological levels of a task graph as NumPy gather/reduce arrays.
+
+    Level 0 holds the tasks without predecessors; every other task sits one
+    level above its deepest predecessor, so all tasks of a level can be
+    computed together once the lower levels are done. For each level the
+    predecessor (forward) and successor (backward) indices are laid out
+    contiguously per task, ready for ``np.maximum.reduceat`` /
+    ``np.minimum.reduceat`` along the task axis. Typed graphs also get, per
+    level, each edge's task, relation flags and lag (`forward_relations`,
+    `backward_relations`).
+    """
+
+    def __init__(self, graph: TaskGraph, levels: List[np.ndarray]):
+        pred_off = np.frombuffer(graph.pred_off, dtype=np.int64)
+        pred_idx = np.frombuffer(graph.pred_idx, dtype=np.int64)
+        succ_off = np.frombuffer(graph.succ_off, dtype=np.int64)
+        succ_idx = np.frombuffer(graph.succ_idx, dtype=np.int64)
+        has_succs = np.diff(succ_off) > 0
+
+        self.n = len(graph)
+        self.levels = levels
+        self.sinks = np.flatnonzero(~has_succs)
+        self.typed = graph.typed
+        forward = [_segments(tasks, pred_off, pred_idx) for tasks in levels[1:]]
+        backward = [_segments(tasks[has_succs[tasks]], succ_off, succ_idx) for tasks in reversed(levels)]
+        self.forward = [segment[:3] for segment in forward]
+        self.backward = [segment[:3] for segment in backward]
+        if self.typed:
+            self.forward_relations = [_relations(segment, graph.pred_type, graph.pred_lag) for segment in forward]
+            self.backward_relations = [_relations(segment, graph.succ_type, graph.succ_lag) for segment in backward]
+
+    @classmethod
+    def from_topology(cls, graph: TaskGraph, topology) -> "LevelPlan":
+        """Plan from a known topological order, whatever the depth of the graph."""
+        level = [0] * len(graph)
+        for i in topology:
+            level[i] = max(map(level.__getitem__, graph.preds(i)), default=-1) + 1
+        level = np.asarray(level, dtype=np.int64)
+        order = np.argsort(level, kind="stable")
+        bounds = np.searchsorted(level[order], np.arange(level.max(initial=0) + 2))
+        return cls(graph, [order[bounds[k]:bounds[k + 1]] for k in range(len(bounds) - 1)])
+
+
+def _segments(tasks, off, idx):
+    """(tasks, concatenated neighbours, segment starts, edge positions) for a reduceat over `tasks`."""
+    counts = off[tasks + 1] - off[tasks]
+    starts = np.zeros(len(tasks), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    positions = np.arange(counts.sum()) + np.repeat(off[tasks] - starts, counts)
+    return tasks, idx[positions], starts, positions
+
+
+def _relations(segment, types, lags):
+    """(owning task, from-start flags, to-finish flags, lags) of each edge in a segment."""
+    tasks, _, starts, positions = segment
+    codes = np.frombuffer(types, dtype=np.int8)[positions]
+    owner = np.repeat(tasks, np.diff(np.append(starts, len(positions))))
+    return owner, (codes & FROM_START) != 0, (codes & TO_FINISH) != 0, np.frombuffer(lags, dtype=np.float64)[positions]
+
+
+# ── Level-Synchronous Pass ────────────────────────────────────────────────────
+
+def levels_from_bounds(order: array, bounds: array) -> List[np.ndarray]:
+    """Split the output of `TaskGraph.topological_levels` into one index array per level."""
+    tasks = np.frombuffer(order, dtype=np.int64)
+    return [tasks[bounds[k]:bounds[k + 1]] for k in range(len(bounds) - 1)]
+
+
+def level_times(plan: LevelPlan, durations: np.ndarray):
+    """
+    ES/EF/LS/LF for `durations` of shape (tasks,) or (tasks, columns), every
+    column an independent schedule. Returns ``(es, ef, ls, lf, finish)`` with
+    `finish` the project duration (per column).
+
+    Max, min and a single addition or subtraction per task are exact in any
+    order, so every column equals the pure-Python pass bit for bit.
+    """
+    if plan.typed:
+        return _relation_times(plan, durations)
+    es = np.zeros_like(durations)
+    ef = np.empty_like(durations)
+    first = plan.levels[0]
+    ef[first] = durations[first]
+    for tasks, gather, starts in plan.forward:
+        es[tasks] = np.maximum.reduceat(ef[gather], starts, axis=0)
+        ef[tasks] = es[tasks] + durations[tasks]
+    finish = ef.max(axis=0, initial=0.0)
+
+    lf = np.empty_like(durations)
+    ls = np.empty_like(durations)
+    lf[plan.sinks] = finish
+    ls[plan.sinks] = finish - durations[plan.sinks]
+    for tasks, gather, starts in plan.backward:
+        if len(tasks):
+            lf[tasks] = np.minimum.reduceat(ls[gather], starts, axis=0)
+            ls[tasks] = lf[tasks] - durations[tasks]
+    return es, ef, ls, lf, finish
+
+
+def _relation_times(plan: LevelPlan, durations: np.ndarray):
+    """`level_times` for typed dependencies, with the arithmetic of `_relation_pass`."""
+    # Per-edge values broadcast against the columns of a 2-D `durations`.
+    shape = (-1,) + (1,) * (durations.ndim - 1)
+    es = np.zeros_like(durations)
+    ef = np.empty_like(durations)
+    first = plan.levels[0]
+    ef[first] = durations[first]
+    for (tasks, gather, starts), (owner, from_start, to_finish, lag) in zip(plan.forward, plan.forward_relations):
+        bound = np.where(from_start.reshape(shape), es[gather], ef[gather]) + lag.reshape(shape)
+        bound -= np.where(to_finish.reshape(shape), durations[owner], 0.0)
+        es[tasks] = np.maximum(np.maximum.reduceat(bound, starts, axis=0), 0.0)
+        ef[tasks] = es[tasks] + durations[tasks]
+    finish = ef.max(axis=0, initial=0.0)
+
+    lf = np.empty_like(durations)
+    ls = np.empty_like(durations)
+    lf[plan.sinks] = finish
+    ls[plan.sinks] = finish - durations[plan.sinks]
+    for (tasks, gather, starts), (owner, from_start, to_finish, lag) in zip(plan.backward, plan.backward_relations):
+        if len(tasks):
+            bound = np.where(to_finish.reshape(shape), lf[gather], ls[gather]) - lag.reshape(shape)
+            bound += np.where(from_start.reshape(shape), durations[owner], 0.0)
+            lf[tasks] = np.minimum(np.minimum.reduceat(bound, starts, axis=0), finish)
+            ls[tasks] = lf[tasks] - durations[tasks]
+    return es, ef, ls, lf, finish
+
+
+def level_pass(graph: TaskGraph, order: array, bounds: array):
+    """
+    `level_times` for the graph's own durations, given the levels from
+    `TaskGraph.topological_levels`. Returns ``(es, ef, ls, lf,
+    project_duration)`` as float arrays, or None when the graph is too deep
+    (or its durations not finite) for this to pay off.
+    """
+    n = len(graph)
+    if len(bounds) - 1 > n // MIN_LEVEL_WIDTH:
+        return None
+    dur = np.frombuffer(graph.dur, dtype=np.float64)
+    if not np.isfinite(dur).all():
+        return None
+    plan = LevelPlan(graph, levels_from_bounds(order, bounds))
+    es, ef, ls, lf, finish = level_times(plan, dur)
+    return _to_array(es), _to_array(ef), _to_array(ls), _to_array(lf), float(finish)
+
+
+def _to_array(values: np.ndarray) -> array:
+    out = array("d")
+    out.frombytes(values.tobytes())
+    return out
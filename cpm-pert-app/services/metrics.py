@@ -0,0 +1,150 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+
+# ── Phase Recording ───────────────────────────────────────────────────────────
+
+class PhaseRecorder:
+    """Per-request phase durations (seconds, summed per name) and sizes, in first-seen order."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        self.begin(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def begin(self, name: str):
+        """A phase has begun, for recorders that report progress (see services.jobs)."""
+
+    def progress(self, fraction: float):
+        """Completion of the current phase, for recorders that report progress (see services.jobs)."""
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value: one entry per phase in ms, sizes as descriptions."""
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.phases.items()]
+        entries += [f'{name};desc="{value}"' for name, value in self.sizes.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.3f}")
+        return ", ".join(entries)
+
+
+_recorder: ContextVar[Optional[PhaseRecorder]] = ContextVar("phase_recorder", default=None)
+_NOOP = nullcontext()
+
+
+def phase(name: str):
+    """Time a block into the current request's recorder; a shared no-op when none is active."""
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NOOP
+    return recorder.phase(name)
+
+
+def record_size(name: str, value: int):
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.sizes[name] = value
+
+
+def progress(fraction: float):
+    """Report how far the current phase has got (0..1); a no-op outside a recorder."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.progress(fraction)
+
+
+def start_recording(recorder: Optional[PhaseRecorder] = None) -> PhaseRecorder:
+    recorder = recorder or PhaseRecorder()
+    _recorder.set(recorder)
+    return recorder
+
+
+def stop_recording():
+    _recorder.set(None)
+
+
+# ── Aggregation ───────────────────────────────────────────────────────────────
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for k, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[k] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Process-wide latency histograms per (endpoint, phase) and per endpoint,
+    plus running totals of the recorded sizes. `render` produces the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._phases: Dict[Tuple[str, str], _Histogram] = {}
+        self._requests: Dict[str, _Histogram] = {}
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, recorder: PhaseRecorder):
+        elapsed = recorder.elapsed()
+        with self._lock:
+            for name, seconds in recorder.phases.items():
+                self._phases.setdefault((endpoint, name), _Histogram()).observe(seconds)
+            self._requests.setdefault(endpoint, _Histogram()).observe(elapsed)
+            for name, value in recorder.sizes.items():
+                self._sizes[name] = self._sizes.get(name, 0) + value
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            lines.append("# HELP cpm_request_seconds Request latency by endpoint.")
+            lines.append("# TYPE cpm_request_seconds histogram")
+            for endpoint, hist in sorted(self._requests.items()):
+                lines += _histogram_lines("cpm_request_seconds", f'endpoint="{endpoint}"', hist)
+            lines.append("# HELP cpm_phase_seconds Time spent per analysis phase.")
+            lines.append("# TYPE cpm_phase_seconds histogram")
+            for (endpoint, name), hist in sorted(self._phases.items()):
+                lines += _histogram_lines("cpm_phase_seconds", f'endpoint="{endpoint}",phase="{name}"', hist)
+            lines.append("# HELP cpm_items_total Tasks, edges, dummies and AoA nodes processed.")
+            lines.append("# TYPE cpm_items_total counter")
+            for name, value in sorted(self._sizes.items()):
+                lines.append(f'cpm_items_total{{kind="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: str, labels: str, hist: _Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS, hist.counts):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {hist.count}')
+    lines.append(f"{metric}_sum{{{labels}}} {hist.total}")
+    lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+    return lines
@@ -0,0 +1,257 @@
+import atexit
+import math
+import multiprocessing
+import multiprocessing.util
+import select
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from services.metrics import PhaseRecorder, start_recording, stop_recording
+from services.scheduling import ScheduleValidationError
+
+
+# How often a waiting request checks its deadline and whether the client is still there.
+POLL_SECONDS = 0.1
+
+
+class PoolBusy(Exception):
+    """Every worker is busy and the wait queue is full; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__("Analysis queue is full")
+
+
+class WorkerCrashed(Exception):
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__("Analysis worker stopped unexpectedly")
+
+
+class AnalysisTimeout(Exception):
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        super().__init__(f"Analysis did not finish within {seconds:g} seconds")
+
+
+class AnalysisCancelled(Exception):
+    pass
+
+
+# ── Worker Process ────────────────────────────────────────────────────────────
+
+class _PipeRecorder(PhaseRecorder):
+    """Forwards phase starts and progress to the parent, ahead of the job's reply."""
+
+    def __init__(self, conn):
+        super().__init__()
+        self.conn = conn
+
+    def begin(self, name: str):
+        self.conn.send(("phase", name))
+
+    def progress(self, fraction: float):
+        self.conn.send(("progress", fraction))
+
+
+def _serve(conn):
+    """Worker loop: run (function, args, kwargs, report progress) jobs until the pipe closes."""
+    while True:
+        try:
+            fn, args, kwargs, report = conn.recv()
+        except (EOFError, OSError):
+            return
+        if report:
+            start_recording(_PipeRecorder(conn))
+        try:
+            reply = ("ok", fn(*args, **kwargs))
+        except ScheduleValidationError as e:
+            # Sent as the error list: the exception itself does not survive pickling.
+            reply = ("invalid", e.errors)
+        except Exception as e:
+            reply = ("error", str(e))
+        finally:
+            stop_recording()
+        conn.send(reply)
+
+
+class _Worker:
+    __slots__ = ("process", "conn")
+
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        # Not a daemon, so the analyses it runs may start their own simulation pools.
+        self.process = context.Process(target=_serve, args=(child,), name="cpm-analysis-worker")
+        self.process.start()
+        child.close()
+
+    def stop(self):
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=1)
+
+
+# ── Analysis Pool ─────────────────────────────────────────────────────────────
+
+class AnalysisPool:
+    """
+    Up to `workers` long-lived spawned processes that run analyses off the
+    request thread. A request that finds every worker busy waits in a queue of
+    at most `max_queue` requests; beyond that `run` raises PoolBusy at once.
+
+    A job that times out or whose caller goes away is stopped by terminating
+    its worker, which is replaced on demand, so other jobs are unaffected.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, int(workers))
+        self.max_queue = max(0, int(max_queue))
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: List[_Worker] = []
+        self._all: Set[_Worker] = set()
+        self._live = 0
+        self._busy = 0
+        self._waiting = 0
+        # Running average of job seconds, for Retry-After estimates.
+        self._average = 1.0
+        self._cond = threading.Condition()
+        # multiprocessing joins non-daemon children at exit; it is imported above so its
+        # exit hook is registered first and runs last, after the workers are stopped.
+        atexit.register(self.shutdown)
+
+    def run(
+        self,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+        recorder: Optional[PhaseRecorder] = None,
+    ) -> Any:
+        """
+        Call module-level `fn(*args, **kwargs)` in a worker and return its result.
+        `timeout` covers queueing and running. `cancelled` is polled while waiting.
+        The worker's phase starts and progress are passed on to `recorder`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        worker = self._acquire(deadline, timeout, cancelled)
+        started = time.monotonic()
+        try:
+            worker.conn.send((fn, args, kwargs or {}, recorder is not None))
+            while True:
+                if worker.conn.poll(POLL_SECONDS):
+                    status, payload = worker.conn.recv()
+                    if status == "phase":
+                        recorder.begin(payload)
+                    elif status == "progress":
+                        recorder.progress(payload)
+                    else:
+                        break
+                elif not worker.process.is_alive():
+                    raise WorkerCrashed(self._retry_after())
+                if cancelled is not None and cancelled():
+                    raise AnalysisCancelled()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise AnalysisTimeout(timeout)
+        except (EOFError, OSError):
+            self._discard(worker)
+            raise WorkerCrashed(self._retry_after())
+        except BaseException:
+            self._discard(worker)
+            raise
+        self._release(worker, time.monotonic() - started)
+
+        if status == "invalid":
+            raise ScheduleValidationError(payload)
+        if status == "error":
+            raise ValueError(payload)
+        return payload
+
+    def _acquire(self, deadline, timeout, cancelled) -> _Worker:
+        with self._cond:
+            if not self._idle and self._live >= self.workers:
+                if self._waiting >= self.max_queue:
+                    raise PoolBusy(self._retry_after())
+                self._waiting += 1
+                try:
+                    while not self._idle and self._live >= self.workers:
+                        if cancelled is not None and cancelled():
+                            raise AnalysisCancelled()
+                        if deadline is not None and time.monotonic() >= deadline:
+                            raise AnalysisTimeout(timeout)
+                        self._cond.wait(POLL_SECONDS)
+                finally:
+                    self._waiting -= 1
+            self._busy += 1
+            if self._idle:
+                return self._idle.pop()
+            self._live += 1
+        # Started outside the lock: spawning takes a while and must not hold up the others.
+        try:
+            worker = _Worker(self._context)
+        except BaseException:
+            with self._cond:
+                self._live -= 1
+                self._busy -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._all.add(worker)
+        return worker
+
+    def _release(self, worker: _Worker, seconds: float):
+        with self._cond:
+            self._busy -= 1
+            self._average += 0.2 * (seconds - self._average)
+            self._idle.append(worker)
+            self._cond.notify()
+
+    def _discard(self, worker: _Worker):
+        worker.stop()
+        with self._cond:
+            self._all.discard(worker)
+            self._busy -= 1
+            self._live -= 1
+            self._cond.notify()
+
+    def _retry_after(self) -> int:
+        """Seconds until the queue has likely drained by one worker's worth of jobs."""
+        return max(1, math.ceil(self._average * (self._waiting + self._busy) / self.workers))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "live": self._live,
+                "busy": self._busy,
+                "waiting": self._waiting,
+                "max_queue": self.max_queue,
+            }
+
+    def shutdown(self):
+        """Stop every worker, busy ones included (their callers see WorkerCrashed)."""
+        with self._cond:
+            workers, self._all, self._idle = list(self._all), set(), []
+        for worker in workers:
+            worker.stop()
+
+
+# ── Client Disconnects ────────────────────────────────────────────────────────
+
+def client_disconnected(environ: Dict[str, Any]) -> bool:
+    """
+    True once the client has closed its connection. Looks at the raw socket the
+    Werkzeug and Gunicorn servers expose; other servers never report a disconnect.
+    """
+    sock = environ.get("werkzeug.socket") or environ.get("gunicorn.socket")
+    if sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        # A readable socket with nothing to read is one the peer has closed.
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b""
+    except (OSError, ValueError):
+        return True
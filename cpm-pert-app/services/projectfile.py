@@ -0,0 +1,267 @@
+import csv
+import mmap
+import struct
+import sys
+from array import array
+from typing import IO, Any, Dict, List, Optional, Sequence, TextIO
+
+import numpy as np
+
+from services.graph import TaskGraph
+from services.metrics import phase
+from services.scheduling import (
+    ScheduleValidationError,
+    _analyze_pert_graph,
+    _resolve_views,
+    _schedule_from_graph,
+    ingest_tasks,
+)
+
+
+# ── Binary Project Format ─────────────────────────────────────────────────────
+#
+#   magic "CPMP", u16 version, u16 flags, u64 task count n, u64 edge count e,
+#   u64 ID bytes, u64 name bytes                                  (40 bytes)
+#   pred_off i64[n + 1], pred_idx i64[e]      predecessor CSR (`TaskGraph`)
+#   succ_off i64[n + 1], succ_idx i64[e]      successor CSR
+#   duration f64[n]                           expected durations in PERT files
+#   optimistic, most_likely, pessimistic f64[n] each        (PERT files only)
+#   IDs, then names: UTF-8, NUL-separated; an empty name means "same as ID"
+#
+# Everything is little-endian and every array starts 8-byte aligned, so a
+# mapped file is used in place: the graph's arrays are views into the mapping.
+
+MAGIC = b"CPMP"
+FORMAT_VERSION = 1
+MIME_TYPE = "application/vnd.cpm.project"
+FLAG_PERT = 1
+HEADER = struct.Struct("<4sHHQQQQ")
+
+
+def read_header(file: IO[bytes]) -> Dict[str, Any]:
+    """Task/edge counts and mode of the project file `file` is positioned at."""
+    raw = file.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError("Not a project file")
+    magic, version, flags, tasks, edges, id_bytes, name_bytes = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("Not a project file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported project file version: {version}")
+    return {
+        "mode": "pert" if flags & FLAG_PERT else "cpm",
+        "tasks": tasks,
+        "edges": edges,
+        "id_bytes": id_bytes,
+        "name_bytes": name_bytes,
+    }
+
+
+def _size(header: Dict[str, Any]) -> int:
+    n, e = header["tasks"], header["edges"]
+    columns = 4 if header["mode"] == "pert" else 1
+    return HEADER.size + 8 * (2 * (n + 1) + 2 * e + columns * n) + header["id_bytes"] + header["name_bytes"]
+
+
+def _raw(values: Sequence, typecode: str) -> bytes:
+    data = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    if sys.byteorder == "big":
+        data = array(typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+
+def write_project(out: IO[bytes], graph: TaskGraph, estimates=None):
+    """Write `graph` (and the PERT `estimates` from `ingest_tasks`) to `out`."""
+    if graph.typed:
+        raise ValueError("Project files support finish-to-start dependencies only")
+    for tid, name in zip(graph.ids, graph.names):
+        if "\0" in tid or "\0" in name:
+            raise ValueError(f"Task IDs and names cannot contain NUL characters: {tid!r}")
+    id_blob = "\0".join(graph.ids).encode("utf-8")
+    name_blob = "\0".join("" if name == tid else name for tid, name in zip(graph.ids, graph.names)).encode("utf-8")
+    out.write(HEADER.pack(
+        MAGIC, FORMAT_VERSION, FLAG_PERT if estimates is not None else 0,
+        len(graph), graph.edge_count, len(id_blob), len(name_blob),
+    ))
+    for values in (graph.pred_off, graph.pred_idx, graph.succ_off, graph.succ_idx):
+        out.write(_raw(values, "q"))
+    out.write(_raw(graph.dur, "d"))
+    for column in estimates or ():
+        out.write(_raw(column, "d"))
+    out.write(id_blob)
+    out.write(name_blob)
+
+
+def load_project(path: str):
+    """
+    Memory-map a project file and return ``(graph, estimates)`` as `ingest_tasks`
+    would, with the CSR and duration arrays viewing the mapping (copy-on-write)
+    instead of being parsed. Only the ID and name lists are built in Python.
+    Raises ValueError for a malformed file and ScheduleValidationError for tasks
+    `ingest_tasks` would reject; dependency cycles are found by the passes.
+    """
+    with open(path, "rb") as file:
+        header = read_header(file)
+        size = file.seek(0, 2)
+        if size != _size(header):
+            raise ValueError("Corrupt project file: size does not match its header")
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    n, e = header["tasks"], header["edges"]
+    buffer = memoryview(mapping)
+    position = HEADER.size
+
+    def take(count: int, typecode: str):
+        nonlocal position
+        view = buffer[position:position + 8 * count]
+        position += 8 * count
+        if sys.byteorder == "big":
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast(typecode)
+
+    pred_off, pred_idx = take(n + 1, "q"), take(e, "q")
+    succ_off, succ_idx = take(n + 1, "q"), take(e, "q")
+    dur = take(n, "d")
+    estimates = tuple(take(n, "d") for _ in range(3)) if header["mode"] == "pert" else None
+    ids = _strings(buffer[position:position + header["id_bytes"]], n)
+    position += header["id_bytes"]
+    names = [name or tid for tid, name in zip(ids, _strings(buffer[position:], n))]
+
+    index = dict(zip(ids, range(n)))
+    graph = TaskGraph(ids, names, dur, pred_off, pred_idx, index, succ=(succ_off, succ_idx))
+    _check(graph, estimates)
+    return graph, estimates
+
+
+def _strings(view: memoryview, n: int) -> List[str]:
+    values = bytes(view).decode("utf-8").split("\0") if n else []
+    if len(values) != n:
+        raise ValueError("Corrupt project file: wrong number of task IDs or names")
+    return values
+
+
+def _check(graph: TaskGraph, estimates):
+    """Structural checks (ValueError) and the task checks of `ingest_tasks`, vectorized."""
+    n, e = len(graph), graph.edge_count
+    pred_off = np.frombuffer(graph.pred_off, dtype=np.int64)
+    pred_idx = np.frombuffer(graph.pred_idx, dtype=np.int64)
+    succ_off = np.frombuffer(graph.succ_off, dtype=np.int64)
+    succ_idx = np.frombuffer(graph.succ_idx, dtype=np.int64)
+    for off, idx in ((pred_off, pred_idx), (succ_off, succ_idx)):
+        if off[0] != 0 or off[-1] != e or (np.diff(off) < 0).any() or ((idx < 0) | (idx >= n)).any():
+            raise ValueError("Corrupt project file: dependency arrays out of range")
+    task = np.repeat(np.arange(n, dtype=np.int64), np.diff(pred_off))
+    source = np.repeat(np.arange(n, dtype=np.int64), np.diff(succ_off))
+    if not np.array_equal(np.sort(pred_idx * n + task), np.sort(source * n + succ_idx)):
+        raise ValueError("Corrupt project file: successor arrays do not match the predecessors")
+
+    ids = graph.ids
+    errors = [{"id": None, "msg": f"Row {i + 1} missing ID"} for i, tid in enumerate(ids) if not tid]
+    if len(graph.index) != n:
+        seen = set()
+        for tid in ids:
+            if tid and tid in seen:
+                errors.append({"id": tid, "msg": f"Duplicate ID: {tid}"})
+            seen.add(tid)
+    errors += [{"id": ids[t], "msg": "Self-dependency"} for t in task[pred_idx == task].tolist()]
+
+    dur = np.frombuffer(graph.dur, dtype=np.float64)
+    if estimates is None:
+        for t in np.flatnonzero(~(dur > 0)).tolist():
+            msg = "Duration must be a number" if np.isnan(dur[t]) else "Duration must be greater than zero"
+            errors.append({"id": ids[t], "msg": msg})
+    else:
+        o, m, p = (np.frombuffer(column, dtype=np.float64) for column in estimates)
+        positive = (o > 0) & (m > 0) & (p > 0)
+        for t in np.flatnonzero(~positive).tolist():
+            errors.append({"id": ids[t], "msg": "Optimistic, Most Likely and Pessimistic must all be greater than zero"})
+        for t in np.flatnonzero(positive & ~((o <= m) & (m <= p))).tolist():
+            errors.append({"id": ids[t], "msg": "Must satisfy: Optimistic ≤ Most Likely ≤ Pessimistic"})
+        if not errors and not np.array_equal(dur, (o + 4.0 * m + p) / 6.0):
+            raise ValueError("Corrupt project file: durations do not match the estimates")
+    if errors:
+        raise ScheduleValidationError(errors)
+
+
+# ── Analysis ──────────────────────────────────────────────────────────────────
+
+def analyze_project_file(
+    path: str,
+    simulation: Optional[Dict[str, Any]] = None,
+    views: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """`analyze_cpm` / `analyze_pert` (by the file's mode) of a mapped project file."""
+    views = _resolve_views(views)
+    with phase("ingest"):
+        graph, estimates = load_project(path)
+    if estimates is None:
+        result, _ = _schedule_from_graph(graph, views)
+        return result
+    if simulation is not None:
+        views.add("pert_stats")
+    return _analyze_pert_graph(graph, estimates, views, simulation)
+
+
+# ── JSON / CSV Conversion ─────────────────────────────────────────────────────
+
+def write_tasks(out: IO[bytes], tasks: List[Dict[str, Any]], mode: str = "cpm"):
+    """Validate JSON-shaped tasks like `analyze_*` does and write them as a project file."""
+    graph, estimates = ingest_tasks(tasks, mode)
+    write_project(out, graph, estimates)
+
+
+def project_tasks(graph: TaskGraph, estimates=None) -> List[Dict[str, Any]]:
+    """The project as the JSON task list /api/analyze takes."""
+    ids, names = graph.ids, graph.names
+    tasks = []
+    for i, tid in enumerate(ids):
+        task = {"id": tid, "name": names[i]}
+        if estimates is None:
+            task["duration"] = graph.dur[i]
+        else:
+            task["optimistic"] = estimates[0][i]
+            task["most_likely"] = estimates[1][i]
+            task["pessimistic"] = estimates[2][i]
+        task["dependencies"] = [ids[p] for p in graph.preds(i)]
+        tasks.append(task)
+    return tasks
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _predecessors(deps: List[str]) -> str:
+    """The `pr` cell that `services.importing.parse_predecessors` reads back as `deps`."""
+    if not deps:
+        return "-"
+    if all(len(d) == 1 and d.isalpha() and d.isascii() for d in deps):
+        return "".join(deps)
+    cell = ";".join(deps)
+    # A lone multi-letter ID would be split into letters without a separator.
+    return cell + ";" if len(deps) == 1 and cell.isalpha() and cell.isascii() else cell
+
+
+def write_csv(out: TextIO, graph: TaskGraph, estimates=None):
+    """The project in the data/*.csv format, with a name column."""
+    ids = graph.ids
+    for p in set(graph.pred_idx):
+        if any(c in ids[p] for c in ",; \t") or ids[p] == "-":
+            raise ValueError(f"Task ID cannot be written as a CSV predecessor: {ids[p]!r}")
+    writer = csv.writer(out, lineterminator="\n")
+    if estimates is None:
+        writer.writerow(["ac", "pr", "du", "name"])
+    else:
+        writer.writerow(["ac", "pr", "opt", "ml", "pess", "name"])
+    for i, tid in enumerate(ids):
+        name = graph.names[i]
+        row = [tid, _predecessors([ids[p] for p in graph.preds(i)])]
+        if estimates is None:
+            row.append(_number(graph.dur[i]))
+        else:
+            row += [_number(column[i]) for column in estimates]
+        row.append("" if name == tid else name)
+        writer.writerow(row)
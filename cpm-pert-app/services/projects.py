@@ -0,0 +1,298 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.cache import payload_key
+from services.scheduling import ScheduleValidationError
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    latest INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    project_start TEXT,
+    task_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    created REAL NOT NULL,
+    tasks BLOB NOT NULL,
+    PRIMARY KEY (project_id, version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results (
+    content_hash TEXT PRIMARY KEY,
+    code INTEGER NOT NULL,
+    created REAL NOT NULL,
+    body BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS projects_by_update ON projects (updated DESC);
+"""
+
+# zlib level for stored JSON: most of the size win at a fraction of the time of level 6+.
+COMPRESSION = 1
+
+
+class ProjectNotFound(Exception):
+    pass
+
+
+class ProjectVersionConflict(Exception):
+    def __init__(self, expected: int, got: Any):
+        self.expected = expected
+        super().__init__(f"Project is at version {expected}, got {got}")
+
+
+def _pack(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), COMPRESSION)
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def snapshot_hash(tasks: List[Dict[str, Any]], mode: str, project_start: Optional[str]) -> str:
+    """Content hash a snapshot's stored result is keyed by (see `services.cache.payload_key`)."""
+    return payload_key(tasks, mode, {"project_start": project_start})
+
+
+# ── Project Store ─────────────────────────────────────────────────────────────
+
+class ProjectStore:
+    """
+    SQLite-backed projects with numbered snapshots of their task lists.
+
+    Every save appends a snapshot (version 1, 2, ...); a save whose content is
+    unchanged returns the latest version instead. Analysis results are stored
+    once per content hash of (tasks, mode, project_start), as the serialized
+    /api/analyze body, so a reopened snapshot is served without recomputing
+    and identical snapshots share one result. Each thread gets its own
+    connection; WAL mode lets reads proceed while another thread writes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._db().executescript(SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+        return db
+
+    def create(self, name: str, tasks: List[Dict[str, Any]], mode: str, project_start: Optional[str]) -> Dict[str, Any]:
+        """New project with `tasks` as version 1; returns its metadata."""
+        project_id = uuid.uuid4().hex
+        now = time.time()
+        snapshot = _Snapshot(tasks, mode, project_start)
+        db = self._db()
+        with _transaction(db):
+            db.execute(
+                "INSERT INTO projects (id, name, created, updated, latest) VALUES (?, ?, ?, ?, 1)",
+                (project_id, name, now, now),
+            )
+            snapshot.insert(db, project_id, 1, now)
+        return self.info(project_id)
+
+    def save(
+        self,
+        project_id: str,
+        tasks: List[Dict[str, Any]],
+        mode: str,
+        project_start: Optional[str],
+        name: Optional[str] = None,
+        base_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Append a snapshot. With `base_version`, refuse (ProjectVersionConflict)
+        when someone else saved since that version was loaded.
+        """
+        now = time.time()
+        # Hashed and compressed before taking the write lock.
+        snapshot = _Snapshot(tasks, mode, project_start)
+        db = self._db()
+        with _transaction(db):
+            row = db.execute("SELECT latest FROM projects WHERE id = ?", (project_id,)).fetchone()
+            if row is None:
+                raise ProjectNotFound(project_id)
+            latest = row[0]
+            if base_version is not None and base_version != latest:
+                raise ProjectVersionConflict(latest, base_version)
+            current = db.execute(
+                "SELECT content_hash FROM snapshots WHERE project_id = ? AND version = ?",
+                (project_id, latest),
+            ).fetchone()
+            if current[0] != snapshot.digest:
+                latest += 1
+                snapshot.insert(db, project_id, latest, now)
+            db.execute(
+                "UPDATE projects SET latest = ?, updated = ?, name = COALESCE(?, name) WHERE id = ?",
+                (latest, now, name, project_id),
+            )
+        return self.info(project_id)
+
+    def info(self, project_id: str) -> Dict[str, Any]:
+        row = self._db().execute(
+            "SELECT p.id, p.name, p.created, p.updated, p.latest, s.mode, s.task_count"
+            " FROM projects p JOIN snapshots s ON s.project_id = p.id AND s.version = p.latest"
+            " WHERE p.id = ?",
+            (project_id,),
+        ).fetchone()
+        if row is None:
+            raise ProjectNotFound(project_id)
+        return _project_row(row)
+
+    def list(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Projects, most recently saved first."""
+        rows = self._db().execute(
+            "SELECT p.id, p.name, p.created, p.updated, p.latest, s.mode, s.task_count"
+            " FROM projects p JOIN snapshots s ON s.project_id = p.id AND s.version = p.latest"
+            " ORDER BY p.updated DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        ).fetchall()
+        return [_project_row(row) for row in rows]
+
+    def versions(self, project_id: str) -> List[Dict[str, Any]]:
+        db = self._db()
+        rows = db.execute(
+            "SELECT s.version, s.mode, s.project_start, s.task_count, s.content_hash, s.created,"
+            " r.content_hash IS NOT NULL"
+            " FROM snapshots s LEFT JOIN results r ON r.content_hash = s.content_hash"
+            " WHERE s.project_id = ? ORDER BY s.version",
+            (project_id,),
+        ).fetchall()
+        if not rows:
+            raise ProjectNotFound(project_id)
+        return [
+            {"version": v, "mode": mode, "project_start": start, "task_count": count,
+             "content_hash": digest, "created": created, "has_result": bool(stored)}
+            for v, mode, start, count, digest, created, stored in rows
+        ]
+
+    def load(self, project_id: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """One snapshot (latest by default) with its task list."""
+        row = self._snapshot(project_id, version, "s.tasks")
+        version, mode, project_start, digest, tasks = row
+        return {"version": version, "mode": mode, "project_start": project_start,
+                "content_hash": digest, "tasks": _unpack(tasks)}
+
+    def _snapshot(self, project_id: str, version: Optional[int], columns: str) -> tuple:
+        db = self._db()
+        if version is None:
+            row = db.execute(
+                f"SELECT s.version, s.mode, s.project_start, s.content_hash, {columns}"
+                " FROM projects p JOIN snapshots s ON s.project_id = p.id AND s.version = p.latest"
+                " WHERE p.id = ?",
+                (project_id,),
+            ).fetchone()
+        else:
+            row = db.execute(
+                f"SELECT s.version, s.mode, s.project_start, s.content_hash, {columns}"
+                " FROM snapshots s WHERE s.project_id = ? AND s.version = ?",
+                (project_id, version),
+            ).fetchone()
+        if row is None:
+            raise ProjectNotFound(project_id)
+        return row
+
+    def result(
+        self,
+        project_id: str,
+        version: Optional[int],
+        compute: Callable[[List[Dict[str, Any]], str, Optional[str]], Dict[str, Any]],
+    ) -> Tuple[bytes, int, str]:
+        """
+        (JSON body, status code, content hash) of a snapshot's analysis. A stored
+        result is returned as is; otherwise `compute(tasks, mode, project_start)`
+        runs and its outcome (a validation failure included) is stored.
+        """
+        _, _, _, digest, body, code = self._snapshot(
+            project_id, version,
+            "(SELECT body FROM results WHERE content_hash = s.content_hash),"
+            " (SELECT code FROM results WHERE content_hash = s.content_hash)",
+        )
+        if body is not None:
+            return zlib.decompress(body), code, digest
+
+        snapshot = self.load(project_id, version)
+        try:
+            outcome, code = {"ok": True, "result": compute(snapshot["tasks"], snapshot["mode"], snapshot["project_start"])}, 200
+        except ScheduleValidationError as e:
+            outcome, code = {"ok": False, "error": "Validation Failed", "validation_errors": e.errors}, 400
+        data = json.dumps(outcome, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._db().execute(
+            "INSERT OR REPLACE INTO results (content_hash, code, created, body) VALUES (?, ?, ?, ?)",
+            (digest, code, time.time(), zlib.compress(data, COMPRESSION)),
+        )
+        return data, code, digest
+
+    def delete(self, project_id: str):
+        db = self._db()
+        with _transaction(db):
+            if db.execute("DELETE FROM projects WHERE id = ?", (project_id,)).rowcount == 0:
+                raise ProjectNotFound(project_id)
+            # Results are shared by content, so only drop the ones no snapshot refers to any more.
+            db.execute(
+                "DELETE FROM results WHERE content_hash NOT IN (SELECT content_hash FROM snapshots)"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        db = self._db()
+        return {
+            "projects": db.execute("SELECT COUNT(*) FROM projects").fetchone()[0],
+            "snapshots": db.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0],
+            "results": db.execute("SELECT COUNT(*) FROM results").fetchone()[0],
+        }
+
+
+class _Snapshot:
+    """A task list ready to insert: content hash and compressed JSON."""
+
+    def __init__(self, tasks: List[Dict[str, Any]], mode: str, project_start: Optional[str]):
+        self.mode = mode
+        self.project_start = project_start
+        self.task_count = len(tasks)
+        self.digest = snapshot_hash(tasks, mode, project_start)
+        self.blob = _pack(tasks)
+
+    def insert(self, db: sqlite3.Connection, project_id: str, version: int, now: float):
+        db.execute(
+            "INSERT INTO snapshots (project_id, version, mode, project_start, task_count, content_hash, created, tasks)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (project_id, version, self.mode, self.project_start, self.task_count, self.digest, now, self.blob),
+        )
+
+
+def _project_row(row) -> Dict[str, Any]:
+    project_id, name, created, updated, latest, mode, count = row
+    return {"id": project_id, "name": name, "created": created, "updated": updated,
+            "version": latest, "mode": mode, "task_count": count}
+
+
+class _transaction:
+    """BEGIN IMMEDIATE ... COMMIT / ROLLBACK on an autocommit connection."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, kind, value, traceback):
+        self.db.execute("COMMIT" if kind is None else "ROLLBACK")
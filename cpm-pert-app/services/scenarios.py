@@ -0,0 +1,159 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+from services.levels import LevelPlan, level_times, levels_from_bounds
+from services.metrics import phase, record_size
+from services.scheduling import ScheduleValidationError, _cycle_error, ingest_tasks
+
+
+# Upper bound on tasks x scenarios per evaluated block (~4 MB per float64
+# matrix; the pass keeps five of them alive at once).
+BLOCK_ELEMENTS = 500_000
+# Upper bound on tasks x scenarios slack values in one result. Everything else
+# is reduced block by block; per-task slack is returned in full, so a larger
+# sweep has to ask for `slack=False`.
+MAX_SLACK_VALUES = 10_000_000
+
+
+# ── Scenario Overrides ────────────────────────────────────────────────────────
+
+def _scenario_overrides(graph, scenarios: List[Any]):
+    """
+    Parse every scenario's overrides into (rows, durations, rows, factors)
+    arrays. A scenario sets absolute `durations` and/or multiplies durations
+    by `scale`, both as {task ID: number}; `scale` applies on top of
+    `durations`. Raises ScheduleValidationError listing every bad override,
+    tagged with its scenario index.
+    """
+    index = graph.index
+    parsed = []
+    errors = []
+
+    for k, scenario in enumerate(scenarios):
+        if not isinstance(scenario, dict):
+            raise ValueError(f"Scenario {k} must be an object")
+        arrays = []
+        for key, label in (("durations", "Duration"), ("scale", "Scale")):
+            overrides = scenario.get(key) or {}
+            if not isinstance(overrides, dict):
+                raise ValueError(f"Scenario {k}: {key} must be an object of task ID -> number")
+            rows, values = [], []
+            for tid, raw in overrides.items():
+                if tid not in index:
+                    errors.append({"id": tid, "msg": f"Unknown task: {tid}", "scenario": k})
+                    continue
+                try:
+                    value = float(raw)
+                except (TypeError, ValueError):
+                    errors.append({"id": tid, "msg": f"{label} must be a number", "scenario": k})
+                    continue
+                if not value > 0:
+                    errors.append({"id": tid, "msg": f"{label} must be greater than zero", "scenario": k})
+                else:
+                    rows.append(index[tid])
+                    values.append(value)
+            arrays += [np.array(rows, dtype=np.int64), np.array(values, dtype=np.float64)]
+        parsed.append(tuple(arrays))
+
+    if errors:
+        raise ScheduleValidationError(errors)
+    return parsed
+
+
+def _duration_block(base, overrides, start: int, stop: int):
+    """
+    Columns `start` to `stop` of the tasks x (scenarios + 1) duration matrix:
+    the baseline durations as column 0, then one column per scenario.
+    """
+    block = np.repeat(base[:, None], stop - start, axis=1)
+    for column in range(max(start, 1), stop):
+        rows, durations, scaled, factors = overrides[column - 1]
+        durations_column = block[:, column - start]
+        durations_column[rows] = durations
+        durations_column[scaled] *= factors
+    return block
+
+
+# ── Scenario Sweep ────────────────────────────────────────────────────────────
+
+def analyze_scenarios(
+    tasks: List[Dict[str, Any]],
+    scenarios: List[Any],
+    mode: str = "cpm",
+    slack: bool = True,
+) -> Dict[str, Any]:
+    """
+    Evaluate many duration variants of one project together.
+
+    The project is validated and interned once (PERT projects use their
+    expected durations). Scenarios then go through the level-synchronous
+    forward/backward pass as blocks of duration columns, each built, evaluated
+    and reduced to its scenarios' results before the next, so at most
+    `BLOCK_ELEMENTS` tasks x scenarios values are held besides the result.
+    Each scenario reports its project duration, the tasks that became or
+    stopped being critical relative to the baseline (in topological order)
+    and, with `slack`, the slack of every task aligned with `ids`; tasks x
+    scenarios may then not exceed `MAX_SLACK_VALUES`. Times equal what
+    `analyze_cpm` gives for the same durations.
+    """
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("Scenarios must be a non-empty list")
+
+    with phase("ingest"):
+        graph, _ = ingest_tasks(tasks, mode)
+        overrides = _scenario_overrides(graph, scenarios)
+    n = len(graph)
+    if slack and n * len(scenarios) > MAX_SLACK_VALUES:
+        raise ValueError(
+            f"Too many slack values: {n} tasks x {len(scenarios)} scenarios exceeds {MAX_SLACK_VALUES}; "
+            f"send at most {max(1, MAX_SLACK_VALUES // n)} scenarios or turn slack off"
+        )
+    with phase("topo_sort"):
+        order, bounds = graph.topological_levels()
+    if len(order) != n:
+        raise _cycle_error(graph, order)
+
+    record_size("tasks", n)
+    record_size("scenarios", len(scenarios))
+    ids = graph.ids
+    results = []
+    with phase("scenarios"):
+        plan = LevelPlan(graph, levels_from_bounds(order, bounds))
+        topology = np.frombuffer(order, dtype=np.int64)
+        base = np.frombuffer(graph.dur, dtype=np.float64)
+        columns = len(scenarios) + 1
+        step = max(1, BLOCK_ELEMENTS // max(1, n))
+        for start in range(0, columns, step):
+            stop = min(start + step, columns)
+            es, _, ls, _, finish = level_times(plan, _duration_block(base, overrides, start, stop))
+            ls -= es
+            # Rows in topological order, so changed tasks come out in that order.
+            critical = np.abs(ls[topology]) < 1e-6
+            if start == 0:
+                baseline_duration = float(finish[0])
+                baseline_critical = critical[:, 0].copy()
+            changed = critical != baseline_critical[:, None]
+            for column in range(max(start, 1), stop):
+                c = column - start
+                ranks = np.flatnonzero(changed[:, c]).tolist()
+                now_critical = critical[:, c]
+                entry = {
+                    "name": scenarios[column - 1].get("name") or f"Scenario {column}",
+                    "project_duration": float(finish[c]),
+                    "delta": float(finish[c]) - baseline_duration,
+                    "critical_added": [ids[topology[r]] for r in ranks if now_critical[r]],
+                    "critical_removed": [ids[topology[r]] for r in ranks if not now_critical[r]],
+                }
+                if slack:
+                    entry["slack"] = ls[:, c].tolist()
+                results.append(entry)
+
+    return {
+        "ids": ids,
+        "baseline": {
+            "project_duration": baseline_duration,
+            "critical": [ids[i] for i in topology[baseline_critical]],
+        },
+        "scenarios": results,
+    }
@@ -1,7 +1,11 @@
 from statistics import NormalDist
 import math
+from array import array
 from collections import defaultdict, deque
-from typing import Dict, List, Set, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union, Any
+
+from services.graph import FROM_START, RELATION_TYPES, TO_FINISH, TaskGraph
+from services.metrics import phase, record_size
 
 class ScheduleValidationError(Exception):
     def __init__(self, errors: List[Dict[str, Any]]):
@@ -103,81 +107,471 @@ def validate_pert_fields(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return errors
 
 
+# ── Fused Ingest ──────────────────────────────────────────────────────────────
+
+PERT_FIELDS = ("optimistic", "most_likely", "pessimistic")
+
+
+def ingest_tasks(tasks: Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]], mode: str = "cpm"):
+    """
+    Validate, normalize and intern `tasks` in a single pass. `tasks` may also
+    be an iterator (e.g. parsed NDJSON lines), interned as it is consumed.
+
+    Raises ScheduleValidationError with exactly the errors, in the same order,
+    that `validate_common` followed by `validate_cpm_fields` /
+    `validate_pert_fields` report. Dependencies on tasks further down the list
+    are patched in once every ID is known.
+
+    Returns ``(graph, estimates)``. In PERT mode the graph durations are the
+    expected durations and `estimates` holds the (optimistic, most_likely,
+    pessimistic) arrays; in CPM mode `estimates` is None.
+    """
+    if isinstance(tasks, list):
+        if not tasks:
+            raise ValueError("Input must be a non-empty list of task objects")
+    elif not isinstance(tasks, Iterator):
+        raise ValueError("Wrong type of objects sent")
+
+    pert = mode == "pert"
+    structure_errors = []
+    reference_checks = []  # (task ID, dependency) whose ID had not been seen yet, or a self-dependency
+    field_errors = []
+
+    index: Dict[str, int] = {}
+    ids: List[str] = []
+    names: List[str] = []
+    dur = array("d")
+    estimates = (array("d"), array("d"), array("d")) if pert else None
+    pred_off = array("q", [0])
+    pred_idx = array("q")
+    forward: List[tuple] = []  # (position in pred_idx, dependency ID)
+    relations: Dict[int, tuple] = {}  # position in pred_idx -> (type code, lag), typed edges only
+
+    row = 0
+    for row, task in enumerate(tasks, start=1):
+        tid = task.get("id")
+        if not tid or not isinstance(tid, str):
+            structure_errors.append({"id": None, "msg": f"Row {row} missing ID"})
+            continue
+
+        if tid in index:
+            structure_errors.append({"id": tid, "msg": f"Duplicate ID: {tid}"})
+        else:
+            index[tid] = len(ids)
+        ids.append(tid)
+        names.append(task.get("name") or tid)
+
+        deps = task.get("dependencies")
+        if deps is not None and not isinstance(deps, list):
+            structure_errors.append({"id": tid, "msg": "Dependencies must be a list"})
+        elif deps:
+            checked = len(reference_checks)
+            try:
+                for dep in deps:
+                    if dep == tid or dep not in index:
+                        reference_checks.append((tid, dep))
+            except TypeError:
+                # Dependency objects are unhashable: take the typed path for this task.
+                del reference_checks[checked:]
+                deps = _typed_dependencies(tid, deps, len(pred_idx), relations, structure_errors)
+                for dep in deps:
+                    if dep == tid or dep not in index:
+                        reference_checks.append((tid, dep))
+            else:
+                if len(deps) > 1:
+                    deps = dict.fromkeys(deps)
+            for dep in deps:
+                k = index.get(dep)
+                if k is None:
+                    forward.append((len(pred_idx), dep))
+                    k = -1
+                pred_idx.append(k)
+        pred_off.append(len(pred_idx))
+
+        if pert:
+            raw = [task.get(k) for k in PERT_FIELDS]
+            values = (0.0, 0.0, 0.0)
+            missing = [k for k, v in zip(PERT_FIELDS, raw) if v is None]
+            if missing:
+                field_errors.append({"id": tid, "msg": f"PERT mode requires: {', '.join(missing)}"})
+            else:
+                try:
+                    o, m, p = float(raw[0]), float(raw[1]), float(raw[2])
+                except (TypeError, ValueError):
+                    field_errors.append({"id": tid, "msg": "PERT estimates must be numbers"})
+                else:
+                    if o <= 0 or m <= 0 or p <= 0:
+                        field_errors.append({"id": tid, "msg": "Optimistic, Most Likely and Pessimistic must all be greater than zero"})
+                    elif not (o <= m <= p):
+                        field_errors.append({"id": tid, "msg": "Must satisfy: Optimistic ≤ Most Likely ≤ Pessimistic"})
+                    values = (o, m, p)
+            for column, v in zip(estimates, values):
+                column.append(v)
+            dur.append((values[0] + 4.0 * values[1] + values[2]) / 6.0)
+        else:
+            d = 0.0
+            if "duration" not in task:
+                field_errors.append({"id": tid, "msg": "Missing duration"})
+            else:
+                try:
+                    d = float(task["duration"])
+                    if d <= 0:
+                        field_errors.append({"id": tid, "msg": "Duration must be greater than zero"})
+                except (TypeError, ValueError):
+                    field_errors.append({"id": tid, "msg": "Duration must be a number"})
+            dur.append(d)
+    if not row:
+        raise ValueError("Input must be a non-empty list of task objects")
+
+    errors = structure_errors
+    for tid, dep in reference_checks:
+        if dep == tid:
+            errors.append({"id": tid, "msg": "Self-dependency"})
+        elif dep not in index:
+            errors.append({"id": tid, "msg": f"Missing dependency: {dep}"})
+    errors += field_errors
+    if errors:
+        raise ScheduleValidationError(errors)
+
+    for position, dep in forward:
+        pred_idx[position] = index[dep]
+    typed = None
+    if relations:
+        codes = array("b", bytes(len(pred_idx)))
+        lags = array("d", bytes(8 * len(pred_idx)))
+        for position, (code, lag) in relations.items():
+            codes[position] = code
+            lags[position] = lag
+        typed = (codes, lags)
+    return TaskGraph(ids, names, dur, pred_off, pred_idx, index, relations=typed), estimates
+
+
+def _typed_dependencies(
+    tid: str,
+    deps: List[Any],
+    base: int,
+    relations: Dict[int, tuple],
+    errors: List[Dict[str, Any]],
+) -> List[str]:
+    """
+    Dependency IDs of a list mixing plain IDs and {"id", "type", "lag"} objects
+    (type FS/SS/FF/SF, default FS; lag in time units, default 0, may be
+    negative). Exact repeats are dropped; the (type code, lag) of every edge
+    that is not a plain FS is recorded in `relations` by its position, counted
+    from `base`. Malformed entries are reported in `errors` and skipped.
+    """
+    out: List[str] = []
+    seen = set()
+    for dep in deps:
+        code, lag = 0, 0.0
+        if isinstance(dep, dict):
+            kind, lag = dep.get("type", "FS"), dep.get("lag", 0)
+            dep = dep.get("id")
+            if not isinstance(kind, str) or kind.upper() not in RELATION_TYPES:
+                errors.append({"id": tid, "msg": f"Unknown dependency type: {kind}. Choose from: {', '.join(RELATION_TYPES)}"})
+                continue
+            code = RELATION_TYPES.index(kind.upper())
+            if isinstance(lag, bool) or not isinstance(lag, (int, float)) or not math.isfinite(lag):
+                errors.append({"id": tid, "msg": "Lag must be a number"})
+                continue
+            lag = float(lag)
+        if not isinstance(dep, str):
+            errors.append({"id": tid, "msg": "Dependencies must be task IDs or {id, type, lag} objects"})
+            continue
+        key = (dep, code, lag)
+        if key in seen:
+            continue
+        seen.add(key)
+        if code or lag:
+            relations[base + len(out)] = (code, lag)
+        out.append(dep)
+    return out
+
+
 # ── Core Algorithm ────────────────────────────────────────────────────────────
 
-def _forward_backward_pass(tasks: List[Dict[str, Any]]):
+def _cycle_error(graph: TaskGraph, topological_order: array) -> ScheduleValidationError:
     """
-    Topological sort + forward pass (ES/EF) + backward pass (LS/LF).
-    Returns activity times and graph relationships for use by both CPM and PERT.
+    Error for every task on a dependency cycle, given the partial order Kahn's
+    algorithm produced. Cyclic tasks are grouped into strongly connected
+    components; the lowest-indexed task of each one also gets `cycle`, an
+    ordered loop of task IDs through it where every task depends on the one
+    before it and the first depends on the last. The other tasks of the
+    component point at that task in their message.
     """
-    preds: Dict[str, Set[str]] = {t["id"]: set(t.get("dependencies", [])) for t in tasks}
-    succs: Dict[str, Set[str]] = defaultdict(set)
-    dur: Dict[str, float] = {t["id"]: float(t.get("duration", 0.0)) for t in tasks}
+    n = len(graph.ids)
+    processed = bytearray(n)
+    for i in topological_order:
+        processed[i] = 1
+    # Successors of unprocessed tasks are unprocessed too, so the search stays inside them.
+    components = _strongly_connected(graph, (i for i in range(n) if not processed[i]))
 
-    for task in tasks:
-        for pred in task.get("dependencies", []):
-            succs[pred].add(task["id"])
+    ids = graph.ids
+    errors: Dict[int, Dict[str, Any]] = {}
+    for component in components:
+        if len(component) == 1 and not _has_self_loop(graph, component[0]):
+            continue
+        loop = [ids[i] for i in _loop_through(graph, component)]
+        start = min(component)
+        for i in component:
+            errors[i] = {"id": ids[i], "msg": f"Cycle detected in dependencies (loop through {loop[0]})"}
+        errors[start] = {
+            "id": loop[0],
+            "msg": f"Cycle detected in dependencies: {' → '.join(loop + loop[:1])}",
+            "cycle": loop,
+        }
+    return ScheduleValidationError([errors[i] for i in sorted(errors)])
+
+
+def _strongly_connected(graph: TaskGraph, nodes: Iterable[int]) -> List[List[int]]:
+    """Iterative Tarjan over the successor CSR arrays, starting from each of `nodes`."""
+    n = len(graph.ids)
+    succ_off, succ_idx = graph.succ_off, graph.succ_idx
+    order = array("q", [-1]) * n
+    low = array("q", [0]) * n
+    on_stack = bytearray(n)
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+
+    for root in nodes:
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, succ_off[root])]
+        while work:
+            v, k = work[-1]
+            end = succ_off[v + 1]
+            while k < end:
+                w = succ_idx[k]
+                k += 1
+                if order[w] == -1:
+                    work[-1] = (v, k)
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, succ_off[w]))
+                    break
+                if on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == order[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+
+def _has_self_loop(graph: TaskGraph, i: int) -> bool:
+    return i in graph.succs(i)
 
-    in_degree: Dict[str, int] = {
-        taskId: len(preds[taskId]) for taskId in preds
-    }
-    queue: deque[str] = deque(sorted([
-        taskId
-        for taskId, depCount in in_degree.items()
-        if depCount == 0
-    ]))
-    topological_order: List[str] = []
 
+def _loop_through(graph: TaskGraph, component: List[int]) -> List[int]:
+    """Shortest loop through the lowest-indexed task of a cyclic component (BFS inside it)."""
+    start = min(component)
+    members = set(component)
+    succ_off, succ_idx = graph.succ_off, graph.succ_idx
+    parent = {start: -1}
+    queue = deque([start])
     while queue:
-        currentTaskId = queue.popleft()
-        topological_order.append(currentTaskId)
-
-        for dependentTaskId in succs[currentTaskId]:
-            in_degree[dependentTaskId] -= 1
-            if in_degree[dependentTaskId] == 0:
-                queue.append(dependentTaskId)
-
-    if len(topological_order) != len(tasks):
-        processed = set(topological_order)
-        cycle_ids = {t["id"] for t in tasks if t["id"] not in processed}
-        changed = True
-        while changed:
-            sinks = {tid for tid in cycle_ids if not (succs[tid] & cycle_ids)}
-            changed = bool(sinks)
-            cycle_ids -= sinks
-        raise ScheduleValidationError([
-            {"id": tid, "msg": "Cycle detected in dependencies"}
-            for tid in cycle_ids
-        ])
-
-    es: Dict[str, float] = {}
-    ef: Dict[str, float] = {}
-
-    for taskId in topological_order:
-        es[taskId] = max((ef[p] for p in preds[taskId]), default=0.0)
-        ef[taskId] = es[taskId] + dur[taskId]
-    project_duration = max(ef.values(), default=0.0)
-
-    ls: Dict[str, float] = {}
-    lf: Dict[str, float] = {}
-    for taskId in reversed(topological_order):
-        lf[taskId] = min((ls[s] for s in succs[taskId]), default=project_duration)
-        ls[taskId] = lf[taskId] - dur[taskId]
-
-    slack: Dict[str, float] = {taskId: ls[taskId] - es[taskId] for taskId in topological_order}
-    return es, ef, ls, lf, slack, project_duration, preds, succs, topological_order, dur
+        v = queue.popleft()
+        for k in range(succ_off[v], succ_off[v + 1]):
+            w = succ_idx[k]
+            if w == start:
+                loop = [v]
+                while parent[loop[-1]] != -1:
+                    loop.append(parent[loop[-1]])
+                loop.reverse()
+                return loop
+            if w in members and w not in parent:
+                parent[w] = v
+                queue.append(w)
+    raise AssertionError("component has no loop")
+
+
+# Graphs with at least this many tasks go through the NumPy level-synchronous
+# pass (services/levels.py) unless they are too deep for it to pay off.
+LEVEL_PASS_MIN_TASKS = 5_000
+
+
+def _forward_backward_pass(graph: TaskGraph):
+    """
+    Topological sort + forward pass (ES/EF) + backward pass (LS/LF).
+    Works on the interned graph; times are float arrays indexed like ``graph.ids``.
+    Returns activity times for use by both CPM and PERT.
+    """
+    ids = graph.ids
+    with phase("topo_sort"):
+        topological_order, level_bounds = graph.topological_levels()
+
+    if len(topological_order) != len(ids):
+        raise _cycle_error(graph, topological_order)
+
+    with phase("fb_pass"):
+        if len(ids) >= LEVEL_PASS_MIN_TASKS:
+            from services.levels import level_pass
+
+            times = level_pass(graph, topological_order, level_bounds)
+            if times is not None:
+                return (*times, topological_order)
+
+        if graph.typed:
+            return (*_relation_pass(graph, topological_order), topological_order)
+
+        n = len(ids)
+        dur = graph.dur
+        pred_off, pred_idx = graph.pred_off, graph.pred_idx
+        succ_off, succ_idx = graph.succ_off, graph.succ_idx
+
+        es = array("d", bytes(8 * n))
+        ef = array("d", bytes(8 * n))
+        for i in topological_order:
+            es[i] = max(map(ef.__getitem__, pred_idx[pred_off[i]:pred_off[i + 1]]), default=0.0)
+            ef[i] = es[i] + dur[i]
+        project_duration = max(ef, default=0.0)
+
+        ls = array("d", bytes(8 * n))
+        lf = array("d", bytes(8 * n))
+        for i in reversed(topological_order):
+            lf[i] = min(map(ls.__getitem__, succ_idx[succ_off[i]:succ_off[i + 1]]), default=project_duration)
+            ls[i] = lf[i] - dur[i]
+
+    return es, ef, ls, lf, project_duration, topological_order
+
+
+def _relation_pass(graph: TaskGraph, topological_order: array):
+    """
+    Forward/backward pass over typed dependencies with lags (precedence
+    diagramming). An edge p -> i of type XY with lag L requires
+    X(p) + L <= Y(i), X/Y being start (S) or finish (F). Tasks start no
+    earlier than 0 and finish no later than the project duration; every edge
+    is visited once per pass, so this stays linear.
+    """
+    n = len(graph.ids)
+    dur = graph.dur
+    pred_off, pred_idx, pred_type, pred_lag = graph.pred_off, graph.pred_idx, graph.pred_type, graph.pred_lag
+    succ_off, succ_idx, succ_type, succ_lag = graph.succ_off, graph.succ_idx, graph.succ_type, graph.succ_lag
+
+    es = array("d", bytes(8 * n))
+    ef = array("d", bytes(8 * n))
+    for i in topological_order:
+        start = 0.0
+        for k in range(pred_off[i], pred_off[i + 1]):
+            p, code = pred_idx[k], pred_type[k]
+            bound = (es[p] if code & FROM_START else ef[p]) + pred_lag[k]
+            if code & TO_FINISH:
+                bound -= dur[i]
+            if bound > start:
+                start = bound
+        es[i] = start
+        ef[i] = start + dur[i]
+    project_duration = max(ef, default=0.0)
+
+    ls = array("d", bytes(8 * n))
+    lf = array("d", bytes(8 * n))
+    for i in reversed(topological_order):
+        finish = project_duration
+        for k in range(succ_off[i], succ_off[i + 1]):
+            j, code = succ_idx[k], succ_type[k]
+            bound = (lf[j] if code & TO_FINISH else ls[j]) - succ_lag[k]
+            if code & FROM_START:
+                bound += dur[i]
+            if bound < finish:
+                finish = bound
+        lf[i] = finish
+        ls[i] = finish - dur[i]
+    return es, ef, ls, lf, project_duration
+
+
+def _aon_node_rows(graph: TaskGraph, es: array, ef: array, ls: array, lf: array, topology: array):
+    """AoN nodes (one per activity) in topological order."""
+    ids = graph.ids
+    for i in topology:
+        task_id = ids[i]
+        slack = ls[i] - es[i]
+        yield {
+            "id": task_id,
+            "label": task_id,
+            "duration": graph.dur[i],
+            "es": es[i],
+            "ef": ef[i],
+            "ls": ls[i],
+            "lf": lf[i],
+            "slack": slack,
+            "critical": abs(slack) < 1e-6,
+            "dependencies": _dependency_ids(graph, i),
+        }
+
+
+def _dependency_ids(graph: TaskGraph, i: int) -> List[str]:
+    """Predecessor IDs of task `i`, each once (typed graphs may link a pair twice, e.g. SS and FF)."""
+    ids = graph.ids
+    deps = [ids[p] for p in graph.preds(i)]
+    return list(dict.fromkeys(deps)) if graph.typed else deps
+
+
+def _relation_rows(graph: TaskGraph, i: int) -> List[Dict[str, Any]]:
+    """Every dependency of task `i` of a typed graph as {id, type, lag}."""
+    ids, pred_idx, pred_type, pred_lag = graph.ids, graph.pred_idx, graph.pred_type, graph.pred_lag
+    return [
+        {"id": ids[pred_idx[k]], "type": RELATION_TYPES[pred_type[k]], "lag": pred_lag[k]}
+        for k in range(graph.pred_off[i], graph.pred_off[i + 1])
+    ]
+
+
+def _aon_edge_rows(graph: TaskGraph):
+    """AoN edges (pred -> succ) in task order; typed graphs list each pair's relations on its edge."""
+    ids = graph.ids
+    if graph.typed:
+        yield from _typed_edge_rows(graph)
+        return
+    for i, current_id in enumerate(ids):
+        for j in graph.succs(i):
+            succ_id = ids[j]
+            yield {
+                "id": f"{current_id}->{succ_id}",
+                "source": current_id,
+                "target": succ_id,
+            }
+
+
+def _typed_edge_rows(graph: TaskGraph):
+    ids, succ_off, succ_idx, succ_type, succ_lag = graph.ids, graph.succ_off, graph.succ_idx, graph.succ_type, graph.succ_lag
+    for i, current_id in enumerate(ids):
+        pairs: Dict[int, List[Dict[str, Any]]] = {}
+        for k in range(succ_off[i], succ_off[i + 1]):
+            pairs.setdefault(succ_idx[k], []).append({"type": RELATION_TYPES[succ_type[k]], "lag": succ_lag[k]})
+        for j, relations in pairs.items():
+            succ_id = ids[j]
+            yield {
+                "id": f"{current_id}->{succ_id}",
+                "source": current_id,
+                "target": succ_id,
+                "relations": relations,
+            }
 
 
 def _build_aon_view(
-    es: Dict[str, float],
-    ef: Dict[str, float],
-    ls: Dict[str, float],
-    lf: Dict[str, float],
-    slack: Dict[str, float],
-    preds: Dict[str, Set[str]],
-    succs: Dict[str, Set[str]],
-    topology: List[str],
-    dur: Dict[str, float],
+    graph: TaskGraph,
+    es: array,
+    ef: array,
+    ls: array,
+    lf: array,
+    topology: array,
     project_duration: float,
 ):
     """
@@ -187,298 +581,458 @@ def _build_aon_view(
       - each *activity* becomes a node
       - precedence relations become edges (pred -> succ)
     """
-    aon_nodes: List[Dict[str, Any]] = []
-    aon_edges: List[Dict[str, Any]] = []
-
-    for task_id in topology:
-        aon_nodes.append({
-            "id": task_id,
-            "label": task_id,              
-            "duration": dur[task_id],
-            "es": es[task_id],
-            "ef": ef[task_id],
-            "ls": ls[task_id],
-            "lf": lf[task_id],
-            "slack": slack[task_id],
-            "critical": abs(slack[task_id]) < 1e-6,
-            "dependencies": list(preds[task_id]),
-        })
-    for current_id, succ_set in succs.items():
-        for succ_id in succ_set:
-            aon_edges.append({
-                "id": f"{current_id}->{succ_id}",
-                "source": current_id,
-                "target": succ_id,
-            })
     return {
         "project_duration": project_duration,
-        "nodes": aon_nodes,
-        "edges": aon_edges,
+        "nodes": list(_aon_node_rows(graph, es, ef, ls, lf, topology)),
+        "edges": list(_aon_edge_rows(graph)),
     }
 
 
-# ── Full Schedule Analysis ────────────────────────────────────────────────────
+def _activity_row(graph: TaskGraph, t: int, es: array, ef: array, ls: array, lf: array) -> Dict[str, Any]:
+    """Schedule row of one task; the AoA view adds its arrow endpoints."""
+    ids = graph.ids
+    slack = ls[t] - es[t]
+    row = {
+        "id": ids[t],
+        "name": graph.names[t],
+        "duration": graph.dur[t],
+        "es": es[t], "ef": ef[t],
+        "ls": ls[t], "lf": lf[t],
+        "slack": slack,
+        "critical": abs(slack) < 1e-6,
+        "dependencies": _dependency_ids(graph, t),
+    }
+    if graph.typed:
+        row["relations"] = _relation_rows(graph, t)
+    return row
+
 
-def _compute_schedule(tasks: List[Dict[str, Any]]):
-    es, ef, ls, lf, slack, project_duration, preds, succs, topology, dur = _forward_backward_pass(tasks)
-    
-    pred_sets = set()
-    for t in tasks:
-        pred_sets.add(frozenset(preds[t["id"]]))
-        
-    node_id_map = {}
-    node_label_map = {}
-    node_counter = 1
-    
-    def get_node_id_and_label(key):
-        nonlocal node_counter
-        if key not in node_id_map:
-            if key == "START" or key == "END":
-                node_id_map[key] = key
-                node_label_map[key] = key
-            elif isinstance(key, frozenset):
-                node_id_map[key] = str(node_counter)
-                node_label_map[key] = "after{" + ",".join(sorted(list(key))) + "}"
-                node_counter += 1
-            else: 
-                node_id_map[key] = str(node_counter)
-                node_label_map[key] = key
-                node_counter += 1
-        return node_id_map[key]
-
-    get_node_id_and_label("START")
-    get_node_id_and_label("END")
-    
-    task_tails = {}
+def _activity_rows(graph: TaskGraph, es: array, ef: array, ls: array, lf: array, topology: array):
+    """Task rows in topological order, without the AoA arrows or dummies."""
     for t in topology:
-        p_set = frozenset(preds[t])
-        if not p_set:
-            task_tails[t] = "START"
-        else:
-            task_tails[t] = get_node_id_and_label(p_set)
-            
-    task_heads = {}
+        row = _activity_row(graph, t, es, ef, ls, lf)
+        row["is_dummy"] = False
+        yield row
+
+
+class AoaLayout:
+    """
+    Activity-on-Arrow network in compact form.
+
+    Event nodes are integers (0 is START, 1 is END) listed in topological
+    `order`; task ``t`` is the arrow ``tail[t] -> head[t]`` and each dummy is a
+    ``(tail, head, tasks)`` triple, `tasks` being the ones whose completion it
+    carries. `activities` and `nodes` produce the JSON rows on demand.
+    """
+
+    __slots__ = ("graph", "times", "tail", "head", "dummies", "labels", "names",
+                 "order", "out", "earliest", "latest")
+
+    def activities(self):
+        """Task arrows in topological order, then the dummies."""
+        graph, names, tail, head = self.graph, self.names, self.tail, self.head
+        ids = graph.ids
+        es, ef, ls, lf, topology = self.times
+        for t in topology:
+            row = _activity_row(graph, t, es, ef, ls, lf)
+            row["tail_node"] = names[tail[t]]
+            row["head_node"] = names[head[t]]
+            row["is_dummy"] = False
+            yield row
+        for d, (u, v, xs) in enumerate(self.dummies, start=1):
+            slack = self.latest[v] - self.earliest[u]
+            yield {
+                "id": f"X{d}",
+                "name": f"X{d}",
+                "duration": 0.0,
+                "tail_node": names[u],
+                "head_node": names[v],
+                "dependencies": [ids[x] for x in xs],
+                "is_dummy": True,
+                "es": self.earliest[u],
+                "ef": self.earliest[u],
+                "lf": self.latest[v],
+                "ls": self.latest[v],
+                "slack": slack,
+                "critical": abs(slack) < 1e-6,
+            }
+
+    def nodes(self):
+        """Event nodes in topological order."""
+        ids, n = self.graph.ids, len(self.graph)
+        for u in self.order:
+            yield {
+                "id": self.names[u],
+                "label": self.names[u],
+                "data_label": self.labels[u],
+                "earliest": self.earliest[u],
+                "latest": self.latest[u],
+                "members": [ids[a] for a in self.out[u] if a < n]
+            }
+
+
+def _aoa_layout(
+    graph: TaskGraph,
+    es: array,
+    ef: array,
+    ls: array,
+    lf: array,
+    topology: array,
+    project_duration: float,
+    minimal: bool = False,
+) -> AoaLayout:
+    """
+    Build the Activity-on-Arrow (AoA) network using CPM results.
+
+    In AoA:
+      - every distinct predecessor set becomes an event node
+      - activities are arrows between events, zero-length X-dummies add the
+        remaining precedence links
+
+    An inverted index from each task to the predecessor sets containing it keeps
+    the construction linear in tasks plus edges.
+
+    `minimal` trades a little extra work for fewer dummies and events: links
+    implied by another predecessor are dropped first (`_direct_predecessors`),
+    a task whose predecessor sets are nested ends at the smallest one's event
+    instead of a Completion_* event, and a predecessor set contained in another
+    is linked with one dummy rather than one per member (`_subset_dummies`).
+    Precedence, and so every event time, is unchanged.
+    """
+    ids = graph.ids
+    n = len(ids)
+    preds_of = _direct_predecessors(graph).__getitem__ if minimal else graph.preds
+
+    # Distinct predecessor sets in first-seen order; task -> index of its own set.
+    set_index: Dict[frozenset, int] = {}
+    tail_set = array("q")
+    for i in range(n):
+        preds = preds_of(i)
+        if not preds:
+            tail_set.append(-1)
+            continue
+        key = frozenset(preds)
+        k = set_index.get(key)
+        if k is None:
+            k = set_index[key] = len(set_index)
+        tail_set.append(k)
+    pred_sets = list(set_index)
+
+    # Inverted index: task -> predecessor sets that contain it.
+    containing: List[List[int]] = [[] for _ in range(n)]
+    for k, members in enumerate(pred_sets):
+        for x in members:
+            containing[x].append(k)
+
+    # Event nodes are numbered in creation order. Keys are a predecessor-set
+    # index or a name (START, END, Completion_*, Parallel_*).
+    node_of: Dict[Any, int] = {"START": 0, "END": 1}
+    labels: List[str] = ["START", "END"]
+
+    def node(key) -> int:
+        u = node_of.get(key)
+        if u is None:
+            u = node_of[key] = len(labels)
+            if isinstance(key, int):
+                labels.append("after{" + ",".join(sorted(ids[j] for j in pred_sets[key])) + "}")
+            else:
+                labels.append(key)
+        return u
+
+    tail = array("q", bytes(8 * n))
+    for t in topology:
+        k = tail_set[t]
+        tail[t] = 0 if k < 0 else node(k)
+
+    head = array("q", bytes(8 * n))
     for t in topology:
-        targets = [s for s in pred_sets if t in s]
+        targets = containing[t]
         if not targets:
-            task_heads[t] = "END"
+            head[t] = 1
         elif len(targets) == 1:
-            task_heads[t] = get_node_id_and_label(targets[0])
+            head[t] = node(targets[0])
         else:
-            target_frozenset = frozenset([t])
-            if target_frozenset in pred_sets:
-                task_heads[t] = get_node_id_and_label(target_frozenset)
-            else:
-                task_heads[t] = get_node_id_and_label(f"Completion_{t}")
-                
+            k = set_index.get(frozenset((t,)))
+            if k is None and minimal:
+                k = _smallest_common_subset(pred_sets, targets)
+            head[t] = node(k) if k is not None else node(f"Completion_{ids[t]}")
+
     seen_edges = set()
     dummies = []
-    dummy_counter = 1
-    
+
     for t in topology:
-        tail = task_tails[t]
-        head = task_heads[t]
-        
-        if (tail, head) in seen_edges:
-            new_head = get_node_id_and_label(f"Parallel_{t}")
-            task_heads[t] = new_head
-            dummies.append({
-                "id": f"X{dummy_counter}",
-                "name": f"X{dummy_counter}",
-                "duration": 0.0,
-                "tail_node": new_head,
-                "head_node": head,
-                "dependencies": [t],
-                "is_dummy": True
-            })
-            dummy_counter += 1
-            seen_edges.add((tail, new_head))
-            seen_edges.add((new_head, head))
+        u, v = tail[t], head[t]
+        if (u, v) in seen_edges:
+            new_head = node(f"Parallel_{ids[t]}")
+            head[t] = new_head
+            dummies.append((new_head, v, (t,)))
+            seen_edges.add((u, new_head))
+            seen_edges.add((new_head, v))
         else:
-            seen_edges.add((tail, head))
-
-    for s in pred_sets:
-        if not s: continue 
-        s_node = get_node_id_and_label(s)
-        for x in s:
-            x_head = task_heads[x]
-            if x_head != s_node:
-                if (x_head, s_node) not in seen_edges:
-                    dummies.append({
-                        "id": f"X{dummy_counter}",
-                        "name": f"X{dummy_counter}",
-                        "duration": 0.0,
-                        "tail_node": x_head,
-                        "head_node": s_node,
-                        "dependencies": [x],
-                        "is_dummy": True
-                    })
-                    dummy_counter += 1
-                    seen_edges.add((x_head, s_node))
+            seen_edges.add((u, v))
 
-    task_names = {task["id"]: task.get("name") or task["id"] for task in tasks}
+    if minimal:
+        _subset_dummies(pred_sets, containing, head, node, node_of, dummies, seen_edges)
+    else:
+        for k, members in enumerate(pred_sets):
+            s_node = node(k)
+            for x in members:
+                x_head = head[x]
+                if x_head != s_node and (x_head, s_node) not in seen_edges:
+                    dummies.append((x_head, s_node, (x,)))
+                    seen_edges.add((x_head, s_node))
 
-    all_activities = []
+    # Arrows leaving each event in activity order: `t` for task t, `n + d` for dummy d.
+    m = len(labels)
+    out: List[List[int]] = [[] for _ in range(m)]
+    in_degree = array("q", bytes(8 * m))
+    arrow_head = array("q", head)
+    arrow_dur = array("d", graph.dur)
     for t in topology:
-        all_activities.append({
-            "id": t,
-            "name": task_names[t],
-            "duration": dur[t],
-            "es": es[t], "ef": ef[t],
-            "ls": ls[t], "lf": lf[t],
-            "slack": slack[t],
-            "critical": abs(slack[t]) < 1e-6,
-            "dependencies": list(preds[t]),
-            "tail_node": task_tails[t],
-            "head_node": task_heads[t],
-            "is_dummy": False
-        })
-    all_activities.extend(dummies)
-
-    aoa_succs = defaultdict(list)
-    aoa_preds = defaultdict(list)
-    for act in all_activities:
-        aoa_succs[act["tail_node"]].append(act)
-        aoa_preds[act["head_node"]].append(act)
-        
-    all_node_ids = list(set(aoa_succs.keys()) | set(aoa_preds.keys()))
-    node_earliest = {n: 0.0 for n in all_node_ids}
-    node_latest = {n: project_duration for n in all_node_ids}
-    in_degree = {n: len(aoa_preds[n]) for n in all_node_ids}
-    q = deque([n for n, deg in in_degree.items() if deg == 0])
-    topo_nodes = []
+        out[tail[t]].append(t)
+        in_degree[head[t]] += 1
+    for u, v, _ in dummies:
+        out[u].append(len(arrow_head))
+        arrow_head.append(v)
+        arrow_dur.append(0.0)
+        in_degree[v] += 1
 
+    q = deque(u for u in range(m) if in_degree[u] == 0)
+    order = array("q")
     while q:
         u = q.popleft()
-        topo_nodes.append(u)
-        for act in aoa_succs[u]:
-            v = act["head_node"]
+        order.append(u)
+        for a in out[u]:
+            v = arrow_head[a]
             in_degree[v] -= 1
             if in_degree[v] == 0:
                 q.append(v)
 
-    _counter = 1
-    rename = {}
-    for n in topo_nodes:
-        if n in ("START", "END"):
-            rename[n] = n
-        else:
-            rename[n] = str(_counter)
-            _counter += 1
-
-    for act in all_activities:
-        act["tail_node"] = rename[act["tail_node"]]
-        act["head_node"] = rename[act["head_node"]]
-
-    node_id_map = {k: rename.get(v, v) for k, v in node_id_map.items()}
-
-    aoa_succs = defaultdict(list)
-    aoa_preds = defaultdict(list)
-    for act in all_activities:
-        aoa_succs[act["tail_node"]].append(act)
-        aoa_preds[act["head_node"]].append(act)
-
-    all_node_ids = list(set(aoa_succs.keys()) | set(aoa_preds.keys()))
-    topo_nodes = [rename[n] for n in topo_nodes]
-
-    for u in topo_nodes:
-        for act in aoa_succs[u]:
-            v = act["head_node"]
-            node_earliest[v] = max(node_earliest[v], node_earliest[u] + act["duration"])
-            
-    for u in reversed(topo_nodes):
-        for act in aoa_succs[u]:
-            v = act["head_node"]
-            node_latest[u] = min(node_latest[u], node_latest[v] - act["duration"])
-            
-    for act in all_activities:
-        if act.get("is_dummy"):
-            u = act["tail_node"]
-            v = act["head_node"]
-            act["es"] = node_earliest[u]
-            act["ef"] = node_earliest[u]
-            act["lf"] = node_latest[v]
-            act["ls"] = node_latest[v]
-            act["slack"] = act["ls"] - act["es"]
-            act["critical"] = abs(act["slack"]) < 1e-6
-
-    result_nodes = []
-    id_to_label = {v: node_label_map[k] for k, v in node_id_map.items()}
-    for n_id in all_node_ids:
-        members = [act["id"] for act in aoa_succs[n_id] if not act.get("is_dummy")]
-        result_nodes.append({
-            "id": n_id,
-            "label": n_id,
-            "data_label": id_to_label.get(n_id, n_id),
-            "earliest": node_earliest[n_id],
-            "latest": node_latest[n_id],
-            "members": members
-        })
-        
-    aon_view = _build_aon_view(
-        es=es, ef=ef, ls=ls, lf=lf, slack=slack,
-        preds=preds, succs=succs, topology=topology,
-        dur=dur, project_duration=project_duration,
-    )
+    names = ["START", "END"] + [""] * (m - 2)
+    counter = 1
+    for u in order:
+        if u > 1:
+            names[u] = str(counter)
+            counter += 1
 
-    return {
-        "project_duration": project_duration,
-        "tasks": all_activities,
-        "nodes": result_nodes,
-        "aon": aon_view
-    }
+    earliest = array("d", bytes(8 * m))
+    latest = array("d", [project_duration]) * m
+    for u in order:
+        for a in out[u]:
+            v = arrow_head[a]
+            earliest[v] = max(earliest[v], earliest[u] + arrow_dur[a])
+    for u in reversed(order):
+        for a in out[u]:
+            latest[u] = min(latest[u], latest[arrow_head[a]] - arrow_dur[a])
 
+    layout = AoaLayout()
+    layout.graph = graph
+    layout.times = (es, ef, ls, lf, topology)
+    layout.tail, layout.head, layout.dummies = tail, head, dummies
+    layout.labels, layout.names, layout.order, layout.out = labels, names, order, out
+    layout.earliest, layout.latest = earliest, latest
+    return layout
 
-# ── Public API ────────────────────────────────────────────────────────────────
 
-def analyze_cpm(tasks: List[Dict[str, Any]]):
-    errors = validate_common(tasks) + validate_cpm_fields(tasks)
-    if errors:
-        raise ScheduleValidationError(errors)
-    return _compute_schedule(tasks)
+# Upper bounds on the lookups spent per task (`_direct_predecessors`) and per
+# predecessor set (`_subset_dummies`); past them a link is simply kept.
+REDUNDANT_SCAN_LIMIT = 4096
+SUBSET_SCAN_LIMIT = 4096
 
 
-def analyze_pert(tasks: List[Dict[str, Any]]):
-    errors = validate_common(tasks) + validate_pert_fields(tasks)
-    if errors:
-        raise ScheduleValidationError(errors)
+def _direct_predecessors(graph: TaskGraph) -> List[Sequence[int]]:
+    """
+    Predecessors of each task without the links implied one step away: with
+    p -> q -> i, the link p -> i adds no precedence and needs no dummy.
+    """
+    direct: List[Sequence[int]] = []
+    for i in range(len(graph)):
+        preds = graph.preds(i)
+        if len(preds) < 2:
+            direct.append(preds)
+            continue
+        own = set(preds)
+        implied = set()
+        work = 0
+        for q in preds:
+            before = graph.preds(q)
+            work += len(before)
+            if work > REDUNDANT_SCAN_LIMIT:
+                break
+            implied.update(p for p in before if p in own)
+        direct.append([p for p in preds if p not in implied] if implied else preds)
+    return direct
 
-    pert_data: Dict[str, Dict[str, float]] = {}
-    cpm_tasks: List[Dict[str, Any]] = []
-
-    for t in tasks:
-        task_id = t["id"]
-        o = float(t["optimistic"])
-        m = float(t["most_likely"])
-        p = float(t["pessimistic"])
-        expected  = (o + 4.0 * m + p) / 6.0
-        variance  = ((p - o) / 6.0) ** 2
-        pert_data[task_id] = {
-            "optimistic":  o,
-            "most_likely": m,
-            "pessimistic": p,
-            "expected":    expected,
-            "variance":    variance,
-            "std_dev":     math.sqrt(variance),
-        }
-        cpm_tasks.append({**t, "duration": expected})
 
-    result = _compute_schedule(cpm_tasks)
+def _smallest_common_subset(pred_sets: List[frozenset], targets: List[int]) -> Optional[int]:
+    """The smallest of the sets `targets` if it is contained in all the others."""
+    k = min(targets, key=lambda j: len(pred_sets[j]))
+    smallest = pred_sets[k]
+    return k if all(smallest <= pred_sets[j] for j in targets) else None
 
-    for task in result["tasks"]:
-        task_id = task["id"]
-        if task_id in pert_data:
-            task.update(pert_data[task_id])
 
-    crit_variance = sum(
-        pert_data[t["id"]]["variance"]
-        for t in result["tasks"]
-        if t.get("critical") and not t.get("is_dummy") and t["id"] in pert_data
-    )
-    project_std = math.sqrt(crit_variance) if crit_variance > 0 else 0.0
-    project_duration = result["project_duration"]
+def _subset_dummies(pred_sets, containing, head, node, node_of, dummies, seen_edges):
+    """
+    Dummies that bring every predecessor set's members to its event. A set
+    contained in another (found by counting, through `containing`, how many of
+    its members the larger one holds) reaches it with a single dummy from its
+    own event, which carries all of its members; the rest get one each.
+    """
+    set_of = {u: k for k, u in node_of.items() if isinstance(k, int)}
+
+    def link(u, v, xs):
+        if (u, v) not in seen_edges:
+            seen_edges.add((u, v))
+            k = set_of.get(u)
+            dummies.append((u, v, tuple(sorted(pred_sets[k])) if k is not None else xs))
+
+    for k, members in enumerate(pred_sets):
+        s_node = node(k)
+        pending = {x for x in members if head[x] != s_node}
+        if len(pending) > 1:
+            counts: Dict[int, int] = {}
+            work = 0
+            for x in members:
+                work += len(containing[x])
+                if work > SUBSET_SCAN_LIMIT:
+                    break
+                for j in containing[x]:
+                    counts[j] = counts.get(j, 0) + 1
+            # Every member of a set was counted exactly when the set lies inside this one.
+            subsets = [j for j, c in counts.items() if c == len(pred_sets[j]) and j != k]
+            subsets.sort(key=lambda j: len(pred_sets[j]), reverse=True)
+            for j in subsets:
+                covered = pending & pred_sets[j]
+                if len(covered) > 1:
+                    link(node(j), s_node, ())
+                    pending -= covered
+                    if len(pending) < 2:
+                        break
+        for x in members:
+            if x in pending:
+                link(head[x], s_node, (x,))
+
 
-    result["pert_stats"] = {
+def _build_aoa_view(
+    graph: TaskGraph,
+    es: array,
+    ef: array,
+    ls: array,
+    lf: array,
+    topology: array,
+    project_duration: float,
+    minimal: bool = False,
+):
+    """AoA view as lists: the activities (tasks followed by dummies) and the event nodes."""
+    layout = _aoa_layout(graph, es, ef, ls, lf, topology, project_duration, minimal)
+    return list(layout.activities()), list(layout.nodes())
+
+
+# ── Full Schedule Analysis ────────────────────────────────────────────────────
+
+VIEWS = ("activities", "aoa", "aon", "pert_stats")
+# AoA constructions: one dummy per uncovered predecessor link, or fewer dummies and events.
+AOA_MODES = ("standard", "minimal")
+
+
+def _resolve_views(views: Optional[List[str]]) -> Set[str]:
+    """Requested result views; None means all of them."""
+    if views is None:
+        return set(VIEWS)
+    if not isinstance(views, list):
+        raise ValueError("Views must be a list")
+    unknown = [v for v in views if v not in VIEWS]
+    if unknown:
+        raise ValueError(f"Unknown view: {unknown[0]}. Choose from: {', '.join(VIEWS)}")
+    return set(views)
+
+
+def _resolve_aoa(aoa: Optional[str]) -> Optional[str]:
+    if aoa is not None and aoa not in AOA_MODES:
+        raise ValueError(f"AoA mode must be one of: {', '.join(AOA_MODES)}")
+    return aoa
+
+
+def _compute_schedule(tasks: List[Dict[str, Any]], views: Optional[Set[str]] = None):
+    """Schedule tasks that already passed validation."""
+    result, _ = _schedule_from_graph(TaskGraph.from_tasks(tasks), views)
+    return result
+
+
+def _schedule_from_graph(graph: TaskGraph, views: Optional[Set[str]] = None, aoa: Optional[str] = None):
+    """
+    Run the passes and build the requested views (all by default). Also returns
+    the raw pass output for callers that keep it. With an `aoa` mode (see
+    `AOA_MODES`) the AoA view is built that way and `aoa_stats` reports its
+    event and dummy counts.
+
+      activities  `tasks`: one schedule row per task
+      aoa         `nodes` and the arrows: `tasks` gain tail/head nodes plus the dummies
+      aon         `aon`: activity-on-node graph
+
+    Typed dependencies (SS/FF/SF, lags) have no arrow-diagram form, so for
+    typed graphs `aoa` is served as `activities`.
+    """
+    if views is None:
+        views = set(VIEWS)
+    if graph.typed and "aoa" in views:
+        views = (views - {"aoa"}) | {"activities"}
+    times = _forward_backward_pass(graph)
+    es, ef, ls, lf, project_duration, topology = times
+    record_size("tasks", len(graph))
+    record_size("edges", graph.edge_count)
+
+    result: Dict[str, Any] = {"project_duration": project_duration}
+    if "aoa" in views:
+        with phase("aoa"):
+            all_activities, result_nodes = _build_aoa_view(
+                graph=graph, es=es, ef=ef, ls=ls, lf=lf,
+                topology=topology, project_duration=project_duration,
+                minimal=aoa == "minimal",
+            )
+        record_size("dummies", len(all_activities) - len(graph))
+        record_size("aoa_nodes", len(result_nodes))
+        result["tasks"] = all_activities
+        result["nodes"] = result_nodes
+        if aoa is not None:
+            result["aoa_stats"] = {
+                "mode": aoa,
+                "nodes": len(result_nodes),
+                "dummies": len(all_activities) - len(graph),
+            }
+    elif "activities" in views:
+        with phase("activities"):
+            result["tasks"] = list(_activity_rows(graph, es, ef, ls, lf, topology))
+    if "aon" in views:
+        with phase("aon"):
+            result["aon"] = _build_aon_view(
+                graph=graph, es=es, ef=ef, ls=ls, lf=lf,
+                topology=topology, project_duration=project_duration,
+            )
+    return result, times
+
+
+def _pert_estimates(estimates, i: int) -> Dict[str, float]:
+    """Three-point estimate of task `i` (see `ingest_tasks`) with its expected duration and spread."""
+    o = estimates[0][i]
+    m = estimates[1][i]
+    p = estimates[2][i]
+    expected  = (o + 4.0 * m + p) / 6.0
+    variance  = ((p - o) / 6.0) ** 2
+    return {
+        "optimistic":  o,
+        "most_likely": m,
+        "pessimistic": p,
+        "expected":    expected,
+        "variance":    variance,
+        "std_dev":     math.sqrt(variance),
+    }
+
+
+def _pert_stats(project_duration: float, crit_variance: float) -> Dict[str, Any]:
+    """Normal-approximation deadlines from the critical-path variance."""
+    project_std = math.sqrt(crit_variance) if crit_variance > 0 else 0.0
+    return {
         "expected_duration": project_duration,
         "variance":  crit_variance,
         "std_dev":   project_std,
@@ -490,4 +1044,89 @@ def analyze_pert(tasks: List[Dict[str, Any]]):
             "p99":  round(project_duration + NormalDist().inv_cdf(0.99) * project_std, 2),
         },
     }
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def validate_schedule(tasks: List[Dict[str, Any]], mode: str = "cpm") -> List[Dict[str, Any]]:
+    """
+    Everything `analyze_*` checks before scheduling, without computing a schedule:
+    structural and field validation, then a linear-time cycle check on the interned graph.
+    Returns the same error list `analyze_*` would raise (empty when valid).
+    """
+    try:
+        graph, _ = ingest_tasks(tasks, mode)
+    except ScheduleValidationError as e:
+        return e.errors
+    topological_order = graph.topological_order()
+    if len(topological_order) != len(graph.ids):
+        return _cycle_error(graph, topological_order).errors
+    return []
+
+
+def analyze_cpm(tasks: List[Dict[str, Any]], views: Optional[List[str]] = None, aoa: Optional[str] = None):
+    """
+    CPM analysis. `views` limits the result to some of `VIEWS`; the rest are never built.
+    `aoa` picks the AoA construction (see `AOA_MODES`) and adds `aoa_stats`.
+    """
+    views = _resolve_views(views)
+    aoa = _resolve_aoa(aoa)
+    with phase("ingest"):
+        graph, _ = ingest_tasks(tasks, "cpm")
+    result, _ = _schedule_from_graph(graph, views, aoa)
+    return result
+
+
+def analyze_pert(
+    tasks: List[Dict[str, Any]],
+    simulation: Optional[Dict[str, Any]] = None,
+    views: Optional[List[str]] = None,
+    aoa: Optional[str] = None,
+):
+    """
+    PERT analysis on expected durations with normal-approximation deadlines.
+    `simulation` (iterations, distribution, bins, seed, workers) additionally runs a
+    Monte Carlo simulation and adds its summary as `pert_stats["simulation"]`,
+    so it implies the `pert_stats` view. `views` and `aoa` work as in `analyze_cpm`.
+    """
+    views = _resolve_views(views)
+    aoa = _resolve_aoa(aoa)
+    if simulation is not None:
+        views.add("pert_stats")
+    with phase("ingest"):
+        graph, estimates = ingest_tasks(tasks, "pert")
+    return _analyze_pert_graph(graph, estimates, views, simulation, aoa)
+
+
+def _analyze_pert_graph(
+    graph: TaskGraph,
+    estimates,
+    views: Set[str],
+    simulation: Optional[Dict[str, Any]],
+    aoa: Optional[str] = None,
+):
+    """`analyze_pert` from the interned graph and its (optimistic, most_likely, pessimistic) arrays."""
+    result, times = _schedule_from_graph(graph, views, aoa)
+
+    index = graph.index
+    for task in result.get("tasks", ()):
+        i = index.get(task["id"])
+        if i is not None:
+            task.update(_pert_estimates(estimates, i))
+
+    if "pert_stats" not in views:
+        return result
+    es, _, ls, _, project_duration, topology = times
+    crit_variance = sum(
+        _pert_estimates(estimates, i)["variance"] for i in topology if abs(ls[i] - es[i]) < 1e-6
+    )
+    result["pert_stats"] = _pert_stats(project_duration, crit_variance)
+
+    if simulation is not None:
+        from services.simulation import simulate_pert
+
+        with phase("simulation"):
+            result["pert_stats"]["simulation"] = simulate_pert(
+                graph, times[-1], *(column.tolist() for column in estimates), **simulation,
+            )
     return result
\ No newline at end of file
@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from services.graph import TaskGraph
+from services.levels import LevelPlan, level_times
+from services.metrics import progress
+
+
+DISTRIBUTIONS = ("beta", "triangular")
+PERCENTILES = (50, 75, 90, 95, 99)
+DEFAULT_ITERATIONS = 10_000
+MAX_ITERATIONS = 1_000_000
+# Upper bound on tasks x iterations per worker process (100k iterations on 5k
+# tasks for one). Memory does not grow with it: chunks are merged as they
+# finish; time does, at roughly 0.1 µs per sample on one core.
+MAX_SAMPLES_PER_WORKER = 500_000_000
+# Upper bound on tasks x iterations per sampled batch (~4 MB per float64 matrix,
+# small enough for the level passes to stay cache-friendly).
+BATCH_ELEMENTS = 500_000
+
+
+# ── Sampling ──────────────────────────────────────────────────────────────────
+
+def sample_durations(rng, o, m, p, size: int, distribution: str):
+    """
+    Draw durations from Beta-PERT or triangular(o, m, p).
+    Returns a (tasks x size) matrix: one row per task, one column per iteration,
+    so the level passes gather whole contiguous rows.
+    """
+    o, m, p = o[:, None], m[:, None], p[:, None]
+    spread = p - o
+    degenerate = spread <= 0
+    safe = np.where(degenerate, 1.0, spread)
+    if distribution == "beta":
+        alpha = np.where(degenerate, 1.0, 1.0 + 4.0 * (m - o) / safe)
+        beta = np.where(degenerate, 1.0, 1.0 + 4.0 * (p - m) / safe)
+        return o + spread * rng.beta(alpha, beta, size=(len(o), size))
+    # Inverse CDF of the triangular distribution; degenerate tasks collapse to o.
+    u = rng.random((len(o), size))
+    c = (m - o) / safe
+    low = o + np.sqrt(u * spread * (m - o))
+    high = p - np.sqrt((1.0 - u) * spread * (p - m))
+    return np.where(u < c, low, high)
+
+
+def simulate_batch(plan: LevelPlan, durations):
+    """
+    Forward and backward pass for every iteration (column) of `durations` at once.
+    Returns (completion time per iteration, per-task count of iterations on a critical path).
+    """
+    if plan.typed:
+        es, _, ls, _, finish = level_times(plan, durations)
+        return finish, np.count_nonzero(np.abs(ls - es) < 1e-6, axis=1)
+    ef = np.empty_like(durations)
+    first = plan.levels[0]
+    ef[first] = durations[first]
+    for tasks, gather, starts in plan.forward:
+        ef[tasks] = np.maximum.reduceat(ef[gather], starts, axis=0) + durations[tasks]
+    finish = ef.max(axis=0)
+
+    ls = np.empty_like(durations)
+    ls[plan.sinks] = finish - durations[plan.sinks]
+    for tasks, gather, starts in plan.backward:
+        if len(tasks):
+            ls[tasks] = np.minimum.reduceat(ls[gather], starts, axis=0) - durations[tasks]
+
+    # Slack is LS - ES, with ES = EF - duration.
+    ls -= ef
+    ls += durations
+    critical = np.count_nonzero(np.abs(ls) < 1e-6, axis=1)
+    return finish, critical
+
+
+# ── Chunked Execution ─────────────────────────────────────────────────────────
+
+def _run_chunks(plan: LevelPlan, o, m, p, distribution: str, chunks):
+    """
+    Simulate (seed sequence, size) chunks in order and merge them as they
+    finish: (finish time per iteration, per-task critical counts) of the run.
+    """
+    finish = np.empty(sum(size for _, size in chunks))
+    critical = np.zeros(plan.n, dtype=np.int64)
+    start = 0
+    for k, (seq, size) in enumerate(chunks, start=1):
+        chunk_finish, chunk_critical = simulate_batch(
+            plan, sample_durations(np.random.default_rng(seq), o, m, p, size, distribution),
+        )
+        finish[start:start + size] = chunk_finish
+        critical += chunk_critical
+        start += size
+        progress(k / len(chunks))
+    return finish, critical
+
+
+def _run_parallel(plan: LevelPlan, o, m, p, distribution: str, chunks, workers: int):
+    """Hand each worker a contiguous run of chunks and return the merged results in run order."""
+    per_worker = -(-len(chunks) // workers)
+    runs = [chunks[k:k + per_worker] for k in range(0, len(chunks), per_worker)]
+    # Spawned rather than forked: the caller is usually a threaded web server.
+    with ProcessPoolExecutor(max_workers=len(runs), mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(_run_chunks, plan, o, m, p, distribution, run) for run in runs]
+        results = []
+        for k, future in enumerate(futures, start=1):
+            results.append(future.result())
+            progress(k / len(futures))
+        return results
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def simulate_pert(
+    graph: TaskGraph,
+    topology,
+    optimistic,
+    most_likely,
+    pessimistic,
+    iterations: int = DEFAULT_ITERATIONS,
+    distribution: str = "beta",
+    bins: int = 50,
+    seed: Optional[int] = None,
+    workers: int = 1,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo PERT: sample every task duration per iteration, propagate the
+    whole batch level by level, and summarise the completion-time distribution.
+    Unlike the normal approximation this accounts for merge bias across
+    near-critical paths.
+
+    Iterations are cut into fixed-size chunks, each with its own child of
+    ``SeedSequence(seed)``. Chunk sizes depend only on the graph, and chunk
+    results are merged in chunk order, so a given seed produces bit-identical
+    output for any `workers` count. Without a seed, fresh entropy is drawn and
+    reported back as `seed`.
+
+    Each worker holds one chunk's samples at a time and merges its chunks as
+    they finish, so memory stays bounded by the chunk size, the iteration
+    count and the task count. Tasks x iterations may reach
+    `MAX_SAMPLES_PER_WORKER` per worker actually used.
+    """
+    iterations = int(iterations)
+    bins = int(bins)
+    workers = int(workers)
+    if not 1 <= iterations <= MAX_ITERATIONS:
+        raise ValueError(f"Simulation iterations must be between 1 and {MAX_ITERATIONS}")
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Simulation distribution must be one of: {', '.join(DISTRIBUTIONS)}")
+    if bins < 1:
+        raise ValueError("Simulation bins must be at least 1")
+    if workers < 1:
+        raise ValueError("Simulation workers must be at least 1")
+
+    o = np.asarray(optimistic, dtype=np.float64)
+    m = np.asarray(most_likely, dtype=np.float64)
+    p = np.asarray(pessimistic, dtype=np.float64)
+    plan = LevelPlan.from_topology(graph, topology)
+
+    if seed is None:
+        # 53 bits so the reported seed survives a round trip through JavaScript numbers.
+        seed = secrets.randbits(53)
+    root = np.random.SeedSequence(seed)
+    batch = max(1, BATCH_ELEMENTS // max(1, plan.n))
+    sizes = [min(batch, iterations - start) for start in range(0, iterations, batch)]
+    chunks = list(zip(root.spawn(len(sizes)), sizes))
+
+    workers = min(workers, len(chunks), os.cpu_count() or 1)
+    limit = MAX_SAMPLES_PER_WORKER * workers
+    if iterations * plan.n > limit:
+        raise ValueError(
+            f"Simulation too large: {plan.n} tasks x {iterations} iterations exceeds {limit} samples "
+            f"for {workers} worker(s); use more workers or at most {max(1, limit // plan.n)} iterations"
+        )
+    # Finish times are 8 bytes per iteration, so runs merge exactly by
+    # concatenation; criticality counts merge by summing.
+    if workers > 1:
+        results = _run_parallel(plan, o, m, p, distribution, chunks, workers)
+        finish = np.concatenate([f for f, _ in results])
+        critical = np.sum([c for _, c in results], axis=0)
+    else:
+        finish, critical = _run_chunks(plan, o, m, p, distribution, chunks)
+    counts, edges = np.histogram(finish, bins=bins)
+    return {
+        "iterations": iterations,
+        "distribution": distribution,
+        "seed": seed,
+        "mean": float(finish.mean()),
+        "std_dev": float(finish.std()),
+        "min": float(finish.min()),
+        "max": float(finish.max()),
+        "percentiles": {
+            f"p{q}": round(float(v), 2)
+            for q, v in zip(PERCENTILES, np.percentile(finish, PERCENTILES))
+        },
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+        "criticality": {tid: float(c) / iterations for tid, c in zip(graph.ids, critical)},
+    }
@@ -0,0 +1,110 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from services.graph import TaskGraph
+from services.metrics import phase, record_size
+from services.scheduling import (
+    _aoa_layout,
+    _aon_edge_rows,
+    _forward_backward_pass,
+    _pert_estimates,
+    _pert_stats,
+    ingest_tasks,
+)
+
+# Serialized records are flushed in chunks of roughly this many bytes.
+CHUNK_BYTES = 64 * 1024
+
+
+# ── NDJSON Ingest ─────────────────────────────────────────────────────────────
+
+def read_ndjson_tasks(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse one task object per line; blank lines are skipped. Lazy, so
+    `ingest_tasks` interns each task as its line is read and the request
+    body is never held as a list of dicts.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            task = json.loads(line)
+        except ValueError:
+            raise ValueError(f"Line {number}: invalid JSON")
+        if not isinstance(task, dict):
+            raise ValueError(f"Line {number}: expected a task object")
+        yield task
+
+
+# ── NDJSON Output ─────────────────────────────────────────────────────────────
+
+def stream_analysis(
+    tasks: Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]],
+    mode: str,
+    project_start: str,
+) -> Iterator[bytes]:
+    """
+    Validate and schedule `tasks` (a list, or an iterator such as
+    `read_ndjson_tasks`), then return a generator of NDJSON records:
+    ``activity`` rows (which double as the AoN nodes), AoA ``node`` rows,
+    ``aon_edge`` rows and a final ``summary``.
+
+    Ingest, validation and the passes run eagerly, so errors are raised and
+    their phases recorded before any output. After that only the interned
+    graph and the compact AoA layout are kept, and records are serialized
+    one at a time. Serialization runs after the response has started, once
+    the request's phase recorder is closed, so it is not timed.
+    """
+    # PERT three-point estimates come back as flat arrays, not per-task dicts.
+    with phase("ingest"):
+        graph, estimates = ingest_tasks(tasks, mode)
+    if graph.typed:
+        raise ValueError("Typed dependencies (SS/FF/SF or lags) cannot be streamed: the stream is built on the arrow diagram")
+    record_size("tasks", len(graph))
+    record_size("edges", graph.edge_count)
+    es, ef, ls, lf, project_duration, topology = _forward_backward_pass(graph)
+    with phase("aoa"):
+        layout = _aoa_layout(graph, es, ef, ls, lf, topology, project_duration)
+
+    summary = {"type": "summary", "mode": mode, "project_start": project_start,
+               "project_duration": project_duration}
+    if estimates is not None:
+        crit_variance = sum(
+            _pert_estimates(estimates, i)["variance"] for i in topology if abs(ls[i] - es[i]) < 1e-6
+        )
+        summary["pert_stats"] = _pert_stats(project_duration, crit_variance)
+    return _records(graph, layout, estimates, summary)
+
+
+def _records(graph: TaskGraph, layout, estimates, summary: Dict[str, Any]) -> Iterator[bytes]:
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    index = graph.index
+    counts = {"activities": 0, "nodes": 0, "aon_edges": 0}
+    buffer: List[str] = []
+    size = 0
+
+    def rows():
+        for row in layout.activities():
+            counts["activities"] += 1
+            if estimates is not None and not row["is_dummy"]:
+                row.update(_pert_estimates(estimates, index[row["id"]]))
+            yield "activity", row
+        for row in layout.nodes():
+            counts["nodes"] += 1
+            yield "node", row
+        for row in _aon_edge_rows(graph):
+            counts["aon_edges"] += 1
+            yield "aon_edge", row
+
+    for kind, row in rows():
+        line = encode({"type": kind, **row})
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= CHUNK_BYTES:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer.clear()
+            size = 0
+
+    summary["counts"] = counts
+    buffer.append(encode(summary))
+    yield ("\n".join(buffer) + "\n").encode("utf-8")
@@ -40,12 +40,154 @@ function buildRowHtml() {
     `;
 }
 
+// Last full result plus the server-side session it was opened with, so Gantt
+// edits can be sent as deltas instead of re-analyzing the whole table. Plain
+// runs open no session (they go through the result cache and worker pool);
+// the first Gantt edit re-analyzes with one, later edits send deltas.
+let lastResult = null;
+let analysisSession = null;
+
+function renderAnalysisResult(result) {
+  renderCpmSummary(result);
+  renderCpmTable(result);
+
+  try {
+    const mapped = mapCpmToGantt(result);
+    renderGantt(mapped);
+  } catch (mappingErr) {
+    throw new MappingError(mappingErr.message);
+  }
+
+  if (Array.isArray(result.nodes) && result.nodes.length > 0) {
+    aoaElements = buildAoAElementsFromResult(result);
+  } else {
+    aoaElements = [];
+  }
+  aonElements = buildAoNElementsFromResult(result.aon);
+
+  const networkTabBtn = document.getElementById("network-tab");
+  const ganttTabBtn = document.getElementById("gantt-tab");
+  if (networkTabBtn && ganttTabBtn) {
+    // Cytoscape requires its container to be visible to compute layout correctly.
+    // We briefly switch to the network tab (making #cpm-network visible), run the
+    // layout, then switch back to the Gantt tab so the user lands there by default.
+    networkTabBtn.click();
+    setTimeout(() => {
+      initOrUpdateNetwork();
+      ganttTabBtn.click();
+      setTimeout(() => scrollToFirstGanttTask(), 50);
+    }, 10);
+  } else {
+    initOrUpdateNetwork();
+  }
+}
+
+// True when the table still holds exactly what the current session was built from.
+function tableMatchesSession() {
+  return Boolean(
+    analysisSession &&
+      lastResult &&
+      !isPertMode() &&
+      JSON.stringify(readTable()) === analysisSession.snapshot,
+  );
+}
+
+// Patches the rows returned by /api/analyze/delta into the last full result.
+// AoA event times are re-derived from the activities: an event's earliest time
+// is the ES of the activities leaving it (else the latest EF entering it), its
+// latest time the LF of the activities entering it (else the earliest LS leaving
+// it). END may be reached only through dummies, so it is pinned to the duration.
+function applyScheduleDelta(result, delta) {
+  const rows = new Map(delta.tasks.map((r) => [r.id, r]));
+  result.project_duration = delta.project_duration;
+  result.tasks.forEach((t) => {
+    if (!t.is_dummy && rows.has(t.id)) Object.assign(t, rows.get(t.id));
+  });
+  if (result.aon) {
+    result.aon.project_duration = delta.project_duration;
+    result.aon.nodes.forEach((n) => {
+      if (rows.has(n.id)) Object.assign(n, rows.get(n.id));
+    });
+  }
+
+  const earliest = {};
+  const latest = {};
+  const real = result.tasks.filter((t) => !t.is_dummy);
+  real.forEach((t) => {
+    earliest[t.tail_node] = t.es;
+    latest[t.head_node] = t.lf;
+  });
+  const entering = {};
+  const leaving = {};
+  real.forEach((t) => {
+    if (!(t.head_node in earliest))
+      entering[t.head_node] = Math.max(entering[t.head_node] ?? -Infinity, t.ef);
+    if (!(t.tail_node in latest))
+      leaving[t.tail_node] = Math.min(leaving[t.tail_node] ?? Infinity, t.ls);
+  });
+  Object.assign(earliest, entering);
+  Object.assign(latest, leaving);
+  earliest.END = latest.END = delta.project_duration;
+
+  (result.nodes || []).forEach((n) => {
+    n.earliest = earliest[n.id];
+    n.latest = latest[n.id];
+  });
+  result.tasks.forEach((t) => {
+    if (!t.is_dummy) return;
+    t.es = t.ef = earliest[t.tail_node];
+    t.ls = t.lf = latest[t.head_node];
+    t.slack = t.ls - t.es;
+    t.critical = Math.abs(t.slack) < 1e-6;
+  });
+}
+
+window.analyzeDelta = async function analyzeDelta(changes) {
+  const session = analysisSession;
+  const btnAnalyze = document.getElementById("btn-analyze");
+  btnAnalyze.innerHTML =
+    '<span class="spinner-border spinner-border-sm"></span> Analyzing...';
+  btnAnalyze.disabled = true;
+  try {
+    const response = await fetch("/api/analyze/delta", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        session: session.id,
+        version: session.version,
+        changes,
+      }),
+    });
+    const json = await response.json();
+    if (!response.ok || !json.ok) throw new Error(json.error || `HTTP ${response.status}`);
+
+    applyScheduleDelta(lastResult, json.result);
+    lastResult.session = json.result.session;
+    analysisSession = {
+      ...json.result.session,
+      snapshot: JSON.stringify(readTable()),
+    };
+    const debugJson = document.getElementById("debug-json");
+    if (debugJson) debugJson.textContent = JSON.stringify(lastResult, null, 2);
+    renderAnalysisResult(lastResult);
+  } catch (err) {
+    // Expired session, version conflict or invalid edit: fall back to a full run.
+    console.warn("Delta analysis failed, re-analyzing:", err);
+    analysisSession = null;
+    await window.analyzeProject({ session: true });
+  } finally {
+    btnAnalyze.innerHTML = '<i class="bi bi-lightning-fill"></i> Analyze';
+    btnAnalyze.disabled = false;
+  }
+};
+
 window.analyzeProject = async function analyzeProject(opts) {
   if (opts && opts.clearGhost) ganttGhostData = null;
   const out = document.getElementById("out");
   const debugJson = document.getElementById("debug-json");
   const btnAnalyze = document.getElementById("btn-analyze");
   saveState();
+  analysisSession = null;
   try {
     btnAnalyze.innerHTML =
       '<span class="spinner-border spinner-border-sm"></span> Analyzing...';
@@ -53,19 +195,38 @@ window.analyzeProject = async function analyzeProject(opts) {
 
     const tasksFromTable = readTable();
     const mode = isPertMode() ? "pert" : "cpm";
-    const requestBody = JSON.stringify({ tasks: tasksFromTable, mode });
+    const requestBody = JSON.stringify({
+      tasks: tasksFromTable,
+      mode,
+      session: Boolean(opts && opts.session) && mode === "cpm",
+      // Large tables come back as binary columns; errors are still JSON.
+      format: tasksFromTable.length >= COLUMNAR_MIN_ROWS ? "binary" : "rows",
+      // Fewer dummies and events keep the network layout of large tables manageable.
+      aoa: tasksFromTable.length >= COLUMNAR_MIN_ROWS ? "minimal" : undefined,
+    });
     const response = await fetch("/api/analyze", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: requestBody,
     });
 
-    const text = await response.text();
     let json;
-    try {
-      json = JSON.parse(text);
-    } catch (jsonErr) {
-      throw new JsonParseError(jsonErr.message, text);
+    let text = "";
+    const contentType = response.headers.get("Content-Type") || "";
+    if (response.ok && contentType.startsWith(COLUMNAR_MIME)) {
+      const buffer = await response.arrayBuffer();
+      try {
+        json = { ok: true, result: columnarToResult(decodeColumnarBinary(buffer)) };
+      } catch (decodeErr) {
+        throw new JsonParseError(decodeErr.message, `<${buffer.byteLength} bytes of columnar data>`);
+      }
+    } else {
+      text = await response.text();
+      try {
+        json = JSON.parse(text);
+      } catch (jsonErr) {
+        throw new JsonParseError(jsonErr.message, text);
+      }
     }
 
     if (!response.ok) {
@@ -91,38 +252,11 @@ window.analyzeProject = async function analyzeProject(opts) {
       debugJson.textContent = JSON.stringify(json.result, null, 2);
     }
 
-    renderCpmSummary(json.result);
-    renderCpmTable(json.result);
-
-    try {
-      const mapped = mapCpmToGantt(json.result);
-      renderGantt(mapped);
-    } catch (mappingErr) {
-      throw new MappingError(mappingErr.message);
-    }
-
-    if (Array.isArray(json.result.nodes) && json.result.nodes.length > 0) {
-      aoaElements = buildAoAElementsFromResult(json.result);
-    } else {
-      aoaElements = [];
-    }
-    aonElements = buildAoNElementsFromResult(json.result.aon);
-
-    const networkTabBtn = document.getElementById("network-tab");
-    const ganttTabBtn = document.getElementById("gantt-tab");
-    if (networkTabBtn && ganttTabBtn) {
-      // Cytoscape requires its container to be visible to compute layout correctly.
-      // We briefly switch to the network tab (making #cpm-network visible), run the
-      // layout, then switch back to the Gantt tab so the user lands there by default.
-      networkTabBtn.click();
-      setTimeout(() => {
-        initOrUpdateNetwork();
-        ganttTabBtn.click();
-        setTimeout(() => scrollToFirstGanttTask(), 50);
-      }, 10);
-    } else {
-      initOrUpdateNetwork();
-    }
+    renderAnalysisResult(json.result);
+    lastResult = json.result;
+    analysisSession = json.result.session
+      ? { ...json.result.session, snapshot: JSON.stringify(tasksFromTable) }
+      : null;
   } catch (err) {
     document.getElementById("cpm-summary").innerHTML = "";
     document.getElementById("cpm-table").innerHTML = "";
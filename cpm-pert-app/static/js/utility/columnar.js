@@ -0,0 +1,126 @@
+// ── Columnar Results ──────────────────────────────────────────────────────────
+// Decoders for the compact `format: "columnar"` / `"binary"` analysis results
+// (services/columnar.py). Both end in the usual row-per-object result, so the
+// table, Gantt and network renderers need no changes.
+
+const COLUMNAR_MIME = "application/vnd.cpm.columnar";
+const COLUMNAR_MAGIC = "CPMC";
+const COLUMNAR_VERSION = 1;
+// Tables at least this long are requested as binary columnar results.
+const COLUMNAR_MIN_ROWS = 2000;
+
+const COLUMNAR_ARRAYS = { f8: Float64Array, u1: Uint8Array, i4: Int32Array };
+
+// Binary layout: magic, u8 version, 3 pad bytes, u32 header length, header JSON,
+// then 8-byte aligned little-endian buffers referenced as {buffer: [offset, length]}.
+function decodeColumnarBinary(buffer) {
+  const bytes = new Uint8Array(buffer);
+  const magic = String.fromCharCode(...bytes.subarray(0, 4));
+  if (magic !== COLUMNAR_MAGIC) throw new Error("Not a columnar result");
+  const view = new DataView(buffer);
+  const version = view.getUint8(4);
+  if (version !== COLUMNAR_VERSION) throw new Error(`Unsupported columnar version: ${version}`);
+  const headLen = view.getUint32(8, true);
+  const columnar = JSON.parse(new TextDecoder().decode(bytes.subarray(12, 12 + headLen)));
+  const base = 12 + headLen;
+
+  const unpack = (ref, kind) => {
+    const [offset, length] = ref.buffer;
+    const Typed = COLUMNAR_ARRAYS[kind];
+    // Copy out so the typed array is aligned regardless of the header length.
+    return new Typed(buffer.slice(base + offset, base + offset + length * Typed.BYTES_PER_ELEMENT));
+  };
+  const walkTable = (table) => {
+    for (const column of Object.values(table.columns)) {
+      if (column.type === "list") {
+        column.offsets = unpack(column.offsets, "i4");
+        column.values = unpack(column.values, "i4");
+      } else if (COLUMNAR_ARRAYS[column.type]) {
+        column.values = unpack(column.values, column.type);
+      }
+    }
+  };
+
+  if (columnar.tasks) walkTable(columnar.tasks);
+  if (columnar.nodes) walkTable(columnar.nodes);
+  if (columnar.aon) {
+    if (columnar.aon.nodes !== "tasks") walkTable(columnar.aon.nodes);
+    walkTable(columnar.aon.edges);
+  }
+  return columnar;
+}
+
+function columnarRows(table, ids, nodeIds) {
+  const rows = new Array(table.count);
+  const { columns, fields } = table;
+  for (let i = 0; i < table.count; i++) {
+    const row = {};
+    for (const field of fields) {
+      if (field === "label") {
+        row.label = row.id;
+        continue;
+      }
+      if (field === "id" && !columns.id) {
+        row.id = ids[i];
+        continue;
+      }
+      const column = columns[field];
+      if (column.type === "list") {
+        const out = [];
+        for (let k = column.offsets[i]; k < column.offsets[i + 1]; k++) out.push(ids[column.values[k]]);
+        row[field] = out;
+        continue;
+      }
+      const value = column.values[i];
+      if (column.type === "f8") {
+        // null / NaN: field absent on this row (e.g. PERT estimates on dummies)
+        if (value === null || Number.isNaN(value)) continue;
+        row[field] = value;
+      } else if (column.type === "u1") {
+        row[field] = value === 1;
+      } else if (column.ref === "nodes") {
+        row[field] = nodeIds[value];
+      } else {
+        row[field] = value;
+      }
+    }
+    rows[i] = row;
+  }
+  return rows;
+}
+
+// Columnar result (JSON, or decoded binary) -> the row-per-object result.
+function columnarToResult(columnar) {
+  const skip = new Set(["format", "version", "ids", "tasks", "nodes", "aon"]);
+  const result = {};
+  for (const [key, value] of Object.entries(columnar)) {
+    if (!skip.has(key)) result[key] = value;
+  }
+  const ids = columnar.ids;
+  const nodes = columnar.nodes ? columnarRows(columnar.nodes, ids, null) : null;
+  const nodeIds = nodes ? nodes.map((n) => n.id) : null;
+
+  if (columnar.tasks) result.tasks = columnarRows(columnar.tasks, ids, nodeIds);
+  if (nodes) result.nodes = nodes;
+  if (columnar.aon) {
+    const aon = columnar.aon;
+    const aonNodes = aon.nodes === "tasks"
+      ? result.tasks.filter((t) => !t.is_dummy).map((t) => ({
+          id: t.id, label: t.id, duration: t.duration,
+          es: t.es, ef: t.ef, ls: t.ls, lf: t.lf,
+          slack: t.slack, critical: t.critical, dependencies: t.dependencies,
+        }))
+      : columnarRows(aon.nodes, ids, nodeIds);
+    const { source, target, relations } = aon.edges.columns;
+    const edges = new Array(aon.edges.count);
+    for (let k = 0; k < aon.edges.count; k++) {
+      const s = ids[source.values[k]];
+      const t = ids[target.values[k]];
+      edges[k] = { id: `${s}->${t}`, source: s, target: t };
+      // Typed dependencies: [{type, lag}] per edge.
+      if (relations) edges[k].relations = relations.values[k];
+    }
+    result.aon = { project_duration: aon.project_duration, nodes: aonNodes, edges };
+  }
+  return result;
+}
@@ -17,8 +17,9 @@ function mapCpmToGantt(result) {
 
   const items = ganttTasks.map((t) => {
     const depsArray = Array.isArray(t.dependencies) ? t.dependencies : [];
-    const startDate = addDays(startBase, t.es);
-    const endDate = addDays(startBase, t.ef);
+    // Working-calendar dates from the server, when requested; the end stays exclusive.
+    const startDate = t.es_date ? parseISODate(t.es_date) : addDays(startBase, t.es);
+    const endDate = t.ef_date ? addDays(parseISODate(t.ef_date), 1) : addDays(startBase, t.ef);
     return {
       id: t.id,
       name: t.name || t.id,
@@ -375,6 +376,8 @@ function onGanttMouseUp() {
   const item = items.find((t) => t.id === taskId);
   if (!item) return;
   const newDuration = previewEf - item.es;
+  const incremental =
+    typeof window.analyzeDelta === "function" && tableMatchesSession();
   document.querySelectorAll("#input-table tbody tr").forEach((row) => {
     const idCell = row.querySelector("td:nth-child(1)");
     if (idCell && idCell.textContent.trim() === taskId) {
@@ -383,7 +386,12 @@ function onGanttMouseUp() {
     }
   });
   saveState();
-  if (typeof window.analyzeProject === "function") window.analyzeProject();
+  if (incremental) {
+    window.analyzeDelta([{ id: taskId, duration: newDuration }]);
+  } else if (typeof window.analyzeProject === "function") {
+    // Editing has started: keep a session so the next drags can send deltas.
+    window.analyzeProject({ session: true });
+  }
 }
 
 function showGanttPertWarning() {
@@ -28,7 +28,7 @@ async function validateWithServer() {
   clearTableErrors();
 
   try {
-    const response = await fetch("/api/analyze", {
+    const response = await fetch("/api/validate", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
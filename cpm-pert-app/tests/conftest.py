@@ -25,6 +25,14 @@ REQUEST_SCHEMA = {
 }
 
 
+@pytest.fixture(scope="session")
+def api(playwright):
+    """Plain HTTP client against the running server, for endpoints the UI does not call."""
+    ctx = playwright.request.new_context(base_url=BASE_URL)
+    yield ctx
+    ctx.dispose()
+
+
 def fill_rows(page, rows):
     """Fill rows in CPM mode. row dicts: id, name, duration, dependencies."""
     add_btn = page.locator("#btn-add")
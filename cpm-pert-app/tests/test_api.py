@@ -0,0 +1,663 @@
+"""
+API tests for the endpoints the UI does not drive (batch, streaming, jobs,
+projects, ...). They use the `api` fixture only, so no browser is started.
+
+Test data: the same eight-task CPM project as test_cpm.py (duration 22) and
+four-task PERT project as test_pert.py (duration 14).
+
+Requires a running Flask server at http://127.0.0.1:5000.
+"""
+
+import json
+import re
+import uuid
+
+import openpyxl
+import pytest
+
+
+def _cpm_tasks():
+    return [
+        {"id": "A", "name": "Task A", "duration": 3.0, "dependencies": []},
+        {"id": "B", "name": "Task B", "duration": 11.0, "dependencies": ["A"]},
+        {"id": "C", "name": "Task C", "duration": 13.0, "dependencies": []},
+        {"id": "D", "name": "Task D", "duration": 5.0, "dependencies": ["A"]},
+        {"id": "E", "name": "Task E", "duration": 4.0, "dependencies": ["B", "C"]},
+        {"id": "F", "name": "Task F", "duration": 6.0, "dependencies": ["B", "C"]},
+        {"id": "G", "name": "Task G", "duration": 2.0, "dependencies": ["F"]},
+        {"id": "H", "name": "Task H", "duration": 1.0, "dependencies": ["D", "E", "F"]},
+    ]
+
+
+def _pert_tasks():
+    return [
+        {"id": "A", "optimistic": 4.0, "most_likely": 4.0, "pessimistic": 4.0, "dependencies": []},
+        {"id": "B", "optimistic": 3.0, "most_likely": 6.0, "pessimistic": 9.0, "dependencies": ["A"]},
+        {"id": "C", "optimistic": 1.0, "most_likely": 2.0, "pessimistic": 3.0, "dependencies": ["A"]},
+        {"id": "D", "optimistic": 1.0, "most_likely": 4.0, "pessimistic": 7.0, "dependencies": ["B", "C"]},
+    ]
+
+
+def _ndjson_records(resp):
+    return [json.loads(line) for line in resp.text().splitlines() if line]
+
+
+class TestBatch:
+    """POST /api/analyze/batch."""
+
+    def test_batch_results_in_order_and_isolated(self, api):
+        """One broken project reports its own validation errors; the others still get schedules."""
+        good = _cpm_tasks()
+        broken = [{"id": "A", "name": "A", "duration": 1, "dependencies": ["Z"]}]
+        resp = api.post("/api/analyze/batch", data={"projects": [
+            {"tasks": good, "mode": "cpm", "project_start": "2025-01-06"},
+            {"tasks": broken},
+            {"tasks": good[:1]},
+        ]})
+        assert resp.status == 200
+        results = resp.json()["results"]
+        assert [r["ok"] for r in results] == [True, False, True]
+
+        single = api.post("/api/analyze", data={"tasks": good, "project_start": "2025-01-06"}).json()["result"]
+        assert results[0]["result"]["tasks"] == single["tasks"]
+        assert results[0]["result"]["project_duration"] == single["project_duration"]
+        assert results[0]["result"]["project_start"] == "2025-01-06"
+        assert results[1]["error"] == "Validation Failed"
+        assert "Z" in results[1]["validation_errors"][0]["msg"]
+        assert results[2]["result"]["project_duration"] == good[0]["duration"]
+
+    def test_large_batch_runs_in_worker_pool(self, api):
+        """A batch of OFFLOAD_MIN_TASKS tasks in total goes through the shared worker pool."""
+        def chain(prefix):
+            return [
+                {"id": f"{prefix}-{i}", "duration": 2, "dependencies": [f"{prefix}-{i - 1}"] if i % 100 else []}
+                for i in range(10_000)
+            ]
+        resp = api.post("/api/analyze/batch", data={"projects": [
+            {"tasks": chain("a"), "views": ["activities"]},
+            {"tasks": chain("b"), "views": ["activities"]},
+        ]}, timeout=120_000)
+        assert resp.status == 200
+        assert re.search(r"\boffload;dur=\d", resp.headers["server-timing"])
+        assert [r["result"]["project_duration"] for r in resp.json()["results"]] == [200, 200]
+
+    def test_batch_rejects_non_list(self, api):
+        resp = api.post("/api/analyze/batch", data={"projects": {"tasks": []}})
+        assert resp.status == 400
+        assert resp.json()["ok"] is False
+
+
+class TestStreaming:
+    """POST /api/analyze/stream (NDJSON in and out)."""
+
+    def test_stream_matches_analyze(self, api):
+        """NDJSON records carry the same rows as the one-shot /api/analyze result."""
+        tasks = _cpm_tasks()
+        body = "\n".join(json.dumps(t) for t in tasks) + "\n"
+        resp = api.post(
+            "/api/analyze/stream?project_start=2025-01-06",
+            data=body, headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert resp.status == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        # Ingest and the passes run before the response starts, so they are timed.
+        for name in ("ingest", "fb_pass", "aoa"):
+            assert re.search(rf"\b{name};dur=\d", resp.headers["server-timing"]), name
+        records = _ndjson_records(resp)
+        full = api.post("/api/analyze", data={"tasks": tasks}).json()["result"]
+
+        def rows(kind):
+            return [{k: v for k, v in r.items() if k != "type"} for r in records if r["type"] == kind]
+
+        assert rows("activity") == full["tasks"]
+        assert rows("node") == full["nodes"]
+        assert rows("aon_edge") == full["aon"]["edges"]
+        summary = records[-1]
+        assert summary["type"] == "summary"
+        assert summary["project_duration"] == 22
+        assert summary["project_start"] == "2025-01-06"
+        assert summary["counts"]["activities"] == len(full["tasks"])
+
+    def test_stream_reports_errors_before_records(self, api):
+        body = '{"id": "A", "duration": 1, "dependencies": ["B"]}\n'
+        resp = api.post("/api/analyze/stream", data=body, headers={"Content-Type": "application/x-ndjson"})
+        assert resp.status == 400
+        assert resp.json()["validation_errors"][0]["msg"] == "Missing dependency: B"
+
+        resp = api.post("/api/analyze/stream", data='{"id": "A"\n', headers={"Content-Type": "application/x-ndjson"})
+        assert resp.status == 400
+        assert "Line 1" in resp.json()["error"]
+
+
+class TestPhaseTiming:
+    """Server-Timing header and /api/metrics."""
+
+    def test_server_timing_and_metrics(self, api):
+        # A fresh task ID keeps the result cache from answering without running the phases.
+        tasks = _cpm_tasks() + [{"id": uuid.uuid4().hex, "duration": 1, "dependencies": ["H"]}]
+        resp = api.post("/api/analyze", data={"tasks": tasks})
+        assert resp.status == 200
+        timing = resp.headers["server-timing"]
+        for name in ("ingest", "topo_sort", "fb_pass", "aoa", "aon", "serialize"):
+            assert re.search(rf"\b{name};dur=\d", timing), name
+        assert 'tasks;desc="9"' in timing
+
+        text = api.get("/api/metrics").text()
+        assert 'cpm_phase_seconds_count{endpoint="analyze",phase="fb_pass"}' in text
+        assert 'cpm_request_seconds_bucket{endpoint="analyze",le="+Inf"}' in text
+        assert re.search(r'cpm_items_total\{kind="tasks"\} \d+', text)
+
+
+class TestResultViews:
+    """The `views` option."""
+
+    def test_activities_view_skips_networks(self, api):
+        tasks = _cpm_tasks() + [{"id": uuid.uuid4().hex, "duration": 1, "dependencies": ["H"]}]
+        full = api.post("/api/analyze", data={"tasks": tasks}).json()["result"]
+        resp = api.post("/api/analyze", data={"tasks": tasks, "views": ["activities"]})
+        assert resp.status == 200
+        result = resp.json()["result"]
+
+        assert "nodes" not in result and "aon" not in result
+        assert result["project_duration"] == full["project_duration"]
+        assert not any(t["is_dummy"] for t in result["tasks"])
+        assert "tail_node" not in result["tasks"][0]
+        real = [t for t in full["tasks"] if not t["is_dummy"]]
+        strip = lambda t: {k: v for k, v in t.items() if k not in ("tail_node", "head_node")}
+        assert result["tasks"] == [strip(t) for t in real]
+        assert "aoa;" not in resp.headers["server-timing"]
+
+    def test_unknown_view_rejected(self, api):
+        resp = api.post("/api/analyze", data={"tasks": _cpm_tasks(), "views": ["gantt"]})
+        assert resp.status == 400
+        assert "Unknown view" in resp.json()["error"]
+
+    def test_pert_stats_view_only(self, api):
+        resp = api.post("/api/analyze", data={"tasks": _pert_tasks(), "mode": "pert", "views": ["pert_stats"]})
+        assert resp.status == 200
+        result = resp.json()["result"]
+        full = api.post("/api/analyze", data={"tasks": _pert_tasks(), "mode": "pert"}).json()["result"]
+        assert set(result) == {"project_duration", "pert_stats", "project_start"}
+        assert result["pert_stats"] == full["pert_stats"]
+
+
+class TestColumnarFormat:
+    """The columnar and binary result formats."""
+
+    def test_columnar_result_matches_rows(self, api):
+        tasks = _cpm_tasks()
+        rows = api.post("/api/analyze", data={"tasks": tasks}).json()["result"]
+        resp = api.post("/api/analyze", data={"tasks": tasks, "format": "columnar"})
+        assert resp.status == 200
+        col = resp.json()["result"]
+
+        assert col["format"] == "columnar"
+        assert col["project_duration"] == rows["project_duration"]
+        assert col["ids"] == [t["id"] for t in rows["tasks"]]
+        columns = col["tasks"]["columns"]
+        assert columns["es"]["values"] == [t["es"] for t in rows["tasks"]]
+        assert [bool(c) for c in columns["critical"]["values"]] == [t["critical"] for t in rows["tasks"]]
+
+        deps = columns["dependencies"]
+        for i, task in enumerate(rows["tasks"]):
+            start, end = deps["offsets"][i], deps["offsets"][i + 1]
+            assert [col["ids"][k] for k in deps["values"][start:end]] == task["dependencies"]
+        node_ids = col["nodes"]["columns"]["id"]["values"]
+        assert [node_ids[k] for k in columns["tail_node"]["values"]] == [t["tail_node"] for t in rows["tasks"]]
+
+    def test_binary_result_header(self, api):
+        resp = api.post("/api/analyze", data={"tasks": _cpm_tasks(), "format": "binary"})
+        assert resp.status == 200
+        assert resp.headers["content-type"].startswith("application/vnd.cpm.columnar")
+        body = resp.body()
+        assert body[:4] == b"CPMC"
+        header_len = int.from_bytes(body[8:12], "little")
+        header = json.loads(body[12:12 + header_len])
+        assert header["project_duration"] == 22
+        assert header["tasks"]["columns"]["es"]["values"]["buffer"][1] == header["tasks"]["count"]
+
+    def test_unknown_format_rejected(self, api):
+        resp = api.post("/api/analyze", data={"tasks": _cpm_tasks(), "format": "xml"})
+        assert resp.status == 400
+
+
+class TestCycleReporting:
+    """Dependency cycles reported by /api/validate."""
+
+    def test_cycle_reported_as_ordered_loop(self, api):
+        tasks = [
+            {"id": "A", "duration": 1, "dependencies": ["C"]},
+            {"id": "B", "duration": 1, "dependencies": ["A"]},
+            {"id": "C", "duration": 1, "dependencies": ["B"]},
+            # Downstream of the loop but not on it: not reported.
+            {"id": "D", "duration": 1, "dependencies": ["C"]},
+        ]
+        resp = api.post("/api/validate", data={"tasks": tasks})
+        assert resp.status == 400
+        errors = resp.json()["validation_errors"]
+        assert [e["id"] for e in errors] == ["A", "B", "C"]
+        assert errors[0]["cycle"] == ["A", "B", "C"]
+        assert errors[0]["msg"] == "Cycle detected in dependencies: A → B → C → A"
+        assert all("Cycle detected" in e["msg"] and "cycle" not in e for e in errors[1:])
+
+
+class TestScenarios:
+    """POST /api/analyze/scenarios."""
+
+    def test_scenarios_match_reanalysis(self, api):
+        tasks = _cpm_tasks()
+        base = api.post("/api/analyze", data={"tasks": tasks}).json()["result"]
+        off_path = next(t for t in base["tasks"] if not t["is_dummy"] and not t["critical"])
+        scenarios = [
+            {"name": "slip", "scale": {off_path["id"]: 10}},
+            {"durations": {off_path["id"]: 1}},
+        ]
+        resp = api.post("/api/analyze/scenarios", data={"tasks": tasks, "scenarios": scenarios})
+        assert resp.status == 200
+        result = resp.json()["result"]
+        assert result["baseline"]["project_duration"] == base["project_duration"]
+
+        for scenario, entry in zip(scenarios, result["scenarios"]):
+            variant = [dict(t) for t in tasks]
+            for t in variant:
+                if t["id"] in scenario.get("durations", {}):
+                    t["duration"] = scenario["durations"][t["id"]]
+                if t["id"] in scenario.get("scale", {}):
+                    t["duration"] = float(t["duration"]) * scenario["scale"][t["id"]]
+            rerun = api.post("/api/analyze", data={"tasks": variant}).json()["result"]
+            slack = {t["id"]: t["slack"] for t in rerun["tasks"]}
+            assert entry["project_duration"] == rerun["project_duration"]
+            assert entry["slack"] == [slack[tid] for tid in result["ids"]]
+        assert result["scenarios"][0]["name"] == "slip"
+        assert off_path["id"] in result["scenarios"][0]["critical_added"]
+
+    def test_scenarios_reject_unknown_task(self, api):
+        resp = api.post("/api/analyze/scenarios", data={
+            "tasks": _cpm_tasks(), "scenarios": [{"durations": {"ZZ": 3}}],
+        })
+        assert resp.status == 400
+        assert resp.json()["validation_errors"] == [{"id": "ZZ", "msg": "Unknown task: ZZ", "scenario": 0}]
+
+    def test_scenarios_cap_slack_values(self, api):
+        """Per-task slack is returned in full, so tasks x scenarios is capped unless slack is off."""
+        tasks = [{"id": f"T{i}", "duration": 1, "dependencies": []} for i in range(1001)]
+        resp = api.post("/api/analyze/scenarios", data={"tasks": tasks, "scenarios": [{}] * 10_000})
+        assert resp.status == 400
+        assert "Too many slack values" in resp.json()["error"]
+
+
+class TestSimulation:
+    """Monte Carlo PERT simulation."""
+
+    @pytest.mark.parametrize("distribution", ["beta", "triangular"])
+    def test_pert_simulation_summary(self, api, distribution):
+        """Simulated completion times stay within the O/P bounds and A (O=M=P) is always critical."""
+        resp = api.post("/api/analyze", data={
+            "tasks": _pert_tasks(),
+            "mode": "pert",
+            "simulation": {"iterations": 5000, "distribution": distribution, "seed": 1, "bins": 20},
+        })
+        assert resp.status == 200
+        sim = resp.json()["result"]["pert_stats"]["simulation"]
+
+        assert sim["iterations"] == 5000
+        assert 4 + 3 + 1 <= sim["min"] <= sim["max"] <= 4 + 9 + 7
+        assert sum(sim["histogram"]["counts"]) == 5000
+        p = sim["percentiles"]
+        assert p["p50"] <= p["p75"] <= p["p90"] <= p["p95"] <= p["p99"]
+        assert sim["criticality"]["A"] == 1.0
+        assert sim["criticality"]["B"] + sim["criticality"]["C"] >= 1.0
+
+    def test_pert_simulation_rejects_bad_options(self, api):
+        resp = api.post("/api/analyze", data={
+            "tasks": _pert_tasks(),
+            "mode": "pert",
+            "simulation": {"iterations": 100, "distribution": "uniform"},
+        })
+        assert resp.status == 400
+        assert "distribution" in resp.json()["error"]
+
+    def test_pert_simulation_rejects_oversized_runs(self, api):
+        """Tasks x iterations is capped per worker: 600 tasks x 1M iterations is too much for one."""
+        tasks = [
+            {"id": f"T{k}", "optimistic": 1.0, "most_likely": 2.0, "pessimistic": 3.0, "dependencies": []}
+            for k in range(600)
+        ]
+        resp = api.post("/api/analyze", data={
+            "tasks": tasks,
+            "mode": "pert",
+            "simulation": {"iterations": 1_000_000, "seed": 1},
+        })
+        assert resp.status == 400
+        assert "Simulation too large" in resp.json()["error"]
+
+    def test_pert_simulation_independent_of_worker_count(self, api):
+        """Top-level seed/workers: the same seed gives the same distribution on any number of workers."""
+        def simulate(workers):
+            # `workers` is not part of the result cache key; a per-call task name
+            # makes each request miss the cache and actually run the simulation.
+            tasks = [{**t, "name": f"{t['id']} ({workers} workers)"} for t in _pert_tasks()]
+            resp = api.post("/api/analyze", data={
+                "tasks": tasks,
+                "mode": "pert",
+                "seed": 7,
+                "workers": workers,
+                "simulation": {"iterations": 20000},
+            })
+            assert resp.status == 200
+            return resp.json()["result"]["pert_stats"]["simulation"]
+
+        single, pooled = simulate(1), simulate(2)
+        assert single["seed"] == 7
+        assert single["iterations"] == pooled["iterations"] == 20000
+        assert single == pooled
+
+
+class TestWorkerPool:
+    """Large analyses offloaded to the worker pool."""
+
+    def test_large_analysis_runs_in_worker_pool(self, api):
+        # Above OFFLOAD_MIN_TASKS; a fresh prefix keeps the result cache out of it.
+        prefix = uuid.uuid4().hex[:8]
+        tasks = [
+            {"id": f"{prefix}-{i}", "duration": 2,
+             "dependencies": [f"{prefix}-{i - 1}"] if i % 100 else []}
+            for i in range(20_000)
+        ]
+        resp = api.post("/api/analyze", data={"tasks": tasks, "views": ["activities"]}, timeout=120_000)
+        assert resp.status == 200
+        assert re.search(r"\boffload;dur=\d", resp.headers["server-timing"])
+        assert resp.json()["result"]["project_duration"] == 200
+
+        offload = api.get("/api/health").json()["offload"]
+        assert offload["live"] >= 1 and offload["busy"] == 0
+
+    def test_default_iteration_simulation_runs_in_worker_pool(self, api):
+        # 500 tasks x the default 10,000 iterations reaches OFFLOAD_MIN_SAMPLES.
+        prefix = uuid.uuid4().hex[:8]
+        tasks = [
+            {"id": f"{prefix}-{i}", "optimistic": 1, "most_likely": 2, "pessimistic": 4,
+             "dependencies": [f"{prefix}-{i - 1}"] if i % 50 else []}
+            for i in range(500)
+        ]
+        resp = api.post("/api/analyze", data={
+            "tasks": tasks, "mode": "pert", "views": ["activities"], "simulation": {"seed": 1},
+        }, timeout=120_000)
+        assert resp.status == 200
+        assert re.search(r"\boffload;dur=\d", resp.headers["server-timing"])
+        assert resp.json()["result"]["pert_stats"]["simulation"]["iterations"] == 10_000
+
+
+class TestJobs:
+    """Background jobs under /api/jobs."""
+
+    def test_job_progress_events_and_conditional_result(self, api):
+        tasks = _cpm_tasks()
+        resp = api.post("/api/jobs", data={"tasks": tasks})
+        assert resp.status == 202
+        job_id = resp.json()["job"]["id"]
+        assert resp.headers["location"] == f"/api/jobs/{job_id}"
+
+        # The stream ends with the final event, so reading it whole waits for the job.
+        events = api.get(f"/api/jobs/{job_id}/events").text()
+        kinds = re.findall(r"^event: (\w+)$", events, flags=re.M)
+        assert kinds[-1] == "done" and set(kinds[:-1]) <= {"progress"}
+        # Updates are coalesced, so a fast job may skip straight to its last stages.
+        snapshots = [json.loads(d) for d in re.findall(r"^data: (.*)$", events, flags=re.M)]
+        # A job waiting for an offload worker is still queued, without a stage.
+        assert all(s["status"] == "queued" for s in snapshots if s["stage"] is None)
+        assert {s["stage"] for s in snapshots if s["stage"]} <= {"validate", "topo", "pass", "aoa", "activities", "aon"}
+        assert [s["percent"] for s in snapshots] == sorted(s["percent"] for s in snapshots)
+
+        status = api.get(f"/api/jobs/{job_id}").json()["job"]
+        assert status["status"] == "done" and status["percent"] == 100
+
+        resp = api.get(f"/api/jobs/{job_id}/result")
+        assert resp.status == 200
+        expected = api.post("/api/analyze", data={"tasks": tasks}).json()["result"]
+        assert resp.json()["result"]["project_duration"] == expected["project_duration"]
+        etag = resp.headers["etag"]
+        assert api.get(f"/api/jobs/{job_id}/result", headers={"If-None-Match": etag}).status == 304
+
+    def test_job_reports_validation_failure(self, api):
+        resp = api.post("/api/jobs", data={"tasks": [{"id": "A", "duration": "x"}]})
+        job_id = resp.json()["job"]["id"]
+        api.get(f"/api/jobs/{job_id}/events").text()
+        resp = api.get(f"/api/jobs/{job_id}/result")
+        assert resp.status == 400
+        assert resp.json()["validation_errors"] == [{"id": "A", "msg": "Duration must be a number"}]
+
+    def test_unknown_job(self, api):
+        assert api.get("/api/jobs/nope").status == 404
+        assert api.get("/api/jobs/nope/events").status == 404
+
+
+class TestServerImport:
+    """POST /api/import."""
+
+    def test_server_csv_import_splits_concatenated_predecessors(self, api):
+        """POST /api/import parses the ac,pr,du format, including run-together letter IDs."""
+        csv_text = "ac,pr,du,name\nI,-,1,\nJ,-,2,\nK,I,3,\nM,IJK,4,Merge\n"
+        resp = api.post("/api/import", multipart={
+            "file": {"name": "tasks.csv", "mimeType": "text/csv", "buffer": csv_text.encode()},
+        })
+        body = resp.json()
+        assert resp.status == 200 and body["mode"] == "cpm"
+        assert body["result"]["tasks"][-1] == {
+            "id": "M", "name": "Merge", "duration": 4, "dependencies": ["I", "J", "K"],
+        }
+
+        resp = api.post("/api/import?analyze=1", headers={"Content-Type": "text/csv"}, data=csv_text)
+        assert resp.json()["result"]["project_duration"] == 8
+
+    def test_server_xlsx_import_analyzes_pert(self, api, tmp_path):
+        """PERT workbooks are read in streaming mode and can be analyzed directly."""
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["ac", "pr", "opt", "ml", "pess"])
+        ws.append(["A", "-", 2, 4, 6])
+        ws.append(["B", "A", 1, 3, 11])
+        xlsx_file = tmp_path / "pert.xlsx"
+        wb.save(str(xlsx_file))
+
+        resp = api.post("/api/import?analyze=1", multipart={
+            "file": {"name": "pert.xlsx", "mimeType": "application/octet-stream", "buffer": xlsx_file.read_bytes()},
+        })
+        body = resp.json()
+        assert body["ok"] and body["mode"] == "pert"
+        assert body["result"]["project_duration"] == pytest.approx(8.0)
+
+    def test_server_import_reports_validation_errors(self, api):
+        resp = api.post("/api/import", headers={"Content-Type": "text/csv"}, data="ac,pr,du\nA,-,x\nB,Z,1\n")
+        assert resp.status == 400
+        assert resp.json()["validation_errors"] == [
+            {"id": "B", "msg": "Missing dependency: Z"},
+            {"id": "A", "msg": "Duration must be a number"},
+        ]
+
+
+class TestProjects:
+    """Saved projects under /api/projects."""
+
+    def test_project_snapshots_and_stored_results(self, api):
+        tasks = _cpm_tasks()
+        resp = api.post("/api/projects", data={"name": "Snapshots", "tasks": tasks, "project_start": "2026-01-05"})
+        assert resp.status == 201
+        project = resp.json()["project"]
+        assert project["version"] == 1 and resp.json()["valid"]
+
+        try:
+            edited = tasks + [{"id": "ZZ", "duration": 1, "dependencies": [tasks[-1]["id"]]}]
+            resp = api.put(f"/api/projects/{project['id']}",
+                           data={"tasks": edited, "project_start": "2026-01-05", "version": 1})
+            assert resp.json()["project"]["version"] == 2
+
+            # A save based on the outdated version is refused.
+            resp = api.put(f"/api/projects/{project['id']}", data={"tasks": tasks, "version": 1})
+            assert resp.status == 409 and resp.json()["version"] == 2
+
+            versions = api.get(f"/api/projects/{project['id']}/versions").json()["versions"]
+            assert [v["version"] for v in versions] == [1, 2] and all(v["has_result"] for v in versions)
+
+            snapshot = api.get(f"/api/projects/{project['id']}?version=1").json()["snapshot"]
+            assert snapshot["tasks"] == tasks
+
+            resp = api.get(f"/api/projects/{project['id']}/result?version=1")
+            expected = api.post("/api/analyze", data={"tasks": tasks}).json()["result"]
+            assert resp.json()["result"]["project_duration"] == expected["project_duration"]
+            assert resp.json()["result"]["project_start"] == "2026-01-05"
+            resp = api.get(f"/api/projects/{project['id']}/result?version=1",
+                           headers={"If-None-Match": resp.headers["etag"]})
+            assert resp.status == 304
+        finally:
+            api.delete(f"/api/projects/{project['id']}")
+        assert api.get(f"/api/projects/{project['id']}").status == 404
+
+
+    def test_project_unanalyzable_input_not_saved(self, api):
+        before = api.get("/api/projects?limit=1000").json()["projects"]
+        for tasks in ([], [1]):
+            resp = api.post("/api/projects", data={"name": "Broken", "tasks": tasks})
+            assert resp.status == 400
+        assert api.get("/api/projects?limit=1000").json()["projects"] == before
+
+
+class TestProjectFile:
+    """The binary project file."""
+
+    def test_project_file_round_trip_and_analysis(self, api):
+        tasks = _cpm_tasks()
+        resp = api.post("/api/project-file", data={"tasks": tasks})
+        assert resp.status == 200
+        blob = resp.body()
+        assert blob[:4] == b"CPMP"
+
+        resp = api.post("/api/analyze/project-file?project_start=2026-01-05", data=blob)
+        result = resp.json()["result"]
+        expected = api.post("/api/analyze", data={"tasks": tasks, "project_start": "2026-01-05"}).json()["result"]
+        assert result == expected
+
+        back = api.post("/api/project-file/tasks", data=blob).json()
+        assert back["mode"] == "cpm" and back["tasks"] == tasks
+
+        csv_text = api.post("/api/project-file/tasks?format=csv", data=blob).text()
+        assert csv_text.splitlines()[0] == "ac,pr,du,name"
+        imported = api.post("/api/import", headers={"Content-Type": "text/csv"}, data=csv_text).json()
+        assert imported["result"]["tasks"] == tasks
+
+    def test_project_file_rejects_other_data(self, api):
+        resp = api.post("/api/analyze/project-file", data=b"not a project")
+        assert resp.status == 400 and resp.json()["error"] == "Not a project file"
+
+
+class TestTypedDependencies:
+    """FS/SS/FF/SF dependencies with lags."""
+
+    def test_typed_dependencies_with_lags(self, api):
+        tasks = [
+            {"id": "A", "name": "Dig", "duration": 4, "dependencies": []},
+            {"id": "B", "name": "Pipe", "duration": 3, "dependencies": [{"id": "A", "type": "SS", "lag": 2}]},
+            {"id": "C", "name": "Fill", "duration": 2, "dependencies": [{"id": "B", "type": "FF", "lag": 1}, "A"]},
+            {"id": "D", "name": "Mark", "duration": 1, "dependencies": [{"id": "A", "type": "SF", "lag": -1}]},
+        ]
+        resp = api.post("/api/analyze", data={"tasks": tasks})
+        assert resp.status == 200
+        result = resp.json()["result"]
+        assert result["project_duration"] == 6
+        rows = {t["id"]: t for t in result["tasks"]}
+        assert "nodes" not in result and not any(t["is_dummy"] for t in result["tasks"])
+        assert (rows["B"]["es"], rows["B"]["ef"]) == (2, 5)
+        assert (rows["C"]["es"], rows["C"]["ef"], rows["C"]["critical"]) == (4, 6, True)
+        assert (rows["D"]["es"], rows["D"]["lf"]) == (0, 6)
+        assert rows["C"]["dependencies"] == ["B", "A"]
+        assert rows["C"]["relations"] == [{"id": "B", "type": "FF", "lag": 1}, {"id": "A", "type": "FS", "lag": 0}]
+        edges = {e["id"]: e for e in result["aon"]["edges"]}
+        assert edges["A->B"]["relations"] == [{"type": "SS", "lag": 2}]
+
+        columnar = api.post("/api/analyze", data={"tasks": tasks, "format": "columnar"}).json()["result"]
+        assert columnar["aon"]["edges"]["columns"]["relations"]["values"][0] == [{"type": "SS", "lag": 2}]
+
+    def test_typed_dependency_validation(self, api):
+        tasks = [
+            {"id": "A", "name": "A", "duration": 1, "dependencies": []},
+            {"id": "B", "name": "B", "duration": 1, "dependencies": [{"id": "A", "type": "XS"}]},
+            {"id": "C", "name": "C", "duration": 1, "dependencies": [{"id": "A", "lag": "soon"}]},
+            {"id": "D", "name": "D", "duration": 1, "dependencies": [{"id": "Q", "type": "SS"}]},
+        ]
+        resp = api.post("/api/analyze", data={"tasks": tasks})
+        assert resp.status == 400
+        messages = {(e["id"], e["msg"]) for e in resp.json()["validation_errors"]}
+        assert ("B", "Unknown dependency type: XS. Choose from: FS, SS, FF, SF") in messages
+        assert ("C", "Lag must be a number") in messages
+        assert any(tid == "D" and "Q" in msg for tid, msg in messages)
+
+
+class TestCalendars:
+    """Working calendars and schedule dates."""
+
+    def test_calendar_dates_skip_weekends_and_holidays(self, api):
+        tasks = [
+            {"id": "A", "name": "A", "duration": 3, "dependencies": []},
+            {"id": "B", "name": "B", "duration": 2, "dependencies": ["A"], "calendar": "site"},
+        ]
+        calendars = {"site": {"workdays": ["mon", "tue", "wed", "thu", "fri", "sat"], "holidays": ["2026-10-21"]}}
+        # 2026-10-16 is a Friday.
+        resp = api.post("/api/analyze", data={"tasks": tasks, "project_start": "2026-10-16", "calendars": calendars})
+        assert resp.status == 200
+        result = resp.json()["result"]
+        rows = {t["id"]: t for t in result["tasks"] if not t["is_dummy"]}
+        assert (rows["A"]["es"], rows["A"]["es_date"], rows["A"]["ef_date"]) == (0, "2026-10-16", "2026-10-20")
+        assert (rows["B"]["es_date"], rows["B"]["ef_date"], rows["B"]["lf_date"]) == ("2026-10-22", "2026-10-23", "2026-10-23")
+        assert (rows["A"]["lf_date"], result["finish_date"]) == ("2026-10-21", "2026-10-23")
+        # B cannot start on the holiday, so A gains a working day of slack.
+        assert (rows["A"]["slack"], rows["A"]["critical"]) == (1, False)
+        assert (rows["B"]["es"], rows["B"]["slack"], rows["B"]["critical"]) == (4, 0, True)
+
+        plain = api.post("/api/analyze", data={"tasks": tasks, "project_start": "2026-10-16"}).json()["result"]
+        assert "es_date" not in plain["tasks"][0] and "finish_date" not in plain
+
+    def test_calendar_validation(self, api):
+        tasks = [{"id": "A", "name": "A", "duration": 1, "dependencies": [], "calendar": "night"}]
+        resp = api.post("/api/analyze", data={"tasks": tasks, "calendars": {}})
+        assert resp.status == 400
+        assert resp.json()["validation_errors"] == [{"id": "A", "msg": "Unknown calendar: night"}]
+
+        resp = api.post("/api/analyze", data={"tasks": tasks, "calendars": {"night": {"workdays": []}}})
+        assert resp.status == 400 and resp.json()["error"] == "A calendar needs at least one working weekday"
+
+
+class TestMinimalAoa:
+    """The minimal-dummy AoA network."""
+
+    def test_minimal_aoa_keeps_event_times(self, api):
+        tasks = [
+            {"id": "A", "name": "A", "duration": 2, "dependencies": []},
+            {"id": "B", "name": "B", "duration": 3, "dependencies": []},
+            {"id": "C", "name": "C", "duration": 1, "dependencies": ["A"]},
+            {"id": "D", "name": "D", "duration": 4, "dependencies": ["A", "B"]},
+            {"id": "E", "name": "E", "duration": 2, "dependencies": ["A", "B", "C"]},
+            {"id": "F", "name": "F", "duration": 1, "dependencies": ["A", "B", "C", "D"]},
+        ]
+        results = {}
+        for mode in ("standard", "minimal"):
+            resp = api.post("/api/analyze", data={"tasks": tasks, "aoa": mode})
+            assert resp.status == 200
+            results[mode] = resp.json()["result"]
+        standard, minimal = results["standard"], results["minimal"]
+        assert minimal["aoa_stats"]["mode"] == "minimal"
+        assert minimal["aoa_stats"]["dummies"] < standard["aoa_stats"]["dummies"]
+        assert minimal["aoa_stats"]["nodes"] <= standard["aoa_stats"]["nodes"]
+        assert minimal["aoa_stats"]["dummies"] == sum(t["is_dummy"] for t in minimal["tasks"])
+
+        for result in (standard, minimal):
+            nodes = {n["id"]: n for n in result["nodes"]}
+            for t in result["tasks"]:
+                if not t["is_dummy"]:
+                    assert nodes[t["tail_node"]]["earliest"] == t["es"]
+                    assert nodes[t["head_node"]]["latest"] == t["lf"]
+        times = lambda r: {t["id"]: (t["es"], t["ef"], t["ls"], t["lf"]) for t in r["tasks"] if not t["is_dummy"]}
+        assert times(standard) == times(minimal)
+
+        assert "aoa_stats" not in api.post("/api/analyze", data={"tasks": tasks}).json()["result"]
+        resp = api.post("/api/analyze", data={"tasks": tasks, "aoa": "tiny"})
+        assert resp.status == 400 and resp.json()["error"] == "AoA mode must be one of: standard, minimal"
@@ -157,6 +157,26 @@ def test_gantt_drag_shrink_updates_correctly(gantt_page):
     assert c["slack"] == 0
 
 
+def test_gantt_drag_sends_delta_not_full_table(gantt_page):
+    """
+    Analyze opens no session; the first drag re-analyzes with one, and a drag
+    on the unchanged table after that posts only the edited duration to
+    /api/analyze/delta.
+    """
+    with gantt_page.expect_request("**/api/analyze") as req_info:
+        _gantt_drag(gantt_page, "A", 2)
+    assert req_info.value.post_data_json["session"] is True
+
+    with gantt_page.expect_request("**/api/analyze/delta") as req_info:
+        _gantt_drag(gantt_page, "A", 1)
+    payload = req_info.value.post_data_json
+    assert payload["changes"] == [{"id": "A", "duration": 8}]
+    assert payload["version"] == 1
+
+    c = _get_cpm_row(gantt_page, "C")
+    assert c["es"] == 8 and c["lf"] == 12 and c["slack"] == 0
+
+
 # ── Group 3: Drag constraints ────────────────────────────────────────────────
 
 def test_gantt_drag_enforces_minimum_duration(gantt_page):